@@ -3,13 +3,63 @@ DataForge - Backend data management module.
 
 Provides:
 - DataManager: Central in-memory dataset store
-- MergeEngine: Robust dataset merging with validation
+- ChunkedCSVReader: Streaming, cancellable CSV loading with progress
+- DtypeOptimizer: Load-time category/downcast/date conversion
+- parse_dates: Date parsing with per-column format inference
+- ParsedColumnCache: Typed column views keyed by the state that produced them
+- parse_numbers / parse_season_numbers: Vectorized numeric parsing
+- parse_durations_to_days / parse_durations_to_seconds: Vectorized duration parsing
+- CSVCache: Feather cache of previously opened CSV files
+- DataHistory: Delta-based undo/redo with a memory budget
+- MergeEngine: Robust dataset merging with validation and result-size estimates
+- KeyIndexCache: Join key indexes built once per dataset for repeated joins
+- KeyHashCache: Composite keys hashed to one uint64 per row, shared by merge and compare
+- ColumnSketchCache: Sampled HyperLogLog/MinHash column sketches for key suggestion
+- PartitionedMergeEngine: Out-of-core, hash-partitioned joins written to CSV
+- ProfileEngine: Per-column statistics for the summary and profiling report in one pass
+  (sketched, with error bounds, above ProfileEngine.APPROXIMATE_MIN_ROWS rows)
+- ColumnKindCache: Sampled date/duration column detection, cached per dataset
+- ProfileCache: Finished profiles kept per dataset, so unchanged data reopens instantly
 - CompareEngine: Dataset comparison (structure, rows, cells, stats)
+- ChunkedCompareEngine: Out-of-core, hash-partitioned comparison of CSV files
 """
 
 from .data_manager import DataManager
-from .merge_engine import MergeEngine, MergeResult, MergeSummary
+from .csv_loader import ChunkedCSVReader, LoadCancelled, read_csv_chunked
+from .dtype_optimizer import DtypeOptimizer, DtypeOptimizationReport
+from .dates import infer_date_formats, parse_date, parse_dates
+from .durations import (
+    parse_duration_to_days,
+    parse_duration_to_seconds,
+    parse_durations_to_days,
+    parse_durations_to_seconds,
+)
+from .file_cache import CSVCache
+from .history import DataHistory
+from .numbers import parse_numbers, parse_season_numbers
+from .parsed_cache import ParsedColumnCache
+from .key_index import KeyHashCache, KeyIndex, KeyIndexCache, hash_keys
+from .sketches import (
+    BloomFilter,
+    ColumnSketch,
+    ColumnSketchCache,
+    HyperLogLog,
+    MinHash,
+    count_repeats,
+)
+from .merge_engine import MergeEngine, MergeEstimate, MergeResult, MergeSummary
+from .partitioned_merge import PartitionedMergeEngine, merge_csv_files
+from .profiler import (
+    ColumnKindCache,
+    ColumnProfile,
+    DatasetProfile,
+    ProfileCache,
+    ProfileCancelled,
+    ProfileEngine,
+    detect_column_kinds,
+)
 from .compare_engine import (
+    CompareCancelled,
     CompareEngine,
     StructureComparison,
     RowComparison,
@@ -17,16 +67,62 @@ from .compare_engine import (
     SummaryStatsComparison,
     ComparisonReport,
 )
+from .chunked_compare import (
+    ChunkedCompareEngine,
+    ChunkedComparison,
+    compare_csv_files,
+)
 
 __all__ = [
     "DataManager",
+    "ChunkedCSVReader",
+    "LoadCancelled",
+    "read_csv_chunked",
+    "DtypeOptimizer",
+    "DtypeOptimizationReport",
+    "infer_date_formats",
+    "parse_date",
+    "parse_dates",
+    "parse_duration_to_days",
+    "parse_duration_to_seconds",
+    "parse_durations_to_days",
+    "parse_durations_to_seconds",
+    "CSVCache",
+    "DataHistory",
+    "ParsedColumnCache",
+    "parse_numbers",
+    "parse_season_numbers",
+    "KeyIndex",
+    "KeyIndexCache",
+    "KeyHashCache",
+    "hash_keys",
+    "ColumnSketch",
+    "ColumnSketchCache",
+    "HyperLogLog",
+    "MinHash",
+    "BloomFilter",
+    "count_repeats",
     "MergeEngine",
+    "MergeEstimate",
     "MergeResult",
     "MergeSummary",
+    "PartitionedMergeEngine",
+    "merge_csv_files",
+    "ProfileEngine",
+    "ProfileCancelled",
+    "ProfileCache",
+    "ColumnProfile",
+    "DatasetProfile",
+    "ColumnKindCache",
+    "detect_column_kinds",
+    "CompareCancelled",
     "CompareEngine",
     "StructureComparison",
     "RowComparison",
     "CellComparison",
     "SummaryStatsComparison",
     "ComparisonReport",
+    "ChunkedCompareEngine",
+    "ChunkedComparison",
+    "compare_csv_files",
 ]
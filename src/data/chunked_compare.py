@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+import os
+import pickle
+import shutil
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .compare_engine import (
+    CellComparison,
+    CompareCancelled,
+    CompareEngine,
+    ComparisonReport,
+    RowComparison,
+)
+from .csv_loader import _common_dtype
+
+ProgressCallback = Callable[[str, int, int], None]
+
+CELL_COLUMNS = ["row_key", "column", "old_value", "new_value", "diff_type"]
+
+
+@dataclass
+class ChunkedComparison:
+    report: ComparisonReport
+    output_files: Dict[str, str] = field(default_factory=dict)
+
+
+class _SideProfile:
+    def __init__(self) -> None:
+        self.columns: List[str] = []
+        self.dtypes: Dict[str, np.dtype] = {}
+        self.rows = 0
+        self.nulls: Dict[str, int] = {}
+        self.counts: Dict[str, int] = {}
+        self.sums: Dict[str, float] = {}
+        self.mins: Dict[str, float] = {}
+        self.maxs: Dict[str, float] = {}
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        if not self.columns:
+            self.columns = list(chunk.columns)
+        self.rows += len(chunk)
+        for col, dtype in chunk.dtypes.items():
+            self.dtypes[col] = _common_dtype(self.dtypes.get(col, dtype), dtype)
+        for col, n in chunk.isna().sum().items():
+            self.nulls[col] = self.nulls.get(col, 0) + int(n)
+
+        numeric = chunk.select_dtypes(include="number").select_dtypes(exclude="bool")
+        if not len(numeric.columns):
+            return
+        for col, n in numeric.count().items():
+            self.counts[col] = self.counts.get(col, 0) + int(n)
+        for col, total in numeric.sum().items():
+            self.sums[col] = self.sums.get(col, 0.0) + float(total)
+        for col, low in numeric.min().items():
+            if not pd.isna(low):
+                self.mins[col] = min(self.mins.get(col, low), float(low))
+        for col, high in numeric.max().items():
+            if not pd.isna(high):
+                self.maxs[col] = max(self.maxs.get(col, high), float(high))
+
+    def is_numeric(self, col: str) -> bool:
+        return self.dtypes[col].kind in "iuf"
+
+    def numeric_stats(self, col: str) -> Dict[str, float]:
+        count = self.counts.get(col, 0)
+        return {
+            "mean": self.sums[col] / count if count else np.nan,
+            "min": self.mins.get(col, np.nan),
+            "max": self.maxs.get(col, np.nan),
+            "count": count,
+        }
+
+    def empty_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {col: pd.Series(dtype=self.dtypes[col]) for col in self.columns},
+            columns=self.columns,
+        )
+
+
+def _bucket_ids(chunk: pd.DataFrame, keys: List[str], n_buckets: int) -> np.ndarray:
+    # Keys are normalised before hashing so that the same key lands in the
+    # same bucket even when the two inputs infer different dtypes for it.
+    normalized = {}
+    for k in keys:
+        values = chunk[k]
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            normalized[k] = values.astype("float64")
+        else:
+            normalized[k] = values.astype(str)
+    hashes = pd.util.hash_pandas_object(pd.DataFrame(normalized), index=False).to_numpy()
+    return (hashes % np.uint64(n_buckets)).astype(np.intp)
+
+
+def _key_dtypes(path: str, keys: Sequence[str], chunk_size: int) -> Dict[str, Any]:
+    # read_csv infers dtypes per chunk, so a key column with a few text
+    # values reads as numbers in some chunks and as text in others, and 1
+    # and "1" then land in different buckets. One pass over the key columns
+    # alone finds the dtype a single full read would give them; reading
+    # every chunk with it keeps the chunks consistent.
+    header = pd.read_csv(path, nrows=0)
+    for k in keys:
+        if k not in header.columns:
+            raise ValueError(f"Key column '{k}' must exist in both DataFrames")
+    dtypes: Dict[str, np.dtype] = {}
+    with pd.read_csv(path, usecols=list(keys), low_memory=False, engine="c", chunksize=chunk_size) as reader:
+        for chunk in reader:
+            for k in keys:
+                dtypes[k] = _common_dtype(dtypes.get(k, chunk[k].dtype), chunk[k].dtype)
+    # A full read keeps a column that is not all numbers as its text.
+    return {k: str if dtype == object else dtype for k, dtype in dtypes.items()}
+
+
+def _read_bucket(path: str, columns: List[str]) -> pd.DataFrame:
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=columns)
+    parts = []
+    with open(path, "rb") as handle:
+        while True:
+            try:
+                parts.append(pickle.load(handle))
+            except EOFError:
+                break
+    return pd.concat(parts, ignore_index=True)
+
+
+def _part_path(tmp_dir: str, kind: str, bucket: int) -> str:
+    return os.path.join(tmp_dir, f"{kind}-{bucket:05d}.csv")
+
+
+def _write_part(df: pd.DataFrame, tmp_dir: str, kind: str, bucket: int) -> None:
+    if len(df):
+        df.to_csv(_part_path(tmp_dir, kind, bucket), index=False, header=False)
+
+
+def _compare_bucket(task: Dict[str, Any]) -> Dict[str, Any]:
+    left = _read_bucket(task["left_path"], task["left_columns"])
+    right = _read_bucket(task["right_path"], task["right_columns"])
+    keys = task["keys"]
+    engine = CompareEngine()
+    alignment = engine._align_keys(left, right, keys)
+    rows = engine._compare_rows_aligned(left, right, keys, alignment)
+    cells = engine._compare_cells_aligned(left, right, keys, alignment)
+
+    tmp_dir, bucket = task["tmp_dir"], task["bucket"]
+    _write_part(rows.rows_only_left, tmp_dir, "rows_only_left", bucket)
+    _write_part(rows.rows_only_right, tmp_dir, "rows_only_right", bucket)
+    _write_part(rows.rows_in_both_differing, tmp_dir, "rows_differing", bucket)
+    _write_part(cells.difference_report, tmp_dir, "cell_differences", bucket)
+    return {
+        "only_left": rows.total_only_left,
+        "only_right": rows.total_only_right,
+        "in_both": rows.total_in_both,
+        "differing": rows.total_differing,
+        "column_diff_counts": cells.column_diff_counts,
+        "total_differences": cells.total_differences,
+    }
+
+
+class ChunkedCompareEngine:
+    DEFAULT_CHUNK_SIZE = 500_000
+    DEFAULT_BUCKET_BYTES = 256 * 1024**2
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        bucket_bytes: int = DEFAULT_BUCKET_BYTES,
+        n_buckets: Optional[int] = None,
+        workers: Optional[int] = None,
+        work_dir: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.bucket_bytes = bucket_bytes
+        self.n_buckets = n_buckets
+        self.workers = workers if workers is not None else min(4, os.cpu_count() or 1)
+        self.work_dir = work_dir
+        self.progress = progress
+        self.is_cancelled = is_cancelled
+
+    def compare_files(
+        self,
+        left_path: str,
+        right_path: str,
+        key_columns: Union[str, Sequence[str]],
+        output_dir: str,
+    ) -> ChunkedComparison:
+        keys = [key_columns] if isinstance(key_columns, str) else list(key_columns)
+        n_buckets = self.n_buckets or self._bucket_count(left_path, right_path)
+        os.makedirs(output_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix="dataforge-compare-", dir=self.work_dir)
+        try:
+            left = self._partition(left_path, "left", keys, n_buckets, tmp_dir)
+            right = self._partition(right_path, "right", keys, n_buckets, tmp_dir)
+            results = self._compare_buckets(left, right, keys, n_buckets, tmp_dir)
+            files = self._collect_outputs(left, right, n_buckets, tmp_dir, output_dir)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return ChunkedComparison(self._build_report(left, right, keys, results), files)
+
+    def _bucket_count(self, left_path: str, right_path: str) -> int:
+        largest = max(os.path.getsize(left_path), os.path.getsize(right_path))
+        return max(1, -(-largest // self.bucket_bytes))
+
+    def _check_cancelled(self) -> None:
+        if self.is_cancelled is not None and self.is_cancelled():
+            raise CompareCancelled()
+
+    def _report_progress(self, stage: str, done: int, total: int) -> None:
+        if self.progress is not None:
+            self.progress(stage, done, total)
+
+    @staticmethod
+    def _bucket_path(tmp_dir: str, side: str, bucket: int) -> str:
+        return os.path.join(tmp_dir, f"{side}-{bucket:05d}.pkl")
+
+    def _partition(
+        self, path: str, side: str, keys: List[str], n_buckets: int, tmp_dir: str
+    ) -> _SideProfile:
+        profile = _SideProfile()
+        total_bytes = os.path.getsize(path)
+        stage = f"Partitioning {side} dataset"
+        key_dtypes = _key_dtypes(path, keys, self.chunk_size)
+        with open(path, "rb") as handle:
+            reader = pd.read_csv(
+                handle, low_memory=False, engine="c", chunksize=self.chunk_size, dtype=key_dtypes
+            )
+            with reader:
+                for chunk in reader:
+                    self._check_cancelled()
+                    profile.update(chunk)
+                    bucket_ids = _bucket_ids(chunk, keys, n_buckets)
+                    for bucket, part in chunk.groupby(bucket_ids, sort=False):
+                        with open(self._bucket_path(tmp_dir, side, bucket), "ab") as out:
+                            pickle.dump(part, out, protocol=pickle.HIGHEST_PROTOCOL)
+                    self._report_progress(stage, min(handle.tell(), total_bytes), total_bytes)
+        return profile
+
+    def _compare_buckets(
+        self,
+        left: _SideProfile,
+        right: _SideProfile,
+        keys: List[str],
+        n_buckets: int,
+        tmp_dir: str,
+    ) -> List[Dict[str, Any]]:
+        tasks = [
+            {
+                "left_path": self._bucket_path(tmp_dir, "left", bucket),
+                "right_path": self._bucket_path(tmp_dir, "right", bucket),
+                "left_columns": left.columns,
+                "right_columns": right.columns,
+                "keys": keys,
+                "tmp_dir": tmp_dir,
+                "bucket": bucket,
+            }
+            for bucket in range(n_buckets)
+        ]
+        stage = "Comparing buckets"
+        results: List[Dict[str, Any]] = []
+        if self.workers <= 1:
+            for task in tasks:
+                self._check_cancelled()
+                results.append(_compare_bucket(task))
+                self._report_progress(stage, len(results), len(tasks))
+            return results
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = {pool.submit(_compare_bucket, task) for task in tasks}
+            try:
+                while pending:
+                    done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results.append(future.result())
+                    self._report_progress(stage, len(results), len(tasks))
+                    self._check_cancelled()
+            except BaseException:
+                pool.shutdown(wait=True, cancel_futures=True)
+                raise
+        return results
+
+    def _collect_outputs(
+        self,
+        left: _SideProfile,
+        right: _SideProfile,
+        n_buckets: int,
+        tmp_dir: str,
+        output_dir: str,
+    ) -> Dict[str, str]:
+        headers = {
+            "rows_only_left": left.columns,
+            "rows_only_right": right.columns,
+            "rows_differing": left.columns,
+            "cell_differences": CELL_COLUMNS,
+        }
+        files = {}
+        for kind, columns in headers.items():
+            target = os.path.join(output_dir, f"{kind}.csv")
+            with open(target, "w", newline="", encoding="utf-8") as out:
+                pd.DataFrame(columns=columns).to_csv(out, index=False)
+                for bucket in range(n_buckets):
+                    part = _part_path(tmp_dir, kind, bucket)
+                    if os.path.exists(part):
+                        with open(part, "r", encoding="utf-8") as src:
+                            shutil.copyfileobj(src, out)
+            files[kind] = target
+        return files
+
+    def _build_report(
+        self,
+        left: _SideProfile,
+        right: _SideProfile,
+        keys: List[str],
+        results: List[Dict[str, Any]],
+    ) -> ComparisonReport:
+        engine = CompareEngine()
+        structure = engine.compare_structure(left.empty_frame(), right.empty_frame())
+        structure.rows_left = left.rows
+        structure.rows_right = right.rows
+
+        column_diff_counts: Dict[str, int] = {}
+        for result in results:
+            for col, n in result["column_diff_counts"].items():
+                column_diff_counts[col] = column_diff_counts.get(col, 0) + n
+        total_differing = sum(r["differing"] for r in results)
+        row_comp = RowComparison(
+            rows_only_left=left.empty_frame(),
+            rows_only_right=right.empty_frame(),
+            rows_in_both=left.empty_frame(),
+            rows_in_both_differing=left.empty_frame(),
+            key_columns=keys,
+            total_only_left=sum(r["only_left"] for r in results),
+            total_only_right=sum(r["only_right"] for r in results),
+            total_in_both=sum(r["in_both"] for r in results),
+            total_differing=total_differing,
+        )
+        empty_cells = pd.DataFrame(columns=CELL_COLUMNS)
+        cell_comp = CellComparison(
+            difference_report=empty_cells,
+            change_log=empty_cells.drop(columns="diff_type"),
+            column_diff_counts=column_diff_counts,
+            total_differences=sum(r["total_differences"] for r in results),
+        )
+
+        common = structure.columns_common
+        numeric_stats = {
+            c: {"left": left.numeric_stats(c), "right": right.numeric_stats(c)}
+            for c in common
+            if left.is_numeric(c) and right.is_numeric(c)
+        }
+        summary_stats = engine._summary_stats_comparison(
+            {c: left.nulls[c] for c in common},
+            {c: right.nulls[c] for c in common},
+            numeric_stats,
+        )
+        human = engine._build_human_readable(structure, row_comp, cell_comp, summary_stats)
+        return ComparisonReport(
+            structure=structure,
+            row_comparison=row_comp,
+            cell_comparison=cell_comp,
+            summary_stats=summary_stats,
+            human_readable=human,
+        )
+
+
+def compare_csv_files(
+    left_path: str,
+    right_path: str,
+    key_columns: Union[str, Sequence[str]],
+    output_dir: str,
+    **options: Any,
+) -> ChunkedComparison:
+    return ChunkedCompareEngine(**options).compare_files(left_path, right_path, key_columns, output_dir)
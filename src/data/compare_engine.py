@@ -1,8 +1,21 @@
 from __future__ import annotations
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Sequence, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
 import numpy as np
 import pandas as pd
+
+from .key_index import KeyHashCache, factorize_hashed, factorize_keys
+
+SectionCallback = Callable[[str, Any], None]
+
+
+class CompareCancelled(Exception):
+
+    pass
+
+
 @dataclass
 class StructureComparison:
     columns_only_left: List[str]
@@ -45,6 +58,14 @@ class SummaryStatsComparison:
     stats_differences: List[Dict[str, Any]]
 
 
+@dataclass
+class _KeyAlignment:
+    only_left: np.ndarray
+    only_right: np.ndarray
+    both_left: np.ndarray
+    both_right: np.ndarray
+
+
 @dataclass
 class ComparisonReport:
     structure: StructureComparison
@@ -55,6 +76,15 @@ class ComparisonReport:
 
 
 class CompareEngine:
+    PARALLEL_MIN_ROWS = 50_000
+    COMPARED_STATS = ("mean", "min", "max", "std", "25%", "50%", "75%")
+
+    def __init__(
+        self, max_workers: Optional[int] = None, key_hashes: Optional[KeyHashCache] = None
+    ) -> None:
+        self.max_workers = max_workers if max_workers is not None else min(8, os.cpu_count() or 1)
+        self.key_hashes = key_hashes if key_hashes is not None else KeyHashCache()
+
     def compare_structure(
         self, left: pd.DataFrame, right: pd.DataFrame
     ) -> StructureComparison:
@@ -65,7 +95,7 @@ class CompareEngine:
         dtype_mismatches = []
         for col in sorted(common):
             lt, rt = left[col].dtype, right[col].dtype
-            if lt != rt:
+            if lt != rt and self._dtype_kind(lt) != self._dtype_kind(rt):
                 dtype_mismatches.append(
                     {
                         "column": col,
@@ -91,74 +121,33 @@ class CompareEngine:
         right: pd.DataFrame,
         key_columns: Union[str, Sequence[str]],
     ) -> RowComparison:
-        keys = [key_columns] if isinstance(key_columns, str) else list(key_columns)
-        for k in keys:
-            if k not in left.columns or k not in right.columns:
-                raise ValueError(f"Key column '{k}' must exist in both DataFrames")
-
-        left_keys = left[keys].drop_duplicates()
-        right_keys = right[keys].drop_duplicates()
-
-        left_key_set = set(map(tuple, left_keys.values))
-        right_key_set = set(map(tuple, right_keys.values))
+        keys = self._normalize_keys(left, right, key_columns)
+        return self._compare_rows_aligned(left, right, keys, self._align_keys(left, right, keys))
 
-        only_left_keys = left_key_set - right_key_set
-        only_right_keys = right_key_set - left_key_set
-        both_keys = left_key_set & right_key_set
-
-        rows_only_left = left[left[keys].apply(tuple, axis=1).isin(only_left_keys)].drop_duplicates(
-            subset=keys
-        )
-        rows_only_right = right[
-            right[keys].apply(tuple, axis=1).isin(only_right_keys)
-        ].drop_duplicates(subset=keys)
-
-        # Rows in both - need to find differing
-        common_cols = list(set(left.columns) & set(right.columns))
-        compare_cols = [c for c in common_cols if c not in keys]
-
-        rows_in_both_differing = []
-        rows_in_both_same = []
-
-        for key_tuple in both_keys:
-            left_row = left[left[keys].apply(tuple, axis=1) == key_tuple].iloc[0]
-            right_row = right[right[keys].apply(tuple, axis=1) == key_tuple].iloc[0]
-            differs = False
-            for c in compare_cols:
-                lv, rv = left_row[c], right_row[c]
-                if pd.isna(lv) and pd.isna(rv):
-                    continue
-                if pd.isna(lv) or pd.isna(rv):
-                    differs = True
-                    break
-                if lv != rv:
-                    differs = True
-                    break
-            if differs:
-                rows_in_both_differing.append(left_row)
-            else:
-                rows_in_both_same.append(left_row)
-
-        rows_in_both_df = pd.DataFrame(rows_in_both_same) if rows_in_both_same else pd.DataFrame()
-        rows_in_both_differing_df = (
-            pd.DataFrame(rows_in_both_differing) if rows_in_both_differing else pd.DataFrame()
-        )
-
-        if rows_in_both_df.empty and rows_in_both_same:
-            rows_in_both_df = pd.DataFrame(rows_in_both_same)
-        if rows_in_both_differing_df.empty and rows_in_both_differing:
-            rows_in_both_differing_df = pd.DataFrame(rows_in_both_differing)
+    def _compare_rows_aligned(
+        self,
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        keys: List[str],
+        alignment: _KeyAlignment,
+    ) -> RowComparison:
+        compare_cols = [c for c in left.columns if c in right.columns and c not in keys]
+        differs = np.zeros(len(alignment.both_left), dtype=bool)
+        for c in compare_cols:
+            differs |= self._differs(
+                left[c].take(alignment.both_left), right[c].take(alignment.both_right)
+            )
 
         return RowComparison(
-            rows_only_left=rows_only_left,
-            rows_only_right=rows_only_right,
-            rows_in_both=rows_in_both_df,
-            rows_in_both_differing=rows_in_both_differing_df,
+            rows_only_left=left.take(alignment.only_left),
+            rows_only_right=right.take(alignment.only_right),
+            rows_in_both=left.take(alignment.both_left[~differs]),
+            rows_in_both_differing=left.take(alignment.both_left[differs]),
             key_columns=keys,
-            total_only_left=len(rows_only_left),
-            total_only_right=len(rows_only_right),
-            total_in_both=len(both_keys),
-            total_differing=len(rows_in_both_differing),
+            total_only_left=len(alignment.only_left),
+            total_only_right=len(alignment.only_right),
+            total_in_both=len(alignment.both_left),
+            total_differing=int(differs.sum()),
         )
 
     def compare_cells(
@@ -167,114 +156,278 @@ class CompareEngine:
         right: pd.DataFrame,
         key_columns: Union[str, Sequence[str]],
     ) -> CellComparison:
-        keys = [key_columns] if isinstance(key_columns, str) else list(key_columns)
-        row_comp = self.compare_rows(left, right, keys)
-
-        change_records = []
-        column_diff_counts: Dict[str, int] = {}
-
-        for _, left_row in row_comp.rows_in_both_differing.iterrows():
-            key_tuple = tuple(left_row[k] for k in keys)
-            right_match = right[right[keys].apply(tuple, axis=1) == key_tuple]
-            if right_match.empty:
-                continue
-            right_row = right_match.iloc[0]
-            row_key = key_tuple[0] if len(keys) == 1 else key_tuple
-
-            common_cols = [c for c in left.columns if c in right.columns and c not in keys]
-            for col in common_cols:
-                lv, rv = left_row[col], right_row[col]
-                if self._values_differ(lv, rv):
-                    diff_type = self._classify_diff(lv, rv)
-                    change_records.append(
-                        {
-                            "row_key": row_key,
-                            "column": col,
-                            "old_value": lv,
-                            "new_value": rv,
-                            "diff_type": diff_type,
-                        }
-                    )
-                    column_diff_counts[col] = column_diff_counts.get(col, 0) + 1
-
-        change_log = pd.DataFrame(
-            [
-                {
-                    "row_key": r["row_key"],
-                    "column": r["column"],
-                    "old_value": r["old_value"],
-                    "new_value": r["new_value"],
-                }
-                for r in change_records
-            ]
+        keys = self._normalize_keys(left, right, key_columns)
+        return self._compare_cells_aligned(left, right, keys, self._align_keys(left, right, keys))
+
+    def _compare_cells_aligned(
+        self,
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        keys: List[str],
+        alignment: _KeyAlignment,
+    ) -> CellComparison:
+        compare_cols = [c for c in left.columns if c in right.columns and c not in keys]
+        diff_columns: Dict[str, np.ndarray] = {}
+        for c in compare_cols:
+            differs = self._differs(
+                left[c].take(alignment.both_left),
+                right[c].take(alignment.both_right),
+                tolerant=True,
+            )
+            if differs.any():
+                diff_columns[c] = differs
+
+        columns = ["row_key", "column", "old_value", "new_value", "diff_type"]
+        if not diff_columns:
+            empty = pd.DataFrame(columns=columns)
+            return CellComparison(
+                difference_report=empty,
+                change_log=empty.drop(columns="diff_type"),
+                column_diff_counts={},
+                total_differences=0,
+            )
+
+        # Boolean diff matrix over the matched pairs that differ somewhere;
+        # stacking it yields the (pair, column) cells in row-major order.
+        diff_matrix = pd.DataFrame(diff_columns)
+        diff_matrix = diff_matrix[diff_matrix.any(axis=1)]
+        stacked = diff_matrix.stack()
+        hits = stacked.to_numpy(dtype=bool)
+        pairs = stacked.index.get_level_values(0).to_numpy()[hits]
+        changed_cols = stacked.index.get_level_values(1)[hits]
+
+        left_rows = alignment.both_left[diff_matrix.index.to_numpy()]
+        right_rows = alignment.both_right[diff_matrix.index.to_numpy()]
+        old_values = self._cell_matrix(left, list(diff_columns), left_rows)[hits]
+        new_values = self._cell_matrix(right, list(diff_columns), right_rows)[hits]
+
+        key_rows = alignment.both_left[pairs]
+        if len(keys) == 1:
+            row_keys = left[keys[0]].to_numpy(dtype=object)[key_rows]
+        else:
+            row_keys = np.empty(len(key_rows), dtype=object)
+            row_keys[:] = list(zip(*(left[k].to_numpy(dtype=object)[key_rows] for k in keys)))
+
+        old_null = pd.isna(old_values)
+        new_null = pd.isna(new_values)
+        diff_types = np.select(
+            [old_null & ~new_null, ~old_null & new_null], ["filled", "nullified"], "changed"
         )
-        diff_report = pd.DataFrame(change_records)
 
+        diff_report = pd.DataFrame(
+            {
+                "row_key": row_keys,
+                "column": changed_cols,
+                "old_value": old_values,
+                "new_value": new_values,
+                "diff_type": diff_types,
+            },
+            columns=columns,
+        )
         return CellComparison(
             difference_report=diff_report,
-            change_log=change_log,
-            column_diff_counts=column_diff_counts,
-            total_differences=len(change_records),
+            change_log=diff_report.drop(columns="diff_type"),
+            column_diff_counts={c: int(d.sum()) for c, d in diff_columns.items()},
+            total_differences=len(diff_report),
+        )
+
+    @staticmethod
+    def _cell_matrix(df: pd.DataFrame, columns: List[str], rows: np.ndarray) -> np.ndarray:
+        matrix = np.empty((len(rows), len(columns)), dtype=object)
+        for j, c in enumerate(columns):
+            matrix[:, j] = df[c].to_numpy(dtype=object)[rows]
+        return matrix.ravel()
+
+    def _normalize_keys(
+        self,
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        key_columns: Union[str, Sequence[str]],
+    ) -> List[str]:
+        keys = [key_columns] if isinstance(key_columns, str) else list(key_columns)
+        for k in keys:
+            if k not in left.columns or k not in right.columns:
+                raise ValueError(f"Key column '{k}' must exist in both DataFrames")
+        return keys
+
+    def _align_keys(
+        self, left: pd.DataFrame, right: pd.DataFrame, keys: List[str]
+    ) -> _KeyAlignment:
+        # One factorization over both sides gives every distinct key a code;
+        # the first row holding each code is the row that represents it.
+        if len(keys) > 1:
+            codes, null_groups = factorize_hashed(
+                [self.key_hashes.get_or_hash(left, keys), self.key_hashes.get_or_hash(right, keys)],
+                [left[keys], right[keys]],
+            )
+        else:
+            codes, null_groups = factorize_keys(
+                pd.concat([left[keys], right[keys]], ignore_index=True)
+            )
+        n_keys = len(null_groups)
+        left_first = self._first_positions(codes[: len(left)], n_keys)
+        right_first = self._first_positions(codes[len(left):], n_keys)
+
+        in_left = left_first >= 0
+        in_right = right_first >= 0
+        both_mask = in_left & in_right
+        order = np.argsort(left_first[both_mask], kind="stable")
+        return _KeyAlignment(
+            only_left=np.sort(left_first[in_left & ~in_right]),
+            only_right=np.sort(right_first[in_right & ~in_left]),
+            both_left=left_first[both_mask][order],
+            both_right=right_first[both_mask][order],
         )
 
-    def _values_differ(self, a: Any, b: Any) -> bool:
-        if pd.isna(a) and pd.isna(b):
-            return False
-        if pd.isna(a) or pd.isna(b):
-            return True
-        if isinstance(a, (int, float)) and isinstance(b, (int, float)):
-            return not np.isclose(a, b, equal_nan=True)
-        return a != b
-
-    def _classify_diff(self, old_val: Any, new_val: Any) -> str:
-        if pd.isna(old_val) and not pd.isna(new_val):
-            return "filled"
-        if not pd.isna(old_val) and pd.isna(new_val):
-            return "nullified"
-        return "changed"
+    @staticmethod
+    def _first_positions(codes: np.ndarray, n_keys: int) -> np.ndarray:
+        first = np.full(n_keys, -1, dtype=np.intp)
+        distinct = pd.Series(codes).drop_duplicates()
+        first[distinct.to_numpy()] = distinct.index.to_numpy()
+        return first
+
+    @staticmethod
+    def _differs(
+        left_values: pd.Series, right_values: pd.Series, tolerant: bool = False
+    ) -> np.ndarray:
+        left_values = left_values.reset_index(drop=True)
+        right_values = right_values.reset_index(drop=True)
+        if tolerant and all(CompareEngine._is_plain_numeric(v) for v in (left_values, right_values)):
+            return ~np.isclose(
+                left_values.to_numpy(dtype=float, na_value=np.nan),
+                right_values.to_numpy(dtype=float, na_value=np.nan),
+                equal_nan=True,
+            )
+        both_null = left_values.isna().to_numpy() & right_values.isna().to_numpy()
+        try:
+            equal = left_values == right_values
+        except (TypeError, ValueError):
+            equal = left_values.astype(object) == right_values.astype(object)
+        equal = equal.fillna(False).to_numpy(dtype=bool)
+        return ~(equal | both_null)
+
+    @staticmethod
+    def _dtype_kind(dtype) -> str:
+        # Loading narrows numbers and turns repetitive text into categories
+        # per file, so two exports of one schema can differ in width or in
+        # category vs object; columns are compared by kind instead.
+        if isinstance(dtype, pd.CategoricalDtype):
+            dtype = dtype.categories.dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            return "bool"
+        if pd.api.types.is_integer_dtype(dtype):
+            return "integer"
+        if pd.api.types.is_float_dtype(dtype):
+            return "float"
+        if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            return "text"
+        return str(dtype)
+
+    @staticmethod
+    def _is_plain_numeric(values: pd.Series) -> bool:
+        return pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
 
     def compare_summary_stats(
-        self, left: pd.DataFrame, right: pd.DataFrame
+        self, left: pd.DataFrame, right: pd.DataFrame, extended: bool = False
     ) -> SummaryStatsComparison:
         common_cols = list(set(left.columns) & set(right.columns))
+        numeric_cols = {
+            c
+            for c in common_cols
+            if pd.api.types.is_numeric_dtype(left[c]) and pd.api.types.is_numeric_dtype(right[c])
+        }
+
+        null_left, stats_left = self._frame_stats(left, common_cols, numeric_cols, extended)
+        null_right, stats_right = self._frame_stats(right, common_cols, numeric_cols, extended)
+        numeric_stats: Dict[str, Dict[str, Dict[str, float]]] = {
+            c: {"left": stats_left[c], "right": stats_right[c]}
+            for c in common_cols
+            if c in numeric_cols
+        }
+        return self._summary_stats_comparison(null_left, null_right, numeric_stats)
 
-        null_left = {c: int(left[c].isna().sum()) for c in common_cols}
-        null_right = {c: int(right[c].isna().sum()) for c in common_cols}
+    def _frame_stats(
+        self,
+        df: pd.DataFrame,
+        columns: List[str],
+        numeric_cols: Set[str],
+        extended: bool,
+    ) -> Tuple[Dict[str, int], Dict[str, Dict[str, float]]]:
+        # Each column is reduced straight off its backing array, with no
+        # dropna() copy; the numpy reductions release the GIL, so wide
+        # frames spread batches of columns over a thread pool.
+        def run(batch: List[str]) -> List[Tuple[str, int, Optional[Dict[str, float]]]]:
+            return [(c, *self._column_stats(df[c], c in numeric_cols, extended)) for c in batch]
+
+        batch_size = max(1, -(-len(columns) // (self.max_workers * 4)))
+        batches = [columns[i:i + batch_size] for i in range(0, len(columns), batch_size)]
+        if len(batches) > 1 and self.max_workers > 1 and len(df) >= self.PARALLEL_MIN_ROWS:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                results = list(pool.map(run, batches))
+        else:
+            results = [run(batch) for batch in batches]
+
+        nulls: Dict[str, int] = {}
+        stats: Dict[str, Dict[str, float]] = {}
+        for batch in results:
+            for col, col_nulls, col_stats in batch:
+                nulls[col] = col_nulls
+                if col_stats is not None:
+                    stats[col] = col_stats
+        return nulls, stats
+
+    @staticmethod
+    def _column_stats(
+        series: pd.Series, numeric: bool, extended: bool
+    ) -> Tuple[int, Optional[Dict[str, float]]]:
+        if not numeric:
+            return int(series.isna().sum()), None
+
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind == "f":
+            values = series.to_numpy()
+        else:
+            values = series.to_numpy(dtype=float, na_value=np.nan)
+        missing = np.isnan(values)
+        nulls = int(missing.sum())
+        count = len(values) - nulls
+        stats: Dict[str, float] = {"mean": np.nan, "min": np.nan, "max": np.nan}
+        if extended:
+            stats.update({"std": np.nan, "25%": np.nan, "50%": np.nan, "75%": np.nan})
+        if count:
+            present = values[~missing] if nulls else values
+            stats["mean"] = float(present.mean())
+            stats["min"] = float(present.min())
+            stats["max"] = float(present.max())
+            if extended:
+                if count > 1:
+                    stats["std"] = float(present.std(ddof=1))
+                quantiles = np.quantile(present, [0.25, 0.5, 0.75])
+                stats["25%"], stats["50%"], stats["75%"] = (float(q) for q in quantiles)
+        stats["count"] = count
+        if extended:
+            stats["distinct"] = int(len(pd.unique(values[~missing])))
+        return nulls, stats
+
+    def _summary_stats_comparison(
+        self,
+        null_left: Dict[str, int],
+        null_right: Dict[str, int],
+        numeric_stats: Dict[str, Dict[str, Dict[str, float]]],
+    ) -> SummaryStatsComparison:
         null_diffs = {
             c: {
                 "left": null_left[c],
                 "right": null_right[c],
                 "diff": null_right[c] - null_left[c],
             }
-            for c in common_cols
+            for c in null_left
         }
-
-        numeric_cols = [
-            c
-            for c in common_cols
-            if pd.api.types.is_numeric_dtype(left[c]) and pd.api.types.is_numeric_dtype(right[c])
-        ]
-        numeric_stats: Dict[str, Dict[str, Dict[str, float]]] = {}
         stats_differences = []
-
-        for col in numeric_cols:
-            l_vals = left[col].dropna()
-            r_vals = right[col].dropna()
-            left_stats = {
-                "mean": float(l_vals.mean()) if len(l_vals) else np.nan,
-                "min": float(l_vals.min()) if len(l_vals) else np.nan,
-                "max": float(l_vals.max()) if len(l_vals) else np.nan,
-                "count": int(len(l_vals)),
-            }
-            right_stats = {
-                "mean": float(r_vals.mean()) if len(r_vals) else np.nan,
-                "min": float(r_vals.min()) if len(r_vals) else np.nan,
-                "max": float(r_vals.max()) if len(r_vals) else np.nan,
-                "count": int(len(r_vals)),
-            }
-            numeric_stats[col] = {"left": left_stats, "right": right_stats}
-            for stat in ["mean", "min", "max"]:
-                lv, rv = left_stats[stat], right_stats[stat]
+        for col, sides in numeric_stats.items():
+            for stat in self.COMPARED_STATS:
+                if stat not in sides["left"] or stat not in sides["right"]:
+                    continue
+                lv, rv = sides["left"][stat], sides["right"][stat]
                 if not (np.isnan(lv) and np.isnan(rv)):
                     if np.isnan(lv) or np.isnan(rv) or not np.isclose(lv, rv):
                         stats_differences.append(
@@ -299,19 +452,36 @@ class CompareEngine:
         left: pd.DataFrame,
         right: pd.DataFrame,
         key_columns: Optional[Union[str, Sequence[str]]] = None,
+        extended_stats: bool = False,
+        on_section: Optional[SectionCallback] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
     ) -> ComparisonReport:
+        # on_section receives each part as soon as it is ready ("structure",
+        # "rows", "cells", "stats"); is_cancelled is polled between parts.
+        def finish(name: str, result: Any) -> None:
+            if on_section is not None:
+                on_section(name, result)
+            if is_cancelled is not None and is_cancelled():
+                raise CompareCancelled()
+
         structure = self.compare_structure(left, right)
+        finish("structure", structure)
         row_comp = None
         cell_comp = None
 
         if key_columns:
             try:
-                row_comp = self.compare_rows(left, right, key_columns)
-                cell_comp = self.compare_cells(left, right, key_columns)
+                keys = self._normalize_keys(left, right, key_columns)
+                alignment = self._align_keys(left, right, keys)
+                row_comp = self._compare_rows_aligned(left, right, keys, alignment)
+                finish("rows", row_comp)
+                cell_comp = self._compare_cells_aligned(left, right, keys, alignment)
+                finish("cells", cell_comp)
             except ValueError:
                 pass
 
-        summary_stats = self.compare_summary_stats(left, right)
+        summary_stats = self.compare_summary_stats(left, right, extended=extended_stats)
+        finish("stats", summary_stats)
         human = self._build_human_readable(
             structure, row_comp, cell_comp, summary_stats
         )
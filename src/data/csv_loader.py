@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import os
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class LoadCancelled(Exception):
+
+    pass
+
+
+class _ColumnBuffer:
+    GROWTH_FACTOR = 1.25
+
+    def __init__(self, dtype: np.dtype, capacity: int) -> None:
+        self.values = np.empty(capacity, dtype=dtype)
+        self.size = 0
+        # Set once chunks of different kinds meet in an object column; the
+        # numbers parsed from the earlier chunks are then not the text a
+        # single read_csv pass would have kept.
+        self.mixed = False
+
+    def append(self, chunk: np.ndarray) -> None:
+        dtype = _common_dtype(self.values.dtype, chunk.dtype)
+        if dtype == object and (self.values.dtype != object or chunk.dtype != object):
+            self.mixed = True
+        if dtype != self.values.dtype:
+            self.values = self.values.astype(dtype)
+        end = self.size + len(chunk)
+        if end > len(self.values):
+            capacity = max(end, int(len(self.values) * self.GROWTH_FACTOR) + 1)
+            self.values.resize(capacity, refcheck=False)
+        self.values[self.size:end] = chunk
+        self.size = end
+
+    def finish(self) -> np.ndarray:
+        if len(self.values) != self.size:
+            self.values.resize(self.size, refcheck=False)
+        values, self.values = self.values, np.empty(0, dtype=self.values.dtype)
+        return values
+
+
+def _common_dtype(left: np.dtype, right: np.dtype) -> np.dtype:
+    if left == right:
+        return left
+    if left.kind in "iuf" and right.kind in "iuf":
+        return np.result_type(left, right)
+    return np.dtype(object)
+
+
+class ChunkedCSVReader:
+    DEFAULT_CHUNK_SIZE = 50_000
+
+    def __init__(
+        self,
+        path: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        self.path = path
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.is_cancelled = is_cancelled
+
+    def read(self) -> pd.DataFrame:
+        total_bytes = os.path.getsize(self.path)
+        columns: List[str] = []
+        buffers: Dict[str, _ColumnBuffer] = {}
+        rows = 0
+        with open(self.path, "rb") as handle:
+            reader = pd.read_csv(
+                handle, low_memory=False, engine="c", chunksize=self.chunk_size
+            )
+            with reader:
+                for chunk in reader:
+                    if self.is_cancelled is not None and self.is_cancelled():
+                        raise LoadCancelled(self.path)
+                    if not buffers:
+                        columns = list(chunk.columns)
+                        capacity = self._estimate_rows(len(chunk), handle.tell(), total_bytes)
+                        buffers = {
+                            col: _ColumnBuffer(chunk[col].dtype, capacity) for col in columns
+                        }
+                    for col in columns:
+                        buffers[col].append(chunk[col].to_numpy())
+                    rows += len(chunk)
+                    del chunk
+                    if self.progress is not None:
+                        self.progress(min(handle.tell(), total_bytes), rows)
+
+        if not buffers:
+            return pd.read_csv(self.path, nrows=0)
+        mixed = [col for col in columns if buffers[col].mixed]
+        data = {col: buffers.pop(col).finish() for col in columns}
+        if mixed:
+            if self.is_cancelled is not None and self.is_cancelled():
+                raise LoadCancelled(self.path)
+            text = pd.read_csv(
+                self.path, usecols=mixed, dtype=str, low_memory=False, engine="c"
+            )
+            for col in mixed:
+                data[col] = text[col].to_numpy()
+            del text
+        return pd.DataFrame(data, index=pd.RangeIndex(rows), columns=columns, copy=False)
+
+    @staticmethod
+    def _estimate_rows(chunk_rows: int, bytes_read: int, total_bytes: int) -> int:
+        if chunk_rows == 0 or bytes_read <= 0:
+            return chunk_rows
+        return max(chunk_rows, int(total_bytes / bytes_read * chunk_rows * 1.02) + 1)
+
+
+def read_csv_chunked(
+    path: str,
+    chunk_size: int = ChunkedCSVReader.DEFAULT_CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+    is_cancelled: Optional[Callable[[], bool]] = None,
+) -> pd.DataFrame:
+    return ChunkedCSVReader(path, chunk_size, progress, is_cancelled).read()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import warnings
+from typing import Any, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Month-first formats come before their day-first twins so that fully
+# ambiguous columns keep the previous dayfirst=False behaviour.
+CANDIDATE_FORMATS: Sequence[str] = (
+    "ISO8601",
+    "%m/%d/%Y",
+    "%d/%m/%Y",
+    "%m/%d/%Y %H:%M",
+    "%d/%m/%Y %H:%M",
+    "%m/%d/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M:%S",
+    "%m/%d/%y",
+    "%d/%m/%y",
+    "%m-%d-%Y",
+    "%d-%m-%Y",
+    "%d.%m.%Y",
+    "%Y/%m/%d",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y%m%d",
+    "%d %B %Y",
+    "%d %b %Y",
+    "%B %d, %Y",
+    "%b %d, %Y",
+    "%B %d %Y",
+    "%b %d %Y",
+)
+
+
+def _empty(index: pd.Index) -> pd.Series:
+    return pd.Series(pd.NaT, index=index, dtype="datetime64[ns]")
+
+
+def _apply_format(text: pd.Series, fmt: str, dayfirst: bool = False) -> pd.Series:
+    if text.empty:
+        return _empty(text.index)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            parsed = pd.to_datetime(text, format=fmt, dayfirst=dayfirst, errors="coerce", utc=True)
+    except (ValueError, TypeError, OverflowError):
+        return _empty(text.index)
+    return parsed.dt.tz_localize(None)
+
+
+def infer_date_formats(
+    sample: pd.Series,
+    candidates: Sequence[str] = CANDIDATE_FORMATS,
+    min_share: float = 0.01,
+) -> List[str]:
+    formats: List[str] = []
+    remaining = sample
+    while not remaining.empty:
+        best, best_hits = None, 0
+        for fmt in candidates:
+            if fmt in formats:
+                continue
+            hits = int(_apply_format(remaining, fmt).notna().sum())
+            if hits > best_hits:
+                best, best_hits = fmt, hits
+        if best is None or best_hits < min_share * len(sample):
+            break
+        formats.append(best)
+        remaining = remaining[_apply_format(remaining, best).isna()]
+    return formats
+
+
+def parse_dates(values: pd.Series, sample_size: int = 2_000, random_state: int = 0) -> pd.Series:
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        if getattr(values.dt, "tz", None) is not None:
+            return values.dt.tz_convert(None)
+        return values
+    if not pd.api.types.is_object_dtype(values) and not pd.api.types.is_string_dtype(values):
+        return pd.to_datetime(values, errors="coerce")
+
+    codes, uniques = pd.factorize(values)
+    text = pd.Series(uniques, dtype=object)
+    if pd.api.types.infer_dtype(text, skipna=True) != "string":
+        text = text.map(str)
+    text = text.str.strip()
+    parsed = _empty(text.index)
+
+    sample = text if len(text) <= sample_size else text.sample(sample_size, random_state=random_state)
+    remaining = text[text != ""]
+    for fmt in infer_date_formats(sample):
+        hits = _apply_format(remaining, fmt)
+        matched = hits.notna()
+        parsed[matched[matched].index] = hits[matched]
+        remaining = remaining[~matched]
+        if remaining.empty:
+            break
+
+    # Whatever the dominant formats missed goes through dateutil, but only
+    # for text that could plausibly hold a date.
+    remaining = remaining[remaining.str.contains(r"\d", regex=True)]
+    if not remaining.empty:
+        parsed[remaining.index] = _apply_format(remaining, "mixed", dayfirst=True)
+
+    lookup = np.append(parsed.to_numpy(), np.datetime64("NaT", "ns"))
+    return pd.Series(lookup[codes], index=values.index, name=values.name)
+
+
+def parse_date(value: Any) -> pd.Timestamp:
+    return parse_dates(pd.Series([value], dtype=object)).iloc[0]
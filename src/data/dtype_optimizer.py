@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .dates import CANDIDATE_FORMATS, _apply_format, infer_date_formats
+
+# Four-digit years only, first or last, with - or / separators: dotted
+# text is too often a version number and two-digit years are ambiguous.
+_DATE_LIKE = re.compile(
+    r"^\s*(?:\d{4}([-/])\d{1,2}\1\d{1,2}|\d{1,2}([-/])\d{1,2}\2\d{4})"
+    r"(?:[ T]\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?\s*$"
+)
+
+
+@dataclass
+class DtypeOptimizationReport:
+    memory_before: int
+    memory_after: int
+    conversions: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def memory_saved(self) -> int:
+        return self.memory_before - self.memory_after
+
+    def describe(self) -> str:
+        if not self.conversions:
+            return "No column types changed."
+        saved_mb = self.memory_saved / (1024 * 1024)
+        pct = self.memory_saved / self.memory_before * 100 if self.memory_before else 0.0
+        return (
+            f"Optimized {len(self.conversions)} column(s), "
+            f"saved {saved_mb:,.1f} MB ({pct:.0f}%)"
+        )
+
+
+class DtypeOptimizer:
+    def __init__(
+        self,
+        sample_size: int = 10_000,
+        category_max_ratio: float = 0.5,
+        random_state: int = 0,
+    ) -> None:
+        self.sample_size = sample_size
+        self.category_max_ratio = category_max_ratio
+        self.random_state = random_state
+
+    def optimize(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, DtypeOptimizationReport]:
+        memory_before = int(df.memory_usage(deep=True, index=False).sum())
+        saved = 0
+        conversions: List[Dict[str, Any]] = []
+        result = df.copy(deep=False)
+
+        for col in df.columns:
+            series = df[col]
+            converted = self._convert_column(series)
+            if converted is None or converted.dtype == series.dtype:
+                continue
+            before = int(series.memory_usage(deep=True, index=False))
+            after = int(converted.memory_usage(deep=True, index=False))
+            if after >= before:
+                continue
+            result[col] = converted
+            saved += before - after
+            conversions.append(
+                {
+                    "column": col,
+                    "from_dtype": str(series.dtype),
+                    "to_dtype": str(converted.dtype),
+                    "bytes_saved": before - after,
+                }
+            )
+
+        return result, DtypeOptimizationReport(
+            memory_before=memory_before,
+            memory_after=memory_before - saved,
+            conversions=conversions,
+        )
+
+    def _convert_column(self, series: pd.Series) -> Optional[pd.Series]:
+        dtype = series.dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            return None
+        if pd.api.types.is_integer_dtype(dtype) and isinstance(dtype, np.dtype):
+            return pd.to_numeric(series, downcast="integer")
+        if pd.api.types.is_float_dtype(dtype) and isinstance(dtype, np.dtype):
+            return self._downcast_float(series)
+        if pd.api.types.is_object_dtype(dtype):
+            return self._convert_object(series)
+        return None
+
+    def _downcast_float(self, series: pd.Series) -> Optional[pd.Series]:
+        if series.dtype == np.float32:
+            return None
+        values = series.to_numpy()
+        with np.errstate(over="ignore", invalid="ignore"):
+            narrowed = values.astype(np.float32)
+        if not np.array_equal(narrowed.astype(values.dtype), values, equal_nan=True):
+            return None
+        return pd.Series(narrowed, index=series.index, name=series.name)
+
+    def _sample(self, series: pd.Series) -> pd.Series:
+        non_null = series.dropna()
+        if len(non_null) > self.sample_size:
+            return non_null.sample(self.sample_size, random_state=self.random_state)
+        return non_null
+
+    def _parse_dates(self, series: pd.Series, sample: pd.Series) -> Optional[pd.Series]:
+        # Only a single format that reads the whole sample, and that no
+        # other format reads differently (01/02/2020 as January or as
+        # February), is trusted; anything else stays text.
+        text = pd.Series(sample.unique(), dtype=object).str.strip()
+        formats = infer_date_formats(text)
+        if len(formats) != 1:
+            return None
+        chosen = _apply_format(text, formats[0])
+        if chosen.isna().any():
+            return None
+        for fmt in CANDIDATE_FORMATS:
+            other = _apply_format(text, fmt)
+            if fmt != formats[0] and other.notna().all() and not other.equals(chosen):
+                return None
+        parsed = _apply_format(series.str.strip(), formats[0])
+        if parsed.isna().sum() != series.isna().sum():
+            return None
+        return parsed
+
+    def _convert_object(self, series: pd.Series) -> Optional[pd.Series]:
+        sample = self._sample(series)
+        if sample.empty:
+            return None
+        if not all(isinstance(v, str) for v in sample):
+            return None
+
+        if sample.str.match(_DATE_LIKE).all():
+            parsed = self._parse_dates(series, sample)
+            if parsed is not None:
+                return parsed
+
+        if sample.nunique() > self.category_max_ratio * len(sample):
+            return None
+        # Sorted categories keep the column sorting alphabetically, as it
+        # did as text.
+        try:
+            codes, uniques = pd.factorize(series, sort=True)
+        except TypeError:
+            return None
+        if len(uniques) > self.category_max_ratio * len(series):
+            return None
+        return pd.Series(
+            pd.Categorical.from_codes(codes, categories=uniques),
+            index=series.index,
+            name=series.name,
+        )
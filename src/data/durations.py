@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pc = None
+
+_CLOCK_PREFIX = r"^(?P<a>\d+):(?P<b>\d+)(?::(?P<c>\d+))?"
+_CLOCK_FULL = r"^(?P<a>\d+):(?P<b>\d+)(?::(?P<c>\d+))?$"
+_UNIT_SECONDS = (
+    r"(\d+(?:\.\d+)?)\s*"
+    r"(days?|day|d|hours?|hour|h|minutes?|minute|mins?|min|m|seconds?|second|secs?|sec|s)"
+)
+_CALENDAR_DAYS = (
+    (r"(\d+)\s*year", 365),
+    (r"(\d+)\s*month", 30),
+    (r"(\d+)\s*week", 7),
+    (r"(\d+)\s*day", 1),
+)
+
+
+def _normalize_text(text: pd.Series) -> pd.Series:
+    if pa is not None:
+        arr = pa.array(text.to_numpy(dtype=object), type=pa.string())
+        arr = pc.utf8_lower(pc.utf8_trim_whitespace(arr))
+        return pd.Series(arr.to_numpy(zero_copy_only=False), index=text.index, dtype=object)
+    return text.str.strip().str.lower()
+
+
+def _extract_numbers(text: pd.Series, pattern: str) -> pd.DataFrame:
+    if pa is not None:
+        arr = pa.array(text.to_numpy(dtype=object), type=pa.string())
+        matched = pc.extract_regex(arr, pattern)
+        columns = {}
+        for i in range(matched.type.num_fields):
+            group = matched.field(i)
+            # Optional groups that did not participate come back as "" rather than null.
+            group = pc.if_else(pc.equal(group, ""), pa.scalar(None, pa.string()), group)
+            columns[matched.type.field(i).name] = pc.cast(group, pa.float64()).to_numpy(
+                zero_copy_only=False
+            )
+        return pd.DataFrame(columns, index=text.index)
+    return text.str.extract(pattern).astype(float)
+
+
+def _sum_all(text: pd.Series, pattern: str) -> pd.Series:
+    matches = text.str.extractall(pattern)
+    if matches.empty:
+        return pd.Series(0.0, index=text.index)
+    values = matches[0].astype(float).groupby(level=0).sum()
+    return values.reindex(text.index, fill_value=0.0)
+
+
+def _text_to_days(text: pd.Series) -> pd.Series:
+    result = pd.Series(np.nan, index=text.index, dtype=float)
+
+    clock = _extract_numbers(text, _CLOCK_PREFIX)
+    is_clock = clock["a"].notna()
+    clock = clock[is_clock]
+    result[is_clock] = clock["a"] / 24 + clock["b"] / 1440 + clock["c"].fillna(0) / 86400
+    rest = text[~is_clock]
+    if rest.empty:
+        return result
+
+    hours = _extract_numbers(rest, r"(?P<v>\d+)\s*hour")["v"].fillna(0)
+    minutes = _extract_numbers(rest, r"(?P<v>\d+)\s*min")["v"].fillna(0)
+    seconds = _extract_numbers(rest, r"(?P<v>\d+)\s*sec")["v"].fillna(0)
+    has_hms = (hours != 0) | (minutes != 0) | (seconds != 0)
+    result[has_hms[has_hms].index] = (hours / 24 + minutes / 1440 + seconds / 86400)[has_hms]
+    rest = rest[~has_hms]
+    if rest.empty:
+        return result
+
+    total = pd.Series(0.0, index=rest.index)
+    for pattern, factor in _CALENDAR_DAYS:
+        total += _sum_all(rest, pattern) * factor
+    first_number = _extract_numbers(rest, r"(?P<v>\d+)")["v"]
+    result[rest.index] = total.where(total != 0, first_number)
+    return result
+
+
+def _text_to_seconds(text: pd.Series) -> pd.Series:
+    result = pd.Series(np.nan, index=text.index, dtype=float)
+    text = text[text != ""]
+
+    clock = _extract_numbers(text, _CLOCK_FULL)
+    is_clock = clock["a"].notna()
+    clock = clock[is_clock]
+    result[is_clock[is_clock].index] = np.where(
+        clock["c"].notna(),
+        clock["a"] * 3600 + clock["b"] * 60 + clock["c"],
+        clock["a"] * 60 + clock["b"],
+    )
+    rest = text[~is_clock]
+    if rest.empty:
+        return result
+
+    matches = rest.str.extractall(_UNIT_SECONDS)
+    if not matches.empty:
+        unit = matches[1].str[0]
+        factor = np.select([unit == "d", unit == "h", unit == "m"], [86400.0, 3600.0, 60.0], 1.0)
+        totals = (matches[0].astype(float) * factor).groupby(level=0).sum()
+        result[totals.index] = totals
+        rest = rest.drop(totals.index)
+    if not rest.empty:
+        result[rest.index] = pd.to_timedelta(rest, errors="coerce").dt.total_seconds().round(6)
+    return result
+
+
+def _parse(values: pd.Series, text_parser: Callable[[pd.Series], pd.Series], tick: float) -> pd.Series:
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+    if pd.api.types.is_timedelta64_dtype(values):
+        return values.dt.total_seconds() / tick
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(float)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return pd.Series(np.nan, index=values.index, dtype=float)
+
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques, dtype=object)
+    parsed = pd.Series(np.nan, index=uniques.index, dtype=float)
+    if pd.api.types.infer_dtype(uniques, skipna=True) == "string":
+        is_text = pd.Series(True, index=uniques.index)
+    else:
+        is_text = uniques.map(lambda v: isinstance(v, str)).astype(bool)
+    if is_text.any():
+        parsed[is_text] = text_parser(_normalize_text(uniques[is_text]))
+    others = uniques[~is_text]
+    if not others.empty:
+        is_number = others.map(lambda v: isinstance(v, (int, float))).astype(bool)
+        is_delta = others.map(lambda v: isinstance(v, (pd.Timedelta, np.timedelta64))).astype(bool)
+        if is_number.any():
+            parsed[is_number[is_number].index] = others[is_number].astype(float)
+        if is_delta.any():
+            parsed[is_delta[is_delta].index] = (
+                pd.to_timedelta(others[is_delta]).dt.total_seconds() / tick
+            )
+
+    lookup = np.append(parsed.to_numpy(), np.nan)
+    return pd.Series(lookup[codes], index=values.index, name=values.name)
+
+
+def parse_durations_to_days(values: pd.Series) -> pd.Series:
+    return _parse(values, _text_to_days, 86400.0)
+
+
+def parse_durations_to_seconds(values: pd.Series) -> pd.Series:
+    return _parse(values, _text_to_seconds, 1.0)
+
+
+def parse_duration_to_days(value: Any) -> float:
+    return float(parse_durations_to_days(pd.Series([value], dtype=object)).iloc[0])
+
+
+def parse_duration_to_seconds(value: Any) -> float:
+    return float(parse_durations_to_seconds(pd.Series([value], dtype=object)).iloc[0])
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import List, Optional
+
+import pandas as pd
+
+try:
+    from pyarrow import feather
+except ImportError:  # pragma: no cover - optional dependency
+    feather = None
+
+
+def default_cache_dir() -> str:
+    return os.path.join(os.path.expanduser("~"), ".dataforge", "cache")
+
+
+class CSVCache:
+    SUFFIX = ".feather"
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: int = 20 * 1024**3,
+        min_source_bytes: int = 10 * 1024**2,
+    ) -> None:
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.min_source_bytes = min_source_bytes
+
+    @property
+    def available(self) -> bool:
+        return feather is not None
+
+    def _path_prefix(self, path: str) -> str:
+        return hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+
+    def entry_path(self, path: str, variant: str = "") -> str:
+        stat = os.stat(path)
+        version = f"{stat.st_size}:{stat.st_mtime_ns}:{variant}"
+        digest = hashlib.sha1(version.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{self._path_prefix(path)}-{digest}{self.SUFFIX}")
+
+    def should_cache(self, path: str) -> bool:
+        return self.available and os.path.getsize(path) >= self.min_source_bytes
+
+    def load(self, path: str, variant: str = "") -> Optional[pd.DataFrame]:
+        if not self.available:
+            return None
+        entry = self.entry_path(path, variant)
+        if not os.path.exists(entry):
+            return None
+        try:
+            df = feather.read_feather(entry, memory_map=True)
+        except Exception:
+            self._remove(entry)
+            return None
+        os.utime(entry)
+        return df
+
+    def store(self, path: str, df: pd.DataFrame, variant: str = "") -> bool:
+        if not self.should_cache(path):
+            return False
+        entry = self.entry_path(path, variant)
+        tmp = entry + ".tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            feather.write_feather(df, tmp, compression="uncompressed")
+            os.replace(tmp, entry)
+        except Exception:
+            self._remove(tmp)
+            return False
+        self._remove_stale(path, keep=entry)
+        self.prune()
+        return True
+
+    def _entries(self) -> List[str]:
+        if not os.path.isdir(self.cache_dir):
+            return []
+        return [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir)
+            if name.endswith(self.SUFFIX)
+        ]
+
+    def _remove_stale(self, path: str, keep: str) -> None:
+        prefix = self._path_prefix(path) + "-"
+        stat = os.stat(path)
+        for entry in self._entries():
+            if entry == keep or not os.path.basename(entry).startswith(prefix):
+                continue
+            if os.path.getmtime(entry) * 1e9 < stat.st_mtime_ns:
+                self._remove(entry)
+
+    def prune(self) -> None:
+        entries = sorted(self._entries(), key=os.path.getmtime)
+        total = sum(os.path.getsize(e) for e in entries)
+        while entries and total > self.max_bytes:
+            oldest = entries.pop(0)
+            total -= os.path.getsize(oldest)
+            self._remove(oldest)
+
+    def clear(self) -> None:
+        for entry in self._entries():
+            self._remove(entry)
+
+    def _remove(self, entry: str) -> None:
+        try:
+            os.remove(entry)
+        except OSError:
+            pass
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+import pandas as pd
+
+CacheKey = Tuple[int, Hashable]
+
+
+class FrameCache:
+    DEFAULT_MAX_BYTES = 256 * 1024**2
+
+    # Values derived from a DataFrame, kept in LRU order up to max_bytes.
+    # Entries are keyed by the frame's identity and hold only a weak
+    # reference to it: datasets are replaced rather than edited in place, so
+    # a cached value stays valid for as long as its frame is alive.
+    #
+    # Background workers share caches with the GUI thread, and weakref
+    # callbacks run on whichever thread drops the frame, so every update
+    # holds the lock; it is reentrant because such a callback can fire
+    # while its own thread is inside one.
+    def __init__(self, max_bytes: Optional[int] = None) -> None:
+        self.max_bytes = max_bytes if max_bytes is not None else self.DEFAULT_MAX_BYTES
+        self._entries: "OrderedDict[CacheKey, Tuple[weakref.ref, Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+    @property
+    def memory_usage(self) -> int:
+        return self._bytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _lookup(self, df: pd.DataFrame, name: Hashable) -> Any:
+        key = (id(df), name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0]() is not df:
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def _store(self, df: pd.DataFrame, name: Hashable, value: Any, nbytes: int) -> None:
+        key = (id(df), name)
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (weakref.ref(df, lambda _ref, key=key: self._discard(key)), value, nbytes)
+            self._bytes += nbytes
+            while len(self._entries) > 1 and self._bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def _discard(self, key: CacheKey) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[2]
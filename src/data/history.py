@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class RowsStep:
+    label: str
+    positions: np.ndarray
+    version: int = 0
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.positions.nbytes)
+
+
+@dataclass
+class ColumnStep:
+    label: str
+    column: Any
+    values: Any
+    version: int = 0
+
+    @property
+    def nbytes(self) -> int:
+        return int(getattr(self.values, "nbytes", 0))
+
+
+HistoryStep = Union[RowsStep, ColumnStep]
+
+
+class DataHistory:
+    DEFAULT_MEMORY_BUDGET = 512 * 1024**2
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> None:
+        self.memory_budget = memory_budget
+        self._base = pd.DataFrame()
+        self._base_owned = False
+        self._steps: List[HistoryStep] = []
+        self._cursor = 0
+        self._current = self._base
+        self._next_version = 0
+        self._base_version = self._new_version()
+
+    def reset(self, df: pd.DataFrame) -> None:
+        self._base = df
+        self._base_owned = False
+        self._steps = []
+        self._cursor = 0
+        self._current = df
+        self._base_version = self._new_version()
+
+    def _new_version(self) -> int:
+        self._next_version += 1
+        return self._next_version
+
+    @property
+    def current(self) -> pd.DataFrame:
+        return self._current
+
+    @property
+    def version(self) -> int:
+        # Identifies the current state rather than counting operations, so
+        # undoing back to a state yields the version it had before.
+        if self._cursor == 0:
+            return self._base_version
+        return self._steps[self._cursor - 1].version
+
+    @property
+    def can_undo(self) -> bool:
+        return self._cursor > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self._cursor < len(self._steps)
+
+    @property
+    def memory_usage(self) -> int:
+        total = sum(step.nbytes for step in self._steps)
+        if self._base_owned and self._cursor > 0:
+            total += int(self._base.memory_usage(index=True, deep=False).sum())
+        return total
+
+    def set_memory_budget(self, memory_budget: int) -> None:
+        self.memory_budget = memory_budget
+        self._enforce_budget()
+
+    def push_rows(self, positions: np.ndarray, result: pd.DataFrame, label: str = "rows") -> None:
+        positions = np.asarray(positions, dtype=np.intp)
+        self._push(RowsStep(label, positions), result)
+
+    def push_column(self, column: Any, result: pd.DataFrame, label: str = "clean") -> None:
+        self._push(ColumnStep(label, column, result[column].array), result)
+
+    def _push(self, step: HistoryStep, result: pd.DataFrame) -> None:
+        del self._steps[self._cursor:]
+        step.version = self._new_version()
+        self._steps.append(step)
+        self._cursor += 1
+        self._current = result
+        self._enforce_budget()
+
+    def column_lineage(self, column: Any) -> Tuple[int, Any, Optional[np.ndarray]]:
+        # Returns the version of the state where ``column`` last received new
+        # values, those values, and the row positions mapping that state onto
+        # the current one (None when no row operation happened since).
+        version, values, positions = self._base_version, None, None
+        for step in self._steps[:self._cursor]:
+            if isinstance(step, RowsStep):
+                positions = step.positions if positions is None else positions[step.positions]
+            elif step.column == column:
+                version, values, positions = step.version, step.values, None
+        if values is None:
+            values = self._base[column].array
+        return version, values, positions
+
+    def undo(self) -> pd.DataFrame:
+        if not self.can_undo:
+            raise IndexError("Nothing to undo")
+        self._cursor -= 1
+        self._current = self._materialize(self._cursor)
+        return self._current
+
+    def redo(self) -> pd.DataFrame:
+        if not self.can_redo:
+            raise IndexError("Nothing to redo")
+        self._cursor += 1
+        self._current = self._materialize(self._cursor)
+        return self._current
+
+    def _materialize(self, count: int) -> pd.DataFrame:
+        if count == 0:
+            return self._base
+        positions: Optional[np.ndarray] = None
+        overrides: Dict[Any, Any] = {}
+        for step in self._steps[:count]:
+            if isinstance(step, RowsStep):
+                positions = step.positions if positions is None else positions[step.positions]
+                overrides = {col: values.take(step.positions) for col, values in overrides.items()}
+            else:
+                overrides[step.column] = step.values
+        df = self._base if positions is None else self._base.take(positions)
+        if overrides:
+            df = df.copy(deep=False)
+            for col, values in overrides.items():
+                df[col] = values
+        return df
+
+    def _enforce_budget(self) -> None:
+        # Only the steps count against the budget: the base is a state the
+        # history has to keep either way. The oldest undo steps go first,
+        # then redo steps from the end, and the base is folded forward once
+        # over everything dropped.
+        total = sum(step.nbytes for step in self._steps)
+        dropped = 0
+        while total > self.memory_budget and dropped < self._cursor:
+            total -= self._steps[dropped].nbytes
+            dropped += 1
+        while total > self.memory_budget and len(self._steps) > self._cursor:
+            total -= self._steps.pop().nbytes
+        if dropped:
+            self._base_owned = dropped < self._cursor
+            self._base = self._materialize(dropped) if self._base_owned else self._current
+            self._base_version = self._steps[dropped - 1].version
+            del self._steps[:dropped]
+            self._cursor -= dropped
+        if self._cursor == 0 and not self._steps:
+            self._base = self._current
+            self._base_owned = False
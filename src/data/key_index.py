@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Hashable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .frame_cache import FrameCache
+
+# Stands in for the hash of a missing value, so NaN and None keys match.
+NULL_HASH = np.uint64(0x9AE16A3B2F90404F)
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _hash_column(values: pd.Series) -> np.ndarray:
+    # Integers and integral floats hash alike, so a key column read as float
+    # (because of a missing value) still matches its integer counterpart.
+    if pd.api.types.is_integer_dtype(values):
+        hashes = pd.util.hash_array(values.to_numpy(dtype=np.int64, na_value=0))
+        hashes[values.isna().to_numpy()] = NULL_HASH
+    elif pd.api.types.is_float_dtype(values):
+        floats = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        integral = np.isfinite(floats) & (np.abs(floats) < 2**63)
+        integral[integral] = floats[integral] == np.floor(floats[integral])
+        hashes = np.empty(len(floats), dtype=np.uint64)
+        hashes[integral] = pd.util.hash_array(floats[integral].astype(np.int64))
+        hashes[~integral] = pd.util.hash_array(floats[~integral])
+        hashes[np.isnan(floats)] = NULL_HASH
+    else:
+        # Hashing each distinct value once is cheaper than hashing every
+        # row; missing values have code -1, which takes the appended NULL_HASH.
+        codes, uniques = pd.factorize(values)
+        hashes = pd.util.hash_pandas_object(
+            pd.Series(uniques), index=False, categorize=False
+        ).to_numpy()
+        hashes = np.append(hashes, NULL_HASH).take(codes)
+    return hashes
+
+
+def hash_keys(keys: pd.DataFrame) -> np.ndarray:
+    # One uint64 per row from per-column hashes. Two distinct keys share a
+    # hash with probability about n**2 / 2**65 for n distinct keys (3e-8 at
+    # a million), which is accepted in exchange for grouping on a single
+    # integer.
+    combined = np.zeros(len(keys), dtype=np.uint64)
+    for _, values in keys.items():
+        combined = (combined * _MIX) ^ _hash_column(values)
+    return combined
+
+
+def factorize_keys(keys: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    # Group codes per row (nulls are a group of their own, as in pd.merge)
+    # plus a null flag per group.
+    if keys.shape[1] == 1:
+        codes, uniques = pd.factorize(keys.iloc[:, 0], use_na_sentinel=False)
+        return codes.astype(np.intp, copy=False), np.asarray(pd.isna(uniques), dtype=bool)
+    codes = keys.groupby(list(keys.columns), sort=False, dropna=False).ngroup().to_numpy(np.intp)
+    n_keys = int(codes.max()) + 1 if len(codes) else 0
+    # Any one row of a group stands for its key, so nulls are checked on one
+    # representative per group rather than on every row.
+    representative = np.zeros(n_keys, dtype=np.intp)
+    representative[codes] = np.arange(len(codes))
+    return codes, keys.iloc[representative].isna().any(axis=1).to_numpy()
+
+
+def factorize_hashed(
+    hashes: Sequence[np.ndarray], keys: Sequence[pd.DataFrame]
+) -> Tuple[np.ndarray, np.ndarray]:
+    # factorize_keys for composite keys already hashed by hash_keys, over
+    # the rows of several frames in order. Grouping on one integer per row
+    # is as fast as a single integer key, and the key frames are only read
+    # for one representative row per group.
+    codes = pd.factorize(np.concatenate(hashes))[0].astype(np.intp, copy=False)
+    n_keys = int(codes.max()) + 1 if len(codes) else 0
+    representative = np.zeros(n_keys, dtype=np.intp)
+    representative[codes] = np.arange(len(codes))
+    null_groups = np.zeros(n_keys, dtype=bool)
+    offset = 0
+    for frame in keys:
+        mine = (representative >= offset) & (representative < offset + len(frame))
+        rows = representative[mine] - offset
+        null_groups[mine] = frame.iloc[rows].isna().any(axis=1).to_numpy()
+        offset += len(frame)
+    return codes, null_groups
+
+
+@dataclass
+class KeyIndex:
+    keys: Tuple[Hashable, ...]
+    uniques: pd.Index
+    codes: np.ndarray
+    counts: np.ndarray
+    null_groups: np.ndarray
+    order: np.ndarray
+    starts: np.ndarray
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, keys: Sequence[Hashable]) -> "KeyIndex":
+        keys = tuple(keys)
+        if len(keys) == 1:
+            codes, uniques = pd.factorize(df[keys[0]], use_na_sentinel=False)
+            uniques = pd.Index(uniques)
+        else:
+            codes, uniques = pd.MultiIndex.from_frame(df[list(keys)]).factorize()
+        codes = codes.astype(np.intp, copy=False)
+        counts = np.bincount(codes, minlength=len(uniques))
+        return cls(
+            keys=keys,
+            uniques=uniques,
+            codes=codes,
+            counts=counts,
+            null_groups=np.asarray(uniques.to_frame().isna().any(axis=1), dtype=bool),
+            order=np.argsort(codes, kind="stable"),
+            starts=np.cumsum(counts) - counts,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.codes, self.counts, self.null_groups, self.order, self.starts)
+        return int(sum(a.nbytes for a in arrays) + self.uniques.memory_usage(deep=False))
+
+    def lookup(self, keys: pd.DataFrame) -> np.ndarray:
+        # Group code of each row of `keys` in this index, -1 where absent.
+        if len(self.keys) == 1:
+            target = keys.iloc[:, 0]
+            # factorize turned None into NaN in uniques; match it the same way.
+            if pd.api.types.is_object_dtype(target.dtype):
+                target = target.fillna(np.nan)
+            target = pd.Index(target)
+        else:
+            target = pd.MultiIndex.from_frame(keys)
+        return self.uniques.get_indexer(target).astype(np.intp, copy=False)
+
+
+class KeyIndexCache(FrameCache):
+    DEFAULT_MAX_BYTES = 512 * 1024**2
+
+    def get(self, df: pd.DataFrame, keys: Sequence[Hashable]) -> Optional[KeyIndex]:
+        return self._lookup(df, tuple(keys))
+
+    def get_or_build(self, df: pd.DataFrame, keys: Sequence[Hashable]) -> KeyIndex:
+        index = self.get(df, keys)
+        if index is None:
+            index = KeyIndex.build(df, keys)
+            self.put(df, index)
+        return index
+
+    def put(self, df: pd.DataFrame, index: KeyIndex) -> None:
+        self._store(df, index.keys, index, index.nbytes)
+
+
+class KeyHashCache(FrameCache):
+
+    # One uint64 per row for a dataset's (composite) key, shared by merges
+    # and comparisons on the same columns.
+    def get_or_hash(self, df: pd.DataFrame, keys: Sequence[Hashable]) -> np.ndarray:
+        hashes = self._lookup(df, tuple(keys))
+        if hashes is None:
+            hashes = hash_keys(df[list(keys)])
+            self._store(df, tuple(keys), hashes, hashes.nbytes)
+        return hashes
@@ -2,10 +2,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Sequence, Tuple, Union
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
+from pandas.api.extensions import take
+
+from .key_index import KeyHashCache, KeyIndex, KeyIndexCache, factorize_hashed, factorize_keys
+from .sketches import ColumnSketchCache
 
 
 @dataclass
@@ -25,6 +29,9 @@ class MergeSummary:
     merge_type: str
     validation_passed: bool
     validation_warnings: List[str] = field(default_factory=list)
+    estimated_rows: Optional[int] = None
+    estimated_bytes: Optional[int] = None
+    strategy: str = "hash"
 
 
 @dataclass
@@ -34,6 +41,34 @@ class MergeResult:
     summary: MergeSummary
     success: bool
     error: Optional[str] = None
+    # Set when the rows were written to a file instead of merged_df, which
+    # then only carries the result columns.
+    output_path: Optional[str] = None
+
+
+@dataclass
+class MergeEstimate:
+
+    rows: int
+    bytes: int
+    matched_rows: int
+    unmatched_left: int
+    unmatched_right: int
+    many_to_many_keys: int
+    max_fanout: int
+
+
+@dataclass
+class _KeyCounts:
+    left_codes: np.ndarray
+    right_codes: np.ndarray
+    left_counts: np.ndarray
+    right_counts: np.ndarray
+    null_groups: np.ndarray
+    # Right row positions grouped by code, and where each group starts;
+    # filled in when the strategy already has them (sorted or indexed).
+    right_order: Optional[np.ndarray] = None
+    right_starts: Optional[np.ndarray] = None
 
 
 class MergeValidationError(Exception):
@@ -41,11 +76,40 @@ class MergeValidationError(Exception):
     pass
 
 
+class MergeCancelled(Exception):
+
+    pass
+
+
+ProgressCallback = Callable[[str, int, int], None]
+
+MERGE_STAGES = ("Validating", "Estimating result size", "Joining", "Summarizing")
+
+# "hash" is pd.merge; "sorted" walks two key-sorted sides without hashing;
+# "indexed" probes a key index of the right dataset that is built once and
+# cached; "auto" uses a cached index, then sorted inputs, then hash.
+# "partitioned" is an out-of-core join that writes its result to a file and
+# is only used when asked for.
+JOIN_STRATEGIES = ("auto", "hash", "sorted", "indexed", "partitioned")
+
+
 class MergeEngine:
     DEFAULT_SUFFIXES: Tuple[str, str] = ("_left", "_right")
 
-    def __init__(self, suffixes: Tuple[str, str] = ("_left", "_right")) -> None:
+    def __init__(
+        self,
+        suffixes: Tuple[str, str] = ("_left", "_right"),
+        key_indexes: Optional[KeyIndexCache] = None,
+        sketches: Optional[ColumnSketchCache] = None,
+        key_hashes: Optional[KeyHashCache] = None,
+    ) -> None:
         self.suffixes = suffixes
+        self.key_indexes = key_indexes if key_indexes is not None else KeyIndexCache()
+        self.sketches = sketches if sketches is not None else ColumnSketchCache()
+        self.key_hashes = key_hashes if key_hashes is not None else KeyHashCache()
+        # The last key factorization, so validating, estimating and
+        # summarizing one merge factorizes the key columns once.
+        self._last_counts: Optional[Tuple[pd.DataFrame, pd.DataFrame, Tuple, _KeyCounts]] = None
 
     def merge(
         self,
@@ -62,35 +126,69 @@ class MergeEngine:
         exclude_right: Optional[Sequence[str]] = None,
         validate: bool = True,
         indicator: bool = True,
+        max_result_bytes: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        strategy: str = "hash",
+        output_path: Optional[str] = None,
     ) -> MergeResult:
+        # progress(stage, done, total) is reported before each of MERGE_STAGES
+        # and is_cancelled is polled between them; pd.merge itself cannot be
+        # interrupted once started.
+        if strategy == "partitioned":
+            return self._partitioned_merge(
+                dataset_left,
+                dataset_right,
+                output_path,
+                on=on,
+                left_on=left_on,
+                right_on=right_on,
+                how=how,
+                suffixes=suffixes or self.suffixes,
+                columns_left=columns_left,
+                columns_right=columns_right,
+                exclude_left=exclude_left,
+                exclude_right=exclude_right,
+                validate=validate,
+                indicator=indicator,
+                progress=progress,
+                is_cancelled=is_cancelled,
+            )
+
+        def stage(index: int) -> None:
+            if is_cancelled is not None and is_cancelled():
+                raise MergeCancelled()
+            if progress is not None:
+                progress(MERGE_STAGES[index], index, len(MERGE_STAGES))
+
         suffixes = suffixes or self.suffixes
         join_keys = self._resolve_join_keys(on, left_on, right_on, dataset_left, dataset_right)
+        strategy, key_index, strategy_warnings = self._choose_strategy(
+            strategy, dataset_left, dataset_right, join_keys
+        )
+        validation_warnings: List[str] = []
+        counts: Optional[_KeyCounts] = None
 
         if validate:
+            stage(0)
+            try:
+                counts = self._strategy_counts(
+                    strategy, key_index, dataset_left, dataset_right, join_keys
+                )
+            except (KeyError, TypeError, ValueError):
+                counts = None
             validation_warnings = self._validate_merge(
-                dataset_left, dataset_right, join_keys, how
+                dataset_left, dataset_right, join_keys, how, counts
             )
             if any("ERROR" in w for w in validation_warnings):
-                return MergeResult(
-                    merged_df=pd.DataFrame(),
-                    summary=MergeSummary(
-                        rows_left=len(dataset_left),
-                        rows_right=len(dataset_right),
-                        rows_result=0,
-                        matched_rows=0,
-                        unmatched_left=0,
-                        unmatched_right=0,
-                        new_columns_added=[],
-                        columns_from_left=[],
-                        columns_from_right=[],
-                        missing_values_introduced={},
-                        join_keys=list(join_keys[0]) + list(join_keys[1]),
-                        merge_type=how,
-                        validation_passed=False,
-                        validation_warnings=validation_warnings,
-                    ),
-                    success=False,
-                    error="Validation failed. Check summary.validation_warnings.",
+                return self._failed_result(
+                    dataset_left,
+                    dataset_right,
+                    join_keys,
+                    how,
+                    "Validation failed. Check summary.validation_warnings.",
+                    validation_passed=False,
+                    validation_warnings=validation_warnings,
                 )
 
         left_subset = self._apply_column_selection(
@@ -100,44 +198,506 @@ class MergeEngine:
             dataset_right, join_keys[1], columns_right, exclude_right
         )
 
+        stage(1)
         try:
-            merged = pd.merge(
-                left_subset,
-                right_subset,
-                left_on=join_keys[0],
-                right_on=join_keys[1],
-                how=how,
-                suffixes=suffixes,
-                indicator=indicator,
+            if counts is None:
+                counts = self._strategy_counts(
+                    strategy, key_index, dataset_left, dataset_right, join_keys
+                )
+            estimate = self._estimate(left_subset, right_subset, join_keys, how, indicator, counts)
+        except (KeyError, TypeError, ValueError):
+            estimate = None
+        estimated_rows = estimate.rows if estimate is not None else None
+        estimated_bytes = estimate.bytes if estimate is not None else None
+        if validate and estimate is not None:
+            validation_warnings = validation_warnings + self._fanout_warnings(
+                estimate, len(dataset_left), len(dataset_right)
             )
+        validation_warnings = validation_warnings + strategy_warnings
+        if (
+            max_result_bytes is not None
+            and estimated_bytes is not None
+            and estimated_bytes > max_result_bytes
+        ):
+            return self._failed_result(
+                dataset_left,
+                dataset_right,
+                join_keys,
+                how,
+                f"Estimated result of {estimated_rows:,} rows (~{estimated_bytes / 1024**3:.1f} GB) "
+                f"exceeds the {max_result_bytes / 1024**3:.1f} GB limit.",
+                validation_passed=validate,
+                validation_warnings=validation_warnings,
+                estimated_rows=estimated_rows,
+                estimated_bytes=estimated_bytes,
+            )
+
+        stage(2)
+        try:
+            if strategy == "hash":
+                merged = pd.merge(
+                    left_subset,
+                    right_subset,
+                    left_on=join_keys[0],
+                    right_on=join_keys[1],
+                    how=how,
+                    suffixes=suffixes,
+                    indicator=indicator,
+                )
+            else:
+                left_idx, right_idx = self._join_indexers(counts, how)
+                merged = self._assemble_join(
+                    left_subset, right_subset, left_idx, right_idx, join_keys, suffixes, indicator
+                )
         except Exception as e:
-            return MergeResult(
-                merged_df=pd.DataFrame(),
-                summary=MergeSummary(
-                    rows_left=len(dataset_left),
-                    rows_right=len(dataset_right),
-                    rows_result=0,
-                    matched_rows=0,
-                    unmatched_left=0,
-                    unmatched_right=0,
-                    new_columns_added=[],
-                    columns_from_left=[],
-                    columns_from_right=[],
-                    missing_values_introduced={},
-                    join_keys=list(join_keys[0]) + list(join_keys[1]),
-                    merge_type=how,
-                    validation_passed=validate,
-                    validation_warnings=[],
-                ),
-                success=False,
-                error=str(e),
+            error = str(e)
+            if isinstance(e, MemoryError):
+                error = (
+                    "Not enough memory for this join; the partitioned strategy "
+                    "can write the result to a file instead."
+                )
+            return self._failed_result(
+                dataset_left,
+                dataset_right,
+                join_keys,
+                how,
+                error,
+                validation_passed=validate,
+                estimated_rows=estimated_rows,
+                estimated_bytes=estimated_bytes,
             )
 
+        stage(3)
         summary = self._build_summary(
-            dataset_left, dataset_right, merged, join_keys, how, validation_warnings if validate else []
+            dataset_left,
+            dataset_right,
+            merged,
+            join_keys,
+            how,
+            validation_warnings,
+            counts,
+            suffixes,
         )
+        summary.estimated_rows = estimated_rows
+        summary.estimated_bytes = estimated_bytes
+        summary.strategy = strategy
         return MergeResult(merged_df=merged, summary=summary, success=True)
 
+    def _partitioned_merge(
+        self,
+        dataset_left: pd.DataFrame,
+        dataset_right: pd.DataFrame,
+        output_path: Optional[str],
+        suffixes: Tuple[str, str],
+        progress: Optional[ProgressCallback],
+        is_cancelled: Optional[Callable[[], bool]],
+        **options,
+    ) -> MergeResult:
+        if output_path is None:
+            raise MergeValidationError("A partitioned join needs an output_path for its result")
+        # Imported here: the partitioned engine runs MergeEngine on each bucket.
+        from .partitioned_merge import PartitionedMergeEngine
+
+        engine = PartitionedMergeEngine(
+            suffixes=suffixes, progress=progress, is_cancelled=is_cancelled
+        )
+        return engine.merge(dataset_left, dataset_right, output_path, **options)
+
+    def _failed_result(
+        self,
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        join_keys: Tuple[Tuple[str, ...], Tuple[str, ...]],
+        how: str,
+        error: str,
+        validation_passed: bool,
+        validation_warnings: Optional[List[str]] = None,
+        estimated_rows: Optional[int] = None,
+        estimated_bytes: Optional[int] = None,
+    ) -> MergeResult:
+        return MergeResult(
+            merged_df=pd.DataFrame(),
+            summary=MergeSummary(
+                rows_left=len(left),
+                rows_right=len(right),
+                rows_result=0,
+                matched_rows=0,
+                unmatched_left=0,
+                unmatched_right=0,
+                new_columns_added=[],
+                columns_from_left=[],
+                columns_from_right=[],
+                missing_values_introduced={},
+                join_keys=list(join_keys[0]) + list(join_keys[1]),
+                merge_type=how,
+                validation_passed=validation_passed,
+                validation_warnings=validation_warnings or [],
+                estimated_rows=estimated_rows,
+                estimated_bytes=estimated_bytes,
+            ),
+            success=False,
+            error=error,
+        )
+
+    def estimate_merge(
+        self,
+        dataset_left: pd.DataFrame,
+        dataset_right: pd.DataFrame,
+        on: Optional[Union[str, Sequence[str]]] = None,
+        left_on: Optional[Union[str, Sequence[str]]] = None,
+        right_on: Optional[Union[str, Sequence[str]]] = None,
+        how: str = "inner",
+        indicator: bool = True,
+    ) -> MergeEstimate:
+        join_keys = self._resolve_join_keys(on, left_on, right_on, dataset_left, dataset_right)
+        counts = self._key_counts(dataset_left, dataset_right, join_keys)
+        return self._estimate(dataset_left, dataset_right, join_keys, how, indicator, counts)
+
+    def _key_counts(
+        self,
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        join_keys: Tuple[Tuple[str, ...], Tuple[str, ...]],
+    ) -> _KeyCounts:
+        # One factorization of the key columns of both sides; validation, the
+        # size estimate and the summary are all derived from these codes.
+        last = self._last_counts
+        if last is not None and last[0] is left and last[1] is right and last[2] == join_keys:
+            return last[3]
+        left_keys, right_keys = list(join_keys[0]), list(join_keys[1])
+        if len(left_keys) > 1:
+            codes, null_groups = factorize_hashed(
+                [
+                    self.key_hashes.get_or_hash(left, left_keys),
+                    self.key_hashes.get_or_hash(right, right_keys),
+                ],
+                [left[left_keys], right[right_keys]],
+            )
+        else:
+            keys = pd.concat(
+                [left[left_keys], right[right_keys].set_axis(left_keys, axis=1)],
+                ignore_index=True,
+            )
+            codes, null_groups = factorize_keys(keys)
+        n_keys = len(null_groups)
+        counts = _KeyCounts(
+            left_codes=codes[: len(left)],
+            right_codes=codes[len(left):],
+            left_counts=np.bincount(codes[: len(left)], minlength=n_keys),
+            right_counts=np.bincount(codes[len(left):], minlength=n_keys),
+            null_groups=null_groups,
+        )
+        self._last_counts = (left, right, join_keys, counts)
+        return counts
+
+    def _choose_strategy(
+        self,
+        strategy: str,
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        join_keys: Tuple[Tuple[str, ...], Tuple[str, ...]],
+    ) -> Tuple[str, Optional[KeyIndex], List[str]]:
+        if strategy not in JOIN_STRATEGIES:
+            raise MergeValidationError(
+                f"Unknown join strategy '{strategy}', expected one of {', '.join(JOIN_STRATEGIES)}"
+            )
+        left_keys, right_keys = join_keys
+        # pd.merge orders the columns of a join with an empty side its own
+        # way, which only the hash join reproduces.
+        if strategy == "hash" or not (len(left) and len(right)) or not (
+            set(left_keys) <= set(left.columns) and set(right_keys) <= set(right.columns)
+        ):
+            return "hash", None, []
+        if not all(
+            self._dtypes_compatible(left[lk].dtype, right[rk].dtype)
+            for lk, rk in zip(left_keys, right_keys)
+        ):
+            if strategy == "auto":
+                return "hash", None, []
+            return "hash", None, [
+                f"WARNING: {strategy} join needs compatible key types; used hash join instead"
+            ]
+
+        if strategy in ("auto", "indexed"):
+            key_index = self.key_indexes.get(right, right_keys)
+            if key_index is None and strategy == "indexed":
+                key_index = self.key_indexes.get_or_build(right, right_keys)
+            # A composite index cannot look up null keys reliably.
+            if key_index is not None and (len(right_keys) == 1 or not key_index.null_groups.any()):
+                return "indexed", key_index, []
+            if strategy == "indexed":
+                return "hash", None, [
+                    "WARNING: indexed join needs a composite key without nulls; used hash join instead"
+                ]
+
+        if self._sorted_joinable(left[left_keys[0]], right[right_keys[0]], len(left_keys)):
+            return "sorted", None, []
+        if strategy == "sorted":
+            return "hash", None, [
+                "WARNING: sorted join needs both sides sorted on a single numeric or date key "
+                "without nulls; used hash join instead"
+            ]
+        return "hash", None, []
+
+    @staticmethod
+    def _sorted_joinable(left_key: pd.Series, right_key: pd.Series, n_keys: int) -> bool:
+        if n_keys != 1:
+            return False
+        for key in (left_key, right_key):
+            if not isinstance(key.dtype, np.dtype) or key.dtype.kind not in "iufM":
+                return False
+        if (left_key.dtype.kind == "M") != (right_key.dtype.kind == "M"):
+            return False
+        # NaN breaks monotonicity, so this also rules out null keys.
+        return left_key.is_monotonic_increasing and right_key.is_monotonic_increasing
+
+    def _strategy_counts(
+        self,
+        strategy: str,
+        key_index: Optional[KeyIndex],
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        join_keys: Tuple[Tuple[str, ...], Tuple[str, ...]],
+    ) -> _KeyCounts:
+        if strategy == "sorted":
+            return self._sorted_key_counts(left, right, join_keys)
+        if strategy == "indexed":
+            return self._indexed_key_counts(key_index, left, join_keys)
+        return self._key_counts(left, right, join_keys)
+
+    @staticmethod
+    def _sorted_runs(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        starts = np.ones(len(values), dtype=bool)
+        starts[1:] = values[1:] != values[:-1]
+        return values[starts], np.cumsum(starts) - 1
+
+    def _sorted_key_counts(
+        self,
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        join_keys: Tuple[Tuple[str, ...], Tuple[str, ...]],
+    ) -> _KeyCounts:
+        # Both key columns are sorted, so equal keys form runs: codes come
+        # from run boundaries and a searchsorted into the merged run values,
+        # with no hashing at all.
+        left_uniques, left_runs = self._sorted_runs(left[join_keys[0][0]].to_numpy())
+        right_uniques, right_runs = self._sorted_runs(right[join_keys[1][0]].to_numpy())
+        uniques = np.union1d(left_uniques, right_uniques)
+        left_codes = np.searchsorted(uniques, left_uniques)[left_runs]
+        right_codes = np.searchsorted(uniques, right_uniques)[right_runs]
+        right_counts = np.bincount(right_codes, minlength=len(uniques))
+        return _KeyCounts(
+            left_codes=left_codes,
+            right_codes=right_codes,
+            left_counts=np.bincount(left_codes, minlength=len(uniques)),
+            right_counts=right_counts,
+            null_groups=np.zeros(len(uniques), dtype=bool),
+            right_order=np.arange(len(right_codes)),
+            right_starts=np.cumsum(right_counts) - right_counts,
+        )
+
+    @staticmethod
+    def _indexed_key_counts(
+        key_index: KeyIndex,
+        left: pd.DataFrame,
+        join_keys: Tuple[Tuple[str, ...], Tuple[str, ...]],
+    ) -> _KeyCounts:
+        # Only the left keys are hashed: they are probed against the cached
+        # index, and keys it does not know are numbered after its groups.
+        left_keys = left[list(join_keys[0])]
+        codes = key_index.lookup(left_keys)
+        n_indexed = len(key_index.counts)
+        missing = codes < 0
+        extra_nulls = np.zeros(0, dtype=bool)
+        if missing.any():
+            extra_codes, extra_nulls = factorize_keys(left_keys[missing])
+            codes[missing] = n_indexed + extra_codes
+        n_keys = n_indexed + len(extra_nulls)
+        padding = np.zeros(len(extra_nulls), dtype=key_index.counts.dtype)
+        return _KeyCounts(
+            left_codes=codes,
+            right_codes=key_index.codes,
+            left_counts=np.bincount(codes, minlength=n_keys),
+            right_counts=np.concatenate([key_index.counts, padding]),
+            null_groups=np.concatenate([key_index.null_groups, extra_nulls]),
+            right_order=key_index.order,
+            right_starts=np.concatenate([key_index.starts, padding]),
+        )
+
+    @staticmethod
+    def _first_seen_rank(codes: np.ndarray, n_keys: int) -> np.ndarray:
+        # Rank of each group by where it first appears in `codes`.
+        rank = np.full(n_keys, n_keys, dtype=np.intp)
+        first = pd.Series(codes).drop_duplicates().to_numpy()
+        rank[first] = np.arange(len(first))
+        return rank
+
+    def _join_indexers(self, counts: _KeyCounts, how: str) -> Tuple[np.ndarray, np.ndarray]:
+        # Row positions into each side for every output row, -1 where the
+        # row has no partner, in pd.merge order: left and right joins follow
+        # their side's row order; inner and outer joins group rows by key in
+        # order of first appearance, right-only keys last.
+        left_codes, right_codes = counts.left_codes, counts.right_codes
+        n_keys = len(counts.left_counts)
+        right_order, right_starts = counts.right_order, counts.right_starts
+        if right_order is None:
+            right_order = np.argsort(right_codes, kind="stable")
+            right_starts = np.cumsum(counts.right_counts) - counts.right_counts
+
+        left_rows = np.arange(len(left_codes))
+        if how in ("inner", "outer") and len(left_codes) > 1 and (np.diff(left_codes) < 0).any():
+            rank = self._first_seen_rank(left_codes, n_keys)
+            left_rows = np.argsort(rank[left_codes], kind="stable")
+        row_codes = left_codes[left_rows]
+        matches = counts.right_counts[row_codes]
+        per_row = np.maximum(matches, 1) if how in ("left", "outer") else matches
+        left_idx = np.repeat(left_rows, per_row)
+        offsets = np.arange(len(left_idx)) - np.repeat(np.cumsum(per_row) - per_row, per_row)
+        right_idx = np.full(len(left_idx), -1, dtype=np.intp)
+        matched = np.repeat(matches > 0, per_row)
+        right_idx[matched] = right_order[
+            right_starts[left_codes[left_idx[matched]]] + offsets[matched]
+        ]
+
+        if how in ("right", "outer"):
+            right_only = np.flatnonzero(counts.left_counts[right_codes] == 0)
+            if how == "outer" and len(right_only) > 1:
+                only_codes = right_codes[right_only]
+                if (np.diff(only_codes) < 0).any():
+                    rank = self._first_seen_rank(only_codes, n_keys)
+                    right_only = right_only[np.argsort(rank[only_codes], kind="stable")]
+            left_idx = np.concatenate([left_idx, np.full(len(right_only), -1, dtype=np.intp)])
+            right_idx = np.concatenate([right_idx, right_only])
+        if how == "right":
+            order = np.argsort(right_idx, kind="stable")
+            left_idx, right_idx = left_idx[order], right_idx[order]
+        return left_idx, right_idx
+
+    @staticmethod
+    def _assemble_join(
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        left_idx: np.ndarray,
+        right_idx: np.ndarray,
+        join_keys: Tuple[Tuple[str, ...], Tuple[str, ...]],
+        suffixes: Tuple[str, str],
+        indicator: bool,
+    ) -> pd.DataFrame:
+        # Lays the result out the way pd.merge does: left columns, then right
+        # columns, with same-named key pairs collapsed into one column and
+        # other shared names suffixed.
+        left_missing = left_idx < 0
+        right_missing = right_idx < 0
+        any_left_missing = bool(left_missing.any())
+        any_right_missing = bool(right_missing.any())
+        shared_keys = {lk for lk, rk in zip(*join_keys) if lk == rk}
+        overlap = (set(left.columns) & set(right.columns)) - shared_keys
+
+        def gather(values: pd.Series, idx: np.ndarray, has_missing: bool):
+            return take(values.array, idx, allow_fill=has_missing)
+
+        columns = {}
+        for col in left.columns:
+            if col in shared_keys:
+                left_key, right_key = left[col], right[col]
+                if left_key.dtype != right_key.dtype and (
+                    isinstance(left_key.dtype, pd.CategoricalDtype)
+                    or isinstance(right_key.dtype, pd.CategoricalDtype)
+                ):
+                    # Categoricals only coalesce over identical categories;
+                    # pd.merge falls back to object here too.
+                    left_key, right_key = left_key.astype(object), right_key.astype(object)
+                if not any_left_missing:
+                    columns[col] = gather(left_key, left_idx, False)
+                elif left_missing.all():
+                    columns[col] = gather(right_key, right_idx, False)
+                elif left_key.dtype == right_key.dtype and isinstance(left_key.dtype, np.dtype):
+                    columns[col] = np.where(
+                        left_missing,
+                        right_key.to_numpy()[np.maximum(right_idx, 0)],
+                        left_key.to_numpy()[np.maximum(left_idx, 0)],
+                    )
+                else:
+                    from_left = pd.Series(gather(left_key, left_idx, True))
+                    from_right = pd.Series(gather(right_key, right_idx, any_right_missing))
+                    columns[col] = from_left.where(~left_missing, from_right).array
+                continue
+            name = f"{col}{suffixes[0]}" if col in overlap else col
+            columns[name] = gather(left[col], left_idx, any_left_missing)
+        for col in right.columns:
+            if col in shared_keys:
+                continue
+            name = f"{col}{suffixes[1]}" if col in overlap else col
+            columns[name] = gather(right[col], right_idx, any_right_missing)
+        if indicator:
+            codes = np.where(right_missing, 0, np.where(left_missing, 1, 2)).astype(np.int8)
+            columns["_merge"] = pd.Categorical.from_codes(
+                codes, categories=["left_only", "right_only", "both"]
+            )
+        return pd.DataFrame(columns)
+
+    @staticmethod
+    def _row_split(counts: _KeyCounts, how: str) -> Tuple[int, int, int]:
+        left_counts, right_counts = counts.left_counts, counts.right_counts
+        matched = int(np.dot(left_counts, right_counts))
+        unmatched_left = 0
+        unmatched_right = 0
+        if how in ("left", "outer"):
+            unmatched_left = int(left_counts[right_counts == 0].sum())
+        if how in ("right", "outer"):
+            unmatched_right = int(right_counts[left_counts == 0].sum())
+        return matched, unmatched_left, unmatched_right
+
+    def _estimate(
+        self,
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        join_keys: Tuple[Tuple[str, ...], Tuple[str, ...]],
+        how: str,
+        indicator: bool,
+        counts: _KeyCounts,
+    ) -> MergeEstimate:
+        # Exact output size from per-key multiplicities: a key seen a times on
+        # the left and b times on the right yields a * b matched rows.
+        left_keys, right_keys = list(join_keys[0]), list(join_keys[1])
+        left_counts, right_counts = counts.left_counts, counts.right_counts
+        fanout = left_counts * right_counts
+        matched, unmatched_left, unmatched_right = self._row_split(counts, how)
+        rows = matched + unmatched_left + unmatched_right
+
+        # Object columns only add pointers to the strings both inputs already
+        # hold, so shallow memory_usage is the right per-row cost.
+        row_bytes = self._row_bytes(left) + self._row_bytes(right) + (1 if indicator else 0)
+        if left_keys == right_keys and len(right):
+            row_bytes -= self._row_bytes(right[right_keys])
+
+        return MergeEstimate(
+            rows=rows,
+            bytes=int(rows * row_bytes),
+            matched_rows=matched,
+            unmatched_left=unmatched_left,
+            unmatched_right=unmatched_right,
+            many_to_many_keys=int(((left_counts > 1) & (right_counts > 1)).sum()),
+            max_fanout=int(fanout.max()) if len(fanout) else 0,
+        )
+
+    def _fanout_warnings(
+        self, estimate: MergeEstimate, rows_left: int, rows_right: int
+    ) -> List[str]:
+        if not estimate.many_to_many_keys or estimate.rows <= max(rows_left, rows_right):
+            return []
+        return [
+            f"WARNING: {estimate.many_to_many_keys} keys are duplicated on both sides; "
+            f"the join will produce {estimate.rows:,} rows "
+            f"(up to {estimate.max_fanout:,} from a single key, ~{estimate.bytes / 1024**2:,.0f} MB)"
+        ]
+
+    @staticmethod
+    def _row_bytes(df: pd.DataFrame) -> float:
+        if not len(df):
+            return 0.0
+        return float(df.memory_usage(index=False, deep=False).sum()) / len(df)
+
     def _resolve_join_keys(
         self,
         on: Optional[Union[str, Sequence[str]]],
@@ -165,6 +725,7 @@ class MergeEngine:
         right: pd.DataFrame,
         join_keys: Tuple[Tuple[str, ...], Tuple[str, ...]],
         how: str,
+        counts: Optional[_KeyCounts] = None,
     ) -> List[str]:
         warnings: List[str] = []
         left_keys, right_keys = join_keys
@@ -182,8 +743,19 @@ class MergeEngine:
                 warnings.append(
                     f"WARNING: Type mismatch for keys: left[{lk}]={lt}, right[{rk}]={rt}"
                 )
-        dup_left = left[list(left_keys)].duplicated(keep=False).sum()
-        dup_right = right[list(right_keys)].duplicated(keep=False).sum()
+        if counts is None:
+            counts = self._key_counts(left, right, join_keys)
+        warnings += self._key_warnings(
+            int(counts.left_counts[counts.left_counts > 1].sum()),
+            int(counts.right_counts[counts.right_counts > 1].sum()),
+            int(counts.left_counts[counts.null_groups].sum()),
+            int(counts.right_counts[counts.null_groups].sum()),
+        )
+        return warnings
+
+    @staticmethod
+    def _key_warnings(dup_left: int, dup_right: int, null_left: int, null_right: int) -> List[str]:
+        warnings = []
         if dup_left > 0:
             warnings.append(
                 f"WARNING: {dup_left} duplicate key rows in left (may produce row multiplication)"
@@ -192,16 +764,19 @@ class MergeEngine:
             warnings.append(
                 f"WARNING: {dup_right} duplicate key rows in right (may produce row multiplication)"
             )
-        null_left = left[list(left_keys)].isna().any(axis=1).sum()
-        null_right = right[list(right_keys)].isna().any(axis=1).sum()
         if null_left > 0:
             warnings.append(f"WARNING: {null_left} rows with NA in join keys (left)")
         if null_right > 0:
             warnings.append(f"WARNING: {null_right} rows with NA in join keys (right)")
-
         return warnings
 
     def _dtypes_compatible(self, left_dtype, right_dtype) -> bool:
+        if left_dtype == right_dtype:
+            return True
+        if isinstance(left_dtype, pd.CategoricalDtype):
+            left_dtype = left_dtype.categories.dtype
+        if isinstance(right_dtype, pd.CategoricalDtype):
+            right_dtype = right_dtype.categories.dtype
         if left_dtype == right_dtype:
             return True
         try:
@@ -244,10 +819,13 @@ class MergeEngine:
         join_keys: Tuple[Tuple[str, ...], Tuple[str, ...]],
         how: str,
         validation_warnings: List[str],
+        counts: Optional[_KeyCounts] = None,
+        suffixes: Optional[Tuple[str, str]] = None,
     ) -> MergeSummary:
         rows_left = len(left)
         rows_right = len(right)
         rows_result = len(merged)
+        suffixes = suffixes or self.suffixes
 
         left_cols = set(left.columns)
         right_cols = set(right.columns)
@@ -256,26 +834,14 @@ class MergeEngine:
         cols_from_left = [c for c in result_cols if c in left_cols or c.endswith("_left")]
         cols_from_right = [c for c in result_cols if c in right_cols or c.endswith("_right")]
 
-        matched = 0
-        unmatched_left = 0
-        unmatched_right = 0
-        if "_merge" in merged.columns:
-            vc = merged["_merge"].value_counts()
-            matched = int(vc.get("both", 0))
-            unmatched_left = int(vc.get("left_only", 0))
-            unmatched_right = int(vc.get("right_only", 0))
+        if counts is None:
+            counts = self._key_counts(left, right, join_keys)
+        matched, unmatched_left, unmatched_right = self._row_split(counts, how)
+
         missing_introduced = {}
-        for col in merged.columns:
-            if col in left.columns and col in right.columns:
-                continue  # Key column or suffix-resolved
-            if col == "_merge":
-                continue
-            orig_null = 0
-            if col in left.columns:
-                orig_null = left[col].isna().sum()
-            elif col in right.columns:
-                orig_null = right[col].isna().sum()
-            new_null = merged[col].isna().sum()
+        for col, (orig_null, new_null) in self._result_nulls(
+            left, right, merged, counts, how, suffixes, unmatched_left, unmatched_right
+        ).items():
             if new_null > orig_null:
                 missing_introduced[col] = int(new_null - orig_null)
 
@@ -296,24 +862,78 @@ class MergeEngine:
             validation_warnings=validation_warnings,
         )
 
+    def _result_nulls(
+        self,
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        merged: pd.DataFrame,
+        counts: _KeyCounts,
+        how: str,
+        suffixes: Tuple[str, str],
+        unmatched_left: int,
+        unmatched_right: int,
+    ) -> Dict[str, Tuple[int, int]]:
+        # (input nulls, result nulls) per non-key result column.
+        left_cols = set(left.columns)
+        right_cols = set(right.columns)
+
+        # How often each input row appears in the result: a matched row once
+        # per partner, an unmatched row once if the join keeps it. Output
+        # nulls then follow from the input nulls without rescanning the
+        # (possibly much larger) result.
+        left_weight = counts.right_counts[counts.left_codes]
+        right_weight = counts.left_counts[counts.right_codes]
+        if how in ("left", "outer"):
+            left_weight = np.maximum(left_weight, 1)
+        if how in ("right", "outer"):
+            right_weight = np.maximum(right_weight, 1)
+
+        nulls_by_column = {}
+        for col in merged.columns:
+            if col in left_cols and col in right_cols:
+                continue  # Key column or suffix-resolved
+            if col == "_merge":
+                continue
+            orig_null = 0
+            if col in left_cols:
+                nulls = left[col].isna().to_numpy()
+                orig_null = int(nulls.sum())
+                new_null = int(left_weight[nulls].sum()) + unmatched_right
+            elif col in right_cols:
+                nulls = right[col].isna().to_numpy()
+                orig_null = int(nulls.sum())
+                new_null = int(right_weight[nulls].sum()) + unmatched_left
+            elif col.endswith(suffixes[0]) and col[: -len(suffixes[0])] in left_cols:
+                nulls = left[col[: -len(suffixes[0])]].isna().to_numpy()
+                new_null = int(left_weight[nulls].sum()) + unmatched_right
+            elif col.endswith(suffixes[1]) and col[: -len(suffixes[1])] in right_cols:
+                nulls = right[col[: -len(suffixes[1])]].isna().to_numpy()
+                new_null = int(right_weight[nulls].sum()) + unmatched_left
+            else:
+                new_null = int(merged[col].isna().sum())
+            nulls_by_column[col] = (orig_null, new_null)
+        return nulls_by_column
+
     def suggest_join_keys(
         self, left: pd.DataFrame, right: pd.DataFrame, max_candidates: int = 5
     ) -> List[Tuple[List[str], float]]:
+        # Scores each shared column by how many of its values are found on
+        # the other side, times how close it is to unique on the side that
+        # looks like the lookup table. Both come from sketches of a row
+        # sample that are cached per dataset, so this is cheap to repeat.
         candidates: List[Tuple[List[str], float]] = []
-        left_cols = set(left.columns)
-        right_cols = set(right.columns)
-        common_names = left_cols & right_cols
-
-        for col in common_names:
-            if left[col].dtype == right[col].dtype or self._dtypes_compatible(
-                left[col].dtype, right[col].dtype
-            ):
-                score = 1.0
-                col_lower = col.lower()
-                if "id" in col_lower or "key" in col_lower or col_lower == "index":
-                    score += 0.5
-                if left[col].nunique() == len(left) and right[col].nunique() == len(right):
-                    score += 0.3
-                candidates.append(([col], score))
+        for col in left.columns.intersection(right.columns):
+            if not self._dtypes_compatible(left[col].dtype, right[col].dtype):
+                continue
+            try:
+                left_sketch = self.sketches.get_or_build(left, col)
+                right_sketch = self.sketches.get_or_build(right, col)
+            except (TypeError, ValueError):
+                continue
+            overlap = max(
+                left_sketch.containment(right_sketch), right_sketch.containment(left_sketch)
+            )
+            uniqueness = max(left_sketch.uniqueness(), right_sketch.uniqueness())
+            candidates.append(([col], round(overlap * uniqueness, 3)))
         candidates.sort(key=lambda x: -x[1])
         return candidates[:max_candidates]
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+
+def _parse(values: pd.Series, text_parser: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(float)
+    if not pd.api.types.is_object_dtype(values) and not pd.api.types.is_string_dtype(values):
+        return pd.Series(np.nan, index=values.index, name=values.name, dtype=float)
+
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques, dtype=object)
+    parsed = pd.Series(np.nan, index=uniques.index, dtype=float)
+    is_text = uniques.map(lambda v: isinstance(v, str)).astype(bool)
+    is_number = uniques.map(lambda v: isinstance(v, (int, float, np.number))).astype(bool)
+    if is_text.any():
+        parsed[is_text] = text_parser(uniques[is_text])
+    if is_number.any():
+        parsed[is_number] = uniques[is_number].astype(float)
+
+    lookup = np.append(parsed.to_numpy(), np.nan)
+    return pd.Series(lookup[codes], index=values.index, name=values.name)
+
+
+def _strip_to_number(text: pd.Series) -> pd.Series:
+    return pd.to_numeric(text.str.replace(r"[^\d.-]", "", regex=True), errors="coerce").astype(float)
+
+
+def _first_integer(text: pd.Series) -> pd.Series:
+    return text.str.extract(r"(\d+)", expand=False).astype(float)
+
+
+def parse_numbers(values: pd.Series) -> pd.Series:
+    return _parse(values, _strip_to_number)
+
+
+def parse_season_numbers(values: pd.Series) -> pd.Series:
+    return _parse(values, _first_integer)
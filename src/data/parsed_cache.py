@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+import pandas as pd
+
+CacheKey = Tuple[Hashable, Hashable, int, str]
+
+
+class ParsedColumnCache:
+    DEFAULT_MAX_BYTES = 1024**3
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, pd.Series]" = OrderedDict()
+        self._bytes = 0
+
+    @property
+    def memory_usage(self) -> int:
+        return self._bytes
+
+    def get(self, dataset: Hashable, column: Hashable, version: int, kind: str) -> Optional[pd.Series]:
+        key = (dataset, column, version, kind)
+        parsed = self._entries.get(key)
+        if parsed is not None:
+            self._entries.move_to_end(key)
+        return parsed
+
+    def put(self, dataset: Hashable, column: Hashable, version: int, kind: str, parsed: pd.Series) -> None:
+        key = (dataset, column, version, kind)
+        self._discard(key)
+        self._entries[key] = parsed
+        self._bytes += self._nbytes(parsed)
+        while len(self._entries) > 1 and self._bytes > self.max_bytes:
+            self._discard(next(iter(self._entries)))
+
+    def get_or_parse(
+        self,
+        dataset: Hashable,
+        column: Hashable,
+        version: int,
+        kind: str,
+        parse: Callable[[], pd.Series],
+    ) -> pd.Series:
+        parsed = self.get(dataset, column, version, kind)
+        if parsed is None:
+            parsed = parse()
+            self.put(dataset, column, version, kind, parsed)
+        return parsed
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _discard(self, key: CacheKey) -> None:
+        parsed = self._entries.pop(key, None)
+        if parsed is not None:
+            self._bytes -= self._nbytes(parsed)
+
+    @staticmethod
+    def _nbytes(parsed: pd.Series) -> int:
+        return int(parsed.memory_usage(index=False, deep=False))
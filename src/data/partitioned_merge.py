@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+import os
+import pickle
+import shutil
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from .chunked_compare import _SideProfile, _bucket_ids, _key_dtypes, _read_bucket
+from .merge_engine import (
+    MergeCancelled,
+    MergeEngine,
+    MergeEstimate,
+    MergeResult,
+    ProgressCallback,
+)
+
+Source = Union[pd.DataFrame, str]
+JoinKeys = Tuple[Tuple[str, ...], Tuple[str, ...]]
+
+
+def _merge_bucket(task: Dict[str, Any]) -> Dict[str, Any]:
+    left = task["left_schema"]
+    if os.path.exists(task["left_path"]):
+        left = _read_bucket(task["left_path"], list(left.columns))
+    right = task["right_schema"]
+    if os.path.exists(task["right_path"]):
+        right = _read_bucket(task["right_path"], list(right.columns))
+    join_keys, how, suffixes = task["join_keys"], task["how"], task["suffixes"]
+
+    engine = MergeEngine(suffixes=suffixes)
+    counts = engine._key_counts(left, right, join_keys)
+    merged = pd.merge(
+        left,
+        right,
+        left_on=list(join_keys[0]),
+        right_on=list(join_keys[1]),
+        how=how,
+        suffixes=suffixes,
+        indicator=task["indicator"],
+    )
+    if len(merged):
+        merged.to_csv(task["output_path"], index=False, header=False)
+
+    matched, unmatched_left, unmatched_right = engine._row_split(counts, how)
+    estimate = engine._estimate(left, right, join_keys, how, task["indicator"], counts)
+    return {
+        "schema": merged.iloc[:0],
+        "rows_left": len(left),
+        "rows_right": len(right),
+        "rows_result": len(merged),
+        "matched": matched,
+        "unmatched_left": unmatched_left,
+        "unmatched_right": unmatched_right,
+        "bytes": estimate.bytes,
+        "many_to_many_keys": estimate.many_to_many_keys,
+        "max_fanout": estimate.max_fanout,
+        "dup_left": int(counts.left_counts[counts.left_counts > 1].sum()),
+        "dup_right": int(counts.right_counts[counts.right_counts > 1].sum()),
+        "null_left": int(counts.left_counts[counts.null_groups].sum()),
+        "null_right": int(counts.right_counts[counts.null_groups].sum()),
+        "nulls": engine._result_nulls(
+            left, right, merged, counts, how, suffixes, unmatched_left, unmatched_right
+        ),
+    }
+
+
+class PartitionedMergeEngine:
+    # A grace hash join: both inputs are split by a hash of the join key into
+    # buckets on disk, so every key lives in exactly one bucket pair and each
+    # pair can be joined on its own. Only one bucket pair (per worker) and its
+    # result are ever in memory; the result is streamed to a CSV file.
+    DEFAULT_CHUNK_SIZE = 500_000
+    DEFAULT_BUCKET_BYTES = 128 * 1024**2
+
+    def __init__(
+        self,
+        suffixes: Tuple[str, str] = MergeEngine.DEFAULT_SUFFIXES,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        bucket_bytes: int = DEFAULT_BUCKET_BYTES,
+        n_buckets: Optional[int] = None,
+        workers: Optional[int] = None,
+        work_dir: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        self.suffixes = suffixes
+        self.chunk_size = chunk_size
+        self.bucket_bytes = bucket_bytes
+        self.n_buckets = n_buckets
+        self.workers = workers if workers is not None else min(4, os.cpu_count() or 1)
+        self.work_dir = work_dir
+        self.progress = progress
+        self.is_cancelled = is_cancelled
+
+    def merge(
+        self,
+        left: Source,
+        right: Source,
+        output_path: str,
+        on: Optional[Union[str, Sequence[str]]] = None,
+        left_on: Optional[Union[str, Sequence[str]]] = None,
+        right_on: Optional[Union[str, Sequence[str]]] = None,
+        how: str = "inner",
+        columns_left: Optional[Sequence[str]] = None,
+        columns_right: Optional[Sequence[str]] = None,
+        exclude_left: Optional[Sequence[str]] = None,
+        exclude_right: Optional[Sequence[str]] = None,
+        validate: bool = True,
+        indicator: bool = True,
+    ) -> MergeResult:
+        # `left` and `right` are DataFrames or CSV paths. The result rows are
+        # written to output_path grouped by bucket, so their order differs
+        # from an in-memory join; merged_df only carries the result columns.
+        engine = MergeEngine(suffixes=self.suffixes)
+        left_head, right_head = self._header(left), self._header(right)
+        join_keys = engine._resolve_join_keys(on, left_on, right_on, left_head, right_head)
+        missing = [
+            w
+            for w in engine._validate_merge(left_head, right_head, join_keys, how)
+            if "ERROR" in w
+        ]
+        if missing:
+            return engine._failed_result(
+                left_head,
+                right_head,
+                join_keys,
+                how,
+                "Validation failed. Check summary.validation_warnings.",
+                validation_passed=False,
+                validation_warnings=missing,
+            )
+
+        selection = {
+            "left": (join_keys[0], columns_left, exclude_left),
+            "right": (join_keys[1], columns_right, exclude_right),
+        }
+        n_buckets = self.n_buckets or self._bucket_count(left, right)
+        tmp_dir = tempfile.mkdtemp(prefix="dataforge-merge-", dir=self.work_dir)
+        try:
+            profiles = {}
+            for side, source in (("left", left), ("right", right)):
+                profiles[side] = self._partition(
+                    engine, source, side, selection[side], n_buckets, tmp_dir
+                )
+            results = self._merge_buckets(
+                profiles["left"], profiles["right"], join_keys, how, indicator, n_buckets, tmp_dir
+            )
+            self._collect_output(results, n_buckets, tmp_dir, output_path)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        left_schema = profiles["left"].empty_frame()
+        right_schema = profiles["right"].empty_frame()
+        warnings: List[str] = []
+        if validate:
+            warnings = engine._validate_merge(left_schema, right_schema, join_keys, how)
+            # A key hashes to a single bucket, so duplicate and null key rows
+            # counted per bucket add up to the counts over the whole input.
+            warnings += engine._key_warnings(
+                sum(r["dup_left"] for r in results),
+                sum(r["dup_right"] for r in results),
+                sum(r["null_left"] for r in results),
+                sum(r["null_right"] for r in results),
+            )
+
+        rows_left = sum(r["rows_left"] for r in results)
+        rows_right = sum(r["rows_right"] for r in results)
+        estimate = MergeEstimate(
+            rows=sum(r["rows_result"] for r in results),
+            bytes=sum(r["bytes"] for r in results),
+            matched_rows=sum(r["matched"] for r in results),
+            unmatched_left=sum(r["unmatched_left"] for r in results),
+            unmatched_right=sum(r["unmatched_right"] for r in results),
+            many_to_many_keys=sum(r["many_to_many_keys"] for r in results),
+            max_fanout=max((r["max_fanout"] for r in results), default=0),
+        )
+        if validate:
+            warnings += engine._fanout_warnings(estimate, rows_left, rows_right)
+
+        schema = self._result_schema(results)
+        summary = engine._build_summary(
+            left_schema,
+            right_schema,
+            schema,
+            join_keys,
+            how,
+            warnings,
+            engine._key_counts(left_schema, right_schema, join_keys),
+            self.suffixes,
+        )
+        summary.rows_left = rows_left
+        summary.rows_right = rows_right
+        summary.rows_result = estimate.rows
+        summary.matched_rows = estimate.matched_rows
+        summary.unmatched_left = estimate.unmatched_left
+        summary.unmatched_right = estimate.unmatched_right
+        summary.missing_values_introduced = self._missing_introduced(results)
+        summary.estimated_rows = estimate.rows
+        summary.estimated_bytes = estimate.bytes
+        summary.strategy = "partitioned"
+        return MergeResult(merged_df=schema, summary=summary, success=True, output_path=output_path)
+
+    @staticmethod
+    def _header(source: Source) -> pd.DataFrame:
+        if isinstance(source, pd.DataFrame):
+            return source
+        return pd.read_csv(source, nrows=0)
+
+    def _bucket_count(self, left: Source, right: Source) -> int:
+        def size(source: Source) -> int:
+            if isinstance(source, pd.DataFrame):
+                return int(source.memory_usage(index=False, deep=False).sum())
+            return os.path.getsize(source)
+
+        return max(1, -(-max(size(left), size(right)) // self.bucket_bytes))
+
+    def _check_cancelled(self) -> None:
+        if self.is_cancelled is not None and self.is_cancelled():
+            raise MergeCancelled()
+
+    def _report_progress(self, stage: str, done: int, total: int) -> None:
+        if self.progress is not None:
+            self.progress(stage, done, total)
+
+    @staticmethod
+    def _bucket_path(tmp_dir: str, side: str, bucket: int) -> str:
+        return os.path.join(tmp_dir, f"{side}-{bucket:05d}.pkl")
+
+    @staticmethod
+    def _output_part(tmp_dir: str, bucket: int) -> str:
+        return os.path.join(tmp_dir, f"merged-{bucket:05d}.csv")
+
+    def _chunks(self, source: Source, keys: Sequence[str]) -> Iterator[Tuple[pd.DataFrame, int, int]]:
+        # (chunk, done, total) in rows for a DataFrame, in bytes for a file.
+        if isinstance(source, pd.DataFrame):
+            total = len(source)
+            for start in range(0, total, self.chunk_size):
+                end = min(start + self.chunk_size, total)
+                yield source.iloc[start:end], end, total
+            return
+        total = os.path.getsize(source)
+        key_dtypes = _key_dtypes(source, keys, self.chunk_size)
+        with open(source, "rb") as handle:
+            reader = pd.read_csv(
+                handle, low_memory=False, engine="c", chunksize=self.chunk_size, dtype=key_dtypes
+            )
+            with reader:
+                for chunk in reader:
+                    yield chunk, min(handle.tell(), total), total
+
+    def _partition(
+        self,
+        engine: MergeEngine,
+        source: Source,
+        side: str,
+        selection: Tuple[Tuple[str, ...], Optional[Sequence[str]], Optional[Sequence[str]]],
+        n_buckets: int,
+        tmp_dir: str,
+    ) -> _SideProfile:
+        keys, include, exclude = selection
+        profile = _SideProfile()
+        stage = f"Partitioning {side} dataset"
+        for chunk, done, total in self._chunks(source, keys):
+            self._check_cancelled()
+            chunk = engine._apply_column_selection(chunk, keys, include, exclude)
+            profile.update(chunk)
+            bucket_ids = _bucket_ids(chunk, list(keys), n_buckets)
+            for bucket, part in chunk.groupby(bucket_ids, sort=False):
+                with open(self._bucket_path(tmp_dir, side, bucket), "ab") as out:
+                    pickle.dump(part, out, protocol=pickle.HIGHEST_PROTOCOL)
+            self._report_progress(stage, done, total)
+        if not profile.columns:
+            # An empty input still contributes its columns to the result.
+            head = engine._apply_column_selection(self._header(source), keys, include, exclude)
+            profile.update(head.iloc[:0])
+        return profile
+
+    def _merge_buckets(
+        self,
+        left: _SideProfile,
+        right: _SideProfile,
+        join_keys: JoinKeys,
+        how: str,
+        indicator: bool,
+        n_buckets: int,
+        tmp_dir: str,
+    ) -> List[Dict[str, Any]]:
+        tasks = [
+            {
+                "left_path": self._bucket_path(tmp_dir, "left", bucket),
+                "right_path": self._bucket_path(tmp_dir, "right", bucket),
+                "left_schema": left.empty_frame(),
+                "right_schema": right.empty_frame(),
+                "output_path": self._output_part(tmp_dir, bucket),
+                "join_keys": join_keys,
+                "how": how,
+                "suffixes": self.suffixes,
+                "indicator": indicator,
+            }
+            for bucket in range(n_buckets)
+        ]
+        stage = "Joining partitions"
+        results: List[Dict[str, Any]] = []
+        if self.workers <= 1:
+            for task in tasks:
+                self._check_cancelled()
+                results.append(_merge_bucket(task))
+                self._report_progress(stage, len(results), len(tasks))
+            return results
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = {pool.submit(_merge_bucket, task) for task in tasks}
+            try:
+                while pending:
+                    done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results.append(future.result())
+                    self._report_progress(stage, len(results), len(tasks))
+                    self._check_cancelled()
+            except BaseException:
+                pool.shutdown(wait=True, cancel_futures=True)
+                raise
+        return results
+
+    def _collect_output(
+        self, results: List[Dict[str, Any]], n_buckets: int, tmp_dir: str, output_path: str
+    ) -> None:
+        columns = list(self._result_schema(results).columns)
+        stage = "Writing result"
+        try:
+            with open(output_path, "w", newline="", encoding="utf-8") as out:
+                pd.DataFrame(columns=columns).to_csv(out, index=False)
+                for bucket in range(n_buckets):
+                    self._check_cancelled()
+                    part = self._output_part(tmp_dir, bucket)
+                    if os.path.exists(part):
+                        with open(part, "r", encoding="utf-8") as src:
+                            shutil.copyfileobj(src, out)
+                    self._report_progress(stage, bucket + 1, n_buckets)
+        except BaseException:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise
+
+    @staticmethod
+    def _result_schema(results: List[Dict[str, Any]]) -> pd.DataFrame:
+        # Buckets with rows carry the real result dtypes; an empty one may not.
+        for result in results:
+            if result["rows_result"]:
+                return result["schema"]
+        return results[0]["schema"]
+
+    @staticmethod
+    def _missing_introduced(results: List[Dict[str, Any]]) -> Dict[str, int]:
+        totals: Dict[str, List[int]] = {}
+        for result in results:
+            for col, (orig_null, new_null) in result["nulls"].items():
+                total = totals.setdefault(col, [0, 0])
+                total[0] += orig_null
+                total[1] += new_null
+        return {
+            col: int(new_null - orig_null)
+            for col, (orig_null, new_null) in totals.items()
+            if new_null > orig_null
+        }
+
+
+def merge_csv_files(
+    left_path: str,
+    right_path: str,
+    output_path: str,
+    on: Optional[Union[str, Sequence[str]]] = None,
+    how: str = "inner",
+    **options: Any,
+) -> MergeResult:
+    return PartitionedMergeEngine(**options).merge(left_path, right_path, output_path, on=on, how=how)
@@ -0,0 +1,655 @@
+from __future__ import annotations
+
+import math
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .durations import parse_durations_to_seconds
+from .frame_cache import FrameCache
+from .key_index import NULL_HASH, _MIX
+from .sketches import HyperLogLog, _sample_positions, count_repeats
+
+DATE = "date"
+DURATION = "duration"
+
+# Rows sampled to decide whether a text column holds dates or durations.
+DETECT_SAMPLE_ROWS = 1_000
+# Share of sampled non-null values that must parse as dates.
+DATE_MIN_RATIO = 0.5
+# Share of rows that must parse as durations for a column to count as one.
+DURATION_MIN_RATIO = 0.4
+# Rows sampled for approximate quantiles, string lengths and memory usage.
+APPROXIMATE_SAMPLE_ROWS = 100_000
+# Most frequent sampled values whose exact counts are taken as top values.
+TOP_CANDIDATES = 10
+
+SectionCallback = Callable[[str, Any], None]
+ProgressCallback = Callable[[int, int], None]
+
+_QUANTILES = [0.25, 0.5, 0.75]
+_QUANTILE_LABELS = ["25%", "50%", "75%"]
+
+
+class ProfileCancelled(Exception):
+
+    pass
+
+
+@dataclass
+class DatetimeStats:
+    earliest: pd.Timestamp
+    latest: pd.Timestamp
+    # Rows that are missing or do not parse as a date.
+    missing: int
+
+
+@dataclass
+class DurationStats:
+    # In seconds.
+    count: int
+    minimum: float
+    maximum: float
+    mean: float
+    missing: int
+
+
+@dataclass
+class ColumnProfile:
+    name: Hashable
+    dtype: Any
+    rows: int
+    missing: int
+    # Distinct non-null values.
+    distinct: int
+    # None in counts-only profiles (detailed=False).
+    memory_bytes: Optional[int]
+    # The statistics Series.describe() reports for this column, in its order.
+    describe: Optional[Dict[str, Any]] = None
+    # Most frequent values as text, with their counts (text columns only).
+    top_values: Optional[List[Tuple[str, int]]] = None
+    avg_length: Optional[float] = None
+    datetime: Optional[DatetimeStats] = None
+    duration: Optional[DurationStats] = None
+    # 95% error bounds of approximate statistics: "distinct", "memory_bytes"
+    # and "avg_length" in their own units, the quartile labels ("25%", ...)
+    # as a fraction of rank. Empty when the profile is exact.
+    errors: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def count(self) -> int:
+        return self.rows - self.missing
+
+    @property
+    def is_numeric(self) -> bool:
+        return _is_numeric(self.dtype)
+
+    @property
+    def is_text(self) -> bool:
+        return _is_text(self.dtype)
+
+    @property
+    def duplicate_rate(self) -> float:
+        # As Series.duplicated().mean(): all nulls count as one value.
+        if not self.rows:
+            return float("nan")
+        distinct = self.distinct + (1 if self.missing else 0)
+        return (self.rows - distinct) / self.rows
+
+
+@dataclass
+class DatasetProfile:
+    rows: int
+    columns: List[ColumnProfile]
+    # The dataset-wide counts are None in counts-only profiles.
+    memory_bytes: Optional[int]
+    duplicate_rows: Optional[int]
+    complete_rows: Optional[int]
+    # 95% error bounds of "duplicate_rows" and "memory_bytes" when approximate.
+    errors: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def approximate(self) -> bool:
+        return bool(self.errors)
+
+    @property
+    def missing_cells(self) -> int:
+        return sum(column.missing for column in self.columns)
+
+    def describe(self) -> pd.DataFrame:
+        # Equivalent of df.describe(include="all").transpose().
+        stats = []
+        for column in self.columns:
+            values = column.describe or {}
+            if column.is_numeric:
+                values = {name: float(value) for name, value in values.items()}
+            stats.append(values)
+        names: List[str] = []
+        for keys in sorted((list(values) for values in stats), key=len):
+            names.extend(name for name in keys if name not in names)
+        return pd.DataFrame(
+            stats, index=[column.name for column in self.columns], columns=names, dtype=object
+        )
+
+
+def _is_numeric(dtype) -> bool:
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def _is_text(dtype) -> bool:
+    return (
+        pd.api.types.is_object_dtype(dtype)
+        or isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype))
+    )
+
+
+def detect_column_kinds(values: pd.Series, sample_rows: int = DETECT_SAMPLE_ROWS) -> FrozenSet[str]:
+    # Whether a column should be summarised as dates and/or durations.
+    # Temporal dtypes decide it outright and numbers are neither; text is
+    # judged on a fixed-size random sample so that a column that is not a
+    # date costs a thousand failed parses rather than millions.
+    dtype = values.dtype
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return frozenset([DATE])
+    if pd.api.types.is_timedelta64_dtype(dtype):
+        return frozenset([DURATION])
+    if not _is_text(dtype):
+        return frozenset()
+    rows = len(values)
+    if rows > sample_rows:
+        values = values.iloc[_sample_positions(rows, sample_rows)]
+    present = values.dropna()
+    if present.empty:
+        return frozenset()
+    kinds = set()
+    try:
+        if pd.to_datetime(present, errors="coerce", utc=True).notna().mean() >= DATE_MIN_RATIO:
+            kinds.add(DATE)
+    except (TypeError, ValueError, OverflowError):
+        pass
+    if parse_durations_to_seconds(values).notna().mean() >= DURATION_MIN_RATIO:
+        kinds.add(DURATION)
+    return frozenset(kinds)
+
+
+class ColumnKindCache(FrameCache):
+    DEFAULT_MAX_BYTES = 1024**2
+    _ENTRY_BYTES = 256
+
+    def get_or_detect(self, df: pd.DataFrame, column: Hashable) -> FrozenSet[str]:
+        kinds = self._lookup(df, column)
+        if kinds is None:
+            kinds = detect_column_kinds(df[column])
+            self._store(df, column, kinds, self._ENTRY_BYTES)
+        return kinds
+
+
+class ProfileCache(FrameCache):
+    DEFAULT_MAX_BYTES = 16 * 1024**2
+    # Rough size of one column's statistics.
+    _COLUMN_BYTES = 1024
+
+    # Entries are keyed by the approximate_rows threshold as well, since it
+    # decides whether a profile is exact.
+    def get(
+        self, df: pd.DataFrame, approximate_rows: int, detailed: bool = True
+    ) -> Optional[DatasetProfile]:
+        # A detailed profile also answers a counts-only request.
+        profile = self._lookup(df, (True, approximate_rows))
+        if profile is None and not detailed:
+            profile = self._lookup(df, (False, approximate_rows))
+        return profile
+
+    def put(
+        self, df: pd.DataFrame, approximate_rows: int, profile: DatasetProfile, detailed: bool = True
+    ) -> None:
+        nbytes = self._COLUMN_BYTES * (len(profile.columns) + 1)
+        self._store(df, (detailed, approximate_rows), profile, nbytes)
+
+
+class ProfileEngine:
+    # Profiles every column from a single factorization: its codes give the
+    # null mask, the value counts and the row-duplicate keys, and parsing
+    # (dates, durations, string lengths) runs once per distinct value
+    # instead of once per row.
+    #
+    # Above approximate_rows rows, exact distinct counts, quantiles, top
+    # values and duplicate rows cost more time and memory than they are
+    # worth, and columns are sketched instead (see _sketch_column).
+    APPROXIMATE_MIN_ROWS = 10_000_000
+
+    def __init__(
+        self,
+        kinds: Optional[ColumnKindCache] = None,
+        approximate_rows: Optional[int] = None,
+        profiles: Optional[ProfileCache] = None,
+    ) -> None:
+        self.kinds = kinds
+        self.profiles = profiles
+        self.approximate_rows = approximate_rows if approximate_rows is not None else self.APPROXIMATE_MIN_ROWS
+
+    def profile(
+        self,
+        df: pd.DataFrame,
+        detailed: bool = True,
+        on_section: Optional[SectionCallback] = None,
+        progress: Optional[ProgressCallback] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> DatasetProfile:
+        # Numeric columns are profiled first, so on_section can hand out the
+        # "numeric" columns before the slower text ones; "text", "datetime",
+        # "duration" (lists of ColumnProfile), "statistics" and "overview"
+        # (the DatasetProfile) follow once every column is done. progress
+        # gets (done, total) columns and is_cancelled is polled between
+        # columns.
+        #
+        # With detailed=False only the per-column missing and distinct
+        # counts are taken (see _count_columns).
+        def finish(name: str, result: Any) -> None:
+            if on_section is not None:
+                on_section(name, result)
+
+        cached = self.profiles.get(df, self.approximate_rows, detailed) if self.profiles is not None else None
+        if cached is not None:
+            if progress is not None:
+                progress(len(cached.columns), len(cached.columns))
+            if detailed:
+                finish("numeric", [column for column in cached.columns if column.is_numeric])
+            self._finish_sections(cached, detailed, finish)
+            return cached
+        if not detailed:
+            profile = self._count_columns(df, progress, is_cancelled)
+            if self.profiles is not None:
+                self.profiles.put(df, self.approximate_rows, profile, detailed)
+            finish("overview", profile)
+            return profile
+
+        rows, width = df.shape
+        approximate = rows > self.approximate_rows
+        if approximate:
+            sample = _sample_positions(rows, APPROXIMATE_SAMPLE_ROWS)
+            row_keys = np.zeros(rows, dtype=np.uint64)
+        else:
+            row_keys = np.zeros(rows, dtype=np.int64)
+            radix = 1
+        incomplete = np.zeros(rows, dtype=bool)
+        columns: List[Optional[ColumnProfile]] = [None] * width
+        numeric = [position for position in range(width) if _is_numeric(df.dtypes.iloc[position])]
+        others = [position for position in range(width) if not _is_numeric(df.dtypes.iloc[position])]
+        done = 0
+        for group in (numeric, others):
+            for position in group:
+                if is_cancelled is not None and is_cancelled():
+                    raise ProfileCancelled()
+                series = df.iloc[:, position]
+                kinds = self._column_kinds(df, series)
+                if approximate:
+                    columns[position], hashes, nulls = self._sketch_column(series, sample, kinds)
+                    incomplete |= nulls
+                    row_keys = (row_keys * _MIX) ^ hashes
+                else:
+                    codes, uniques = pd.factorize(series)
+                    columns[position] = self._profile_column(series, codes, uniques, kinds)
+                    incomplete |= codes < 0
+                    row_keys, radix = _combine_codes(row_keys, radix, codes, len(uniques) + 1)
+                done += 1
+                if progress is not None:
+                    progress(done, width)
+            if group is numeric:
+                finish("numeric", [columns[position] for position in numeric])
+
+        errors = {}
+        if not (width and rows):
+            duplicate_rows = 0
+        elif approximate:
+            duplicate_rows, errors["duplicate_rows"] = count_repeats(row_keys)
+            duplicate_rows = int(round(duplicate_rows))
+            errors["memory_bytes"] = sum(c.errors.get("memory_bytes", 0.0) for c in columns)
+        else:
+            duplicate_rows = rows - len(pd.unique(row_keys))
+        profile = DatasetProfile(
+            rows=rows,
+            columns=columns,
+            memory_bytes=int(df.index.memory_usage(deep=True)) + sum(c.memory_bytes for c in columns),
+            duplicate_rows=duplicate_rows,
+            complete_rows=int(rows - incomplete.sum()),
+            errors=errors,
+        )
+        if self.profiles is not None:
+            self.profiles.put(df, self.approximate_rows, profile)
+        self._finish_sections(profile, detailed, finish)
+        return profile
+
+    def _finish_sections(self, profile: DatasetProfile, detailed: bool, finish: SectionCallback) -> None:
+        columns = profile.columns
+        if detailed:
+            finish("text", [column for column in columns if column.is_text])
+            finish("datetime", [column for column in columns if column.datetime is not None])
+            finish("duration", [column for column in columns if column.duration is not None])
+            finish("statistics", profile)
+        finish("overview", profile)
+
+    def _count_columns(
+        self,
+        df: pd.DataFrame,
+        progress: Optional[ProgressCallback],
+        is_cancelled: Optional[Callable[[], bool]],
+    ) -> DatasetProfile:
+        # Distinct counts of numeric columns come from hashing alone
+        # (Series.unique), without the codes a full profile needs; object
+        # columns factorize faster than isna() scans them, so their codes
+        # give both counts. Memory usage and duplicate and complete rows,
+        # which need every row of every column, are skipped.
+        rows, width = df.shape
+        approximate = rows > self.approximate_rows
+        columns = []
+        for position in range(width):
+            if is_cancelled is not None and is_cancelled():
+                raise ProfileCancelled()
+            series = df.iloc[:, position]
+            errors = {}
+            if approximate:
+                nulls = series.isna().to_numpy()
+                sketch = HyperLogLog()
+                sketch.add(_column_hashes(series)[~nulls])
+                missing = int(nulls.sum())
+                distinct = int(round(min(sketch.count(), float(rows - missing))))
+                errors["distinct"] = 1.96 * sketch.relative_error * distinct
+            elif _is_numeric(series.dtype):
+                missing = int(series.isna().sum())
+                distinct = len(series.unique()) - (1 if missing else 0)
+            else:
+                codes, uniques = pd.factorize(series)
+                missing = int((codes < 0).sum())
+                distinct = len(uniques)
+            columns.append(ColumnProfile(
+                name=series.name,
+                dtype=series.dtype,
+                rows=rows,
+                missing=missing,
+                distinct=distinct,
+                memory_bytes=None,
+                errors=errors,
+            ))
+            if progress is not None:
+                progress(position + 1, width)
+        return DatasetProfile(
+            rows=rows, columns=columns, memory_bytes=None, duplicate_rows=None, complete_rows=None
+        )
+
+    def _column_kinds(self, df: pd.DataFrame, series: pd.Series) -> FrozenSet[str]:
+        if self.kinds is None or not df.columns.is_unique:
+            return detect_column_kinds(series)
+        return self.kinds.get_or_detect(df, series.name)
+
+    def _profile_column(
+        self,
+        series: pd.Series,
+        codes: np.ndarray,
+        uniques: pd.Index,
+        kinds: FrozenSet[str],
+    ) -> ColumnProfile:
+        # counts[0] is the number of nulls, counts[1:] follow uniques.
+        counts = np.bincount(codes + 1, minlength=len(uniques) + 1)
+        column = ColumnProfile(
+            name=series.name,
+            dtype=series.dtype,
+            rows=len(series),
+            missing=int(counts[0]),
+            distinct=len(uniques),
+            memory_bytes=_memory_bytes(series, codes, uniques, counts),
+        )
+        counts = counts[1:]
+        dtype = series.dtype
+        present = codes >= 0 if column.missing else None
+        if _is_numeric(dtype):
+            column.describe = _numeric_describe(_valid_values(series, present))
+        elif _is_temporal(dtype):
+            column.describe = _temporal_describe(series if present is None else series[present])
+        else:
+            column.describe = {"count": column.count, "unique": len(uniques), "top": np.nan, "freq": np.nan}
+            if len(uniques):
+                top = int(np.argmax(counts))
+                column.describe.update(top=uniques[top], freq=int(counts[top]))
+
+        if _is_text(dtype):
+            column.top_values, column.avg_length = _text_stats(uniques, counts)
+        _add_parsed_stats(column, series, kinds, (codes, uniques))
+        return column
+
+    def _sketch_column(
+        self,
+        series: pd.Series,
+        sample: np.ndarray,
+        kinds: FrozenSet[str],
+    ) -> Tuple[ColumnProfile, np.ndarray, np.ndarray]:
+        # The approximate counterpart of _profile_column, which never builds
+        # a hash table over all rows. Full-column sketches cover what a
+        # sample cannot estimate (HyperLogLog for distinct values, and the
+        # returned row hashes for the duplicate-row Bloom filter). A shared
+        # row sample, which an in-memory frame draws for free, gives the
+        # quantiles, string lengths and memory usage. Top values are the
+        # sample's most frequent values, recounted exactly. Min, max, mean,
+        # std and missing counts stay exact, and so do the date and
+        # duration tabs, since their columns are only the ones detected.
+        nulls = series.isna().to_numpy()
+        hashes = _column_hashes(series)
+        hashes[nulls] = NULL_HASH
+        sketch = HyperLogLog()
+        sketch.add(hashes[~nulls])
+        count = len(series) - int(nulls.sum())
+        distinct = min(sketch.count(), float(count))
+        picked = series.iloc[sample]
+        sampled = picked.dropna()
+        memory_bytes, memory_error = _sampled_memory(series, picked)
+        column = ColumnProfile(
+            name=series.name,
+            dtype=series.dtype,
+            rows=len(series),
+            missing=len(series) - count,
+            distinct=int(round(distinct)),
+            memory_bytes=memory_bytes,
+            errors={"distinct": 1.96 * sketch.relative_error * distinct, "memory_bytes": memory_error},
+        )
+        dtype = series.dtype
+        # Dvoretzky-Kiefer-Wolfowitz: sample quantiles are within this rank
+        # distance of the column's with 95% probability.
+        rank_error = math.sqrt(math.log(2 / 0.05) / (2 * max(len(sampled), 1)))
+        if _is_numeric(dtype):
+            column.describe = _numeric_describe(
+                _valid_values(series, ~nulls), _valid_values(sampled, None)
+            )
+            column.errors.update(dict.fromkeys(_QUANTILE_LABELS, rank_error))
+        elif _is_temporal(dtype):
+            column.describe = _temporal_describe(series[~nulls], sampled)
+            column.errors.update(dict.fromkeys(_QUANTILE_LABELS, rank_error))
+        else:
+            top = _top_counts(series, sampled)
+            column.describe = {"count": count, "unique": column.distinct, "top": np.nan, "freq": np.nan}
+            if len(top):
+                column.describe.update(top=top.index[0], freq=int(top.iloc[0]))
+
+        if _is_text(dtype):
+            by_label = top.groupby(top.index.astype(str), sort=False).sum()
+            column.top_values = [(label, int(n)) for label, n in by_label.nlargest(3, keep="first").items()]
+            if len(sampled):
+                lengths = sampled.astype(str).str.len().to_numpy(dtype=float)
+                column.avg_length = float(lengths.mean())
+                column.errors["avg_length"] = 1.96 * float(lengths.std()) / math.sqrt(len(lengths))
+        _add_parsed_stats(column, series, kinds)
+        return column, hashes, nulls
+
+
+def _add_parsed_stats(
+    column: ColumnProfile,
+    series: pd.Series,
+    kinds: FrozenSet[str],
+    factorized: Optional[Tuple[np.ndarray, pd.Index]] = None,
+) -> None:
+    if DATE in kinds and pd.api.types.is_datetime64_any_dtype(series.dtype):
+        if column.count:
+            column.datetime = DatetimeStats(column.describe["min"], column.describe["max"], column.missing)
+        kinds = kinds - {DATE}
+    if not kinds:
+        return
+    codes, uniques = factorized if factorized is not None else pd.factorize(series)
+    counts = np.bincount(codes + 1, minlength=len(uniques) + 1)[1:]
+    if DATE in kinds:
+        column.datetime = _datetime_stats(uniques, counts, column.rows)
+    if DURATION in kinds:
+        column.duration = _duration_stats(uniques, counts, column.rows)
+
+
+def _combine_codes(keys: np.ndarray, radix: int, codes: np.ndarray, size: int) -> Tuple[np.ndarray, int]:
+    # Row keys are mixed-radix numbers over the column codes, with nulls as
+    # their own code like in DataFrame.duplicated; they are renumbered
+    # densely before the next column could overflow int64.
+    if radix * size >= 2**63:
+        keys, uniques = pd.factorize(keys)
+        radix = len(uniques)
+    return keys * size + (codes + 1), radix * size
+
+
+def _memory_bytes(series: pd.Series, codes: np.ndarray, uniques: pd.Index, counts: np.ndarray) -> int:
+    # Matches memory_usage(deep=True), but sizes each distinct object once
+    # and weighs it by its count instead of visiting every row, unless most
+    # rows are distinct anyway.
+    is_object = pd.api.types.is_object_dtype(series.dtype) or isinstance(series.dtype, pd.StringDtype)
+    if not is_object or len(uniques) * 4 > len(codes):
+        return int(series.memory_usage(index=False, deep=True))
+    sizes = np.fromiter(map(sys.getsizeof, uniques), dtype=np.int64, count=len(uniques))
+    total = int(series.memory_usage(index=False)) + int(sizes @ counts[1:])
+    if counts[0]:
+        total += sum(map(sys.getsizeof, series.to_numpy()[codes < 0]))
+    return total
+
+
+def _hash_distinct(codes: np.ndarray, uniques) -> np.ndarray:
+    # Hashes each distinct value once; code -1 takes the appended NULL_HASH.
+    hashes = pd.util.hash_pandas_object(pd.Series(uniques), index=False, categorize=False).to_numpy()
+    return np.append(hashes, NULL_HASH).take(codes)
+
+
+def _column_hashes(series: pd.Series, chunk_rows: int = 1_000_000) -> np.ndarray:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return _hash_distinct(series.cat.codes.to_numpy(), series.cat.categories)
+    if not (pd.api.types.is_object_dtype(series.dtype) or isinstance(series.dtype, pd.StringDtype)):
+        return pd.util.hash_pandas_object(series, index=False, categorize=False).to_numpy()
+    # Objects hash far slower than they factorize, so each chunk is
+    # factorized first; chunking keeps the hash table small.
+    hashes = np.empty(len(series), dtype=np.uint64)
+    for start in range(0, len(series), chunk_rows):
+        chunk = series.iloc[start:start + chunk_rows]
+        hashes[start:start + len(chunk)] = _hash_distinct(*pd.factorize(chunk))
+    return hashes
+
+
+def _sampled_memory(series: pd.Series, picked: pd.Series) -> Tuple[int, float]:
+    # Deep memory usage, with object sizes extrapolated from sampled rows.
+    if not (pd.api.types.is_object_dtype(series.dtype) or isinstance(series.dtype, pd.StringDtype)):
+        return int(series.memory_usage(index=False, deep=True)), 0.0
+    if not len(picked):
+        return int(series.memory_usage(index=False)), 0.0
+    sizes = np.fromiter(map(sys.getsizeof, picked.to_numpy()), dtype=np.int64, count=len(picked))
+    total = int(series.memory_usage(index=False) + sizes.mean() * len(series))
+    return total, 1.96 * float(sizes.std()) / math.sqrt(len(sizes)) * len(series)
+
+
+def _top_counts(series: pd.Series, sampled: pd.Series) -> pd.Series:
+    # Exact counts of the values most frequent in the sample, largest first.
+    candidates = sampled.value_counts().index[:TOP_CANDIDATES]
+    if not len(candidates):
+        return pd.Series(dtype=np.int64)
+    counts = series[series.isin(candidates)].value_counts()
+    return counts[counts > 0]
+
+
+def _is_temporal(dtype) -> bool:
+    return pd.api.types.is_datetime64_any_dtype(dtype) or pd.api.types.is_timedelta64_dtype(dtype)
+
+
+def _valid_values(series: pd.Series, present: Optional[np.ndarray]) -> np.ndarray:
+    dtype = series.dtype
+    if isinstance(dtype, pd.api.extensions.ExtensionDtype):
+        values = series.to_numpy(dtype=getattr(dtype, "numpy_dtype", float), na_value=0)
+    else:
+        values = series.to_numpy()
+    return values if present is None else values[present]
+
+
+def _numeric_describe(values: np.ndarray, sampled: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    # Quartiles come from `sampled` when given, everything else from values.
+    stats: Dict[str, Any] = {"count": len(values)}
+    if not len(values):
+        stats.update(dict.fromkeys(["mean", "std", "min", *_QUANTILE_LABELS, "max"], np.nan))
+        return stats
+    quartiles = np.percentile(values if sampled is None else sampled, [q * 100 for q in _QUANTILES])
+    stats["mean"] = values.mean()
+    stats["std"] = values.std(ddof=1) if len(values) > 1 else np.nan
+    stats["min"] = values.min()
+    stats.update(zip(_QUANTILE_LABELS, quartiles))
+    stats["max"] = values.max()
+    return stats
+
+
+def _temporal_describe(valid: pd.Series, sampled: Optional[pd.Series] = None) -> Dict[str, Any]:
+    stats: Dict[str, Any] = {"count": len(valid), "mean": valid.mean()}
+    if pd.api.types.is_timedelta64_dtype(valid.dtype):
+        stats["std"] = valid.std()
+    stats["min"] = valid.min()
+    stats.update(zip(_QUANTILE_LABELS, (valid if sampled is None else sampled).quantile(_QUANTILES)))
+    stats["max"] = valid.max()
+    return stats
+
+
+def _text_stats(uniques: pd.Index, counts: np.ndarray) -> Tuple[List[Tuple[str, int]], Optional[float]]:
+    # Values are compared as text, so 1 and "1" count as the same value.
+    if not len(uniques):
+        return [], None
+    if pd.api.types.infer_dtype(uniques, skipna=True) == "string":
+        labels = np.asarray(uniques, dtype=object)
+    else:
+        text = pd.Series(counts, index=uniques.astype(str)).groupby(level=0, sort=False).sum()
+        labels, counts = text.index.to_numpy(), text.to_numpy()
+    lengths = np.fromiter(map(len, labels), dtype=np.int64, count=len(labels))
+    avg_length = float(lengths @ counts / counts.sum())
+    # Three highest counts, ties in order of first appearance.
+    top = np.flatnonzero(counts >= np.partition(counts, -3)[-3]) if len(counts) > 3 else np.arange(len(counts))
+    top = top[np.argsort(-counts[top], kind="stable")][:3]
+    return [(labels[i], int(counts[i])) for i in top], avg_length
+
+
+def _datetime_stats(uniques: pd.Index, counts: np.ndarray, rows: int) -> Optional[DatetimeStats]:
+    if not len(uniques):
+        return None
+    try:
+        parsed = pd.to_datetime(uniques, errors="coerce", cache=False)
+        if not pd.api.types.is_datetime64_any_dtype(parsed):
+            # Mixed UTC offsets only parse to one dtype when converted to UTC.
+            parsed = pd.to_datetime(uniques, errors="coerce", utc=True, cache=False)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    valid = np.asarray(parsed.notna())
+    if not valid.any():
+        return None
+    dates = parsed[valid]
+    return DatetimeStats(dates.min(), dates.max(), int(rows - counts[valid].sum()))
+
+
+def _duration_stats(uniques: pd.Index, counts: np.ndarray, rows: int) -> Optional[DurationStats]:
+    seconds = parse_durations_to_seconds(pd.Series(uniques)).to_numpy()
+    valid = ~np.isnan(seconds)
+    count = int(counts[valid].sum())
+    if not count or count / rows < DURATION_MIN_RATIO:
+        return None
+    seconds, counts = seconds[valid], counts[valid]
+    return DurationStats(
+        count=count,
+        minimum=float(seconds.min()),
+        maximum=float(seconds.max()),
+        mean=float(seconds @ counts / count),
+        missing=rows - count,
+    )
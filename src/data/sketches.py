@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .frame_cache import FrameCache
+
+
+def hash_values(values: pd.Series) -> np.ndarray:
+    # Numeric values are hashed as float64 and everything else as text, so
+    # equal keys hash alike when the two sides infer different dtypes.
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        values = values.astype("float64")
+    else:
+        values = values.astype(str)
+    return pd.util.hash_pandas_object(values, index=False, categorize=False).to_numpy()
+
+
+class HyperLogLog:
+    # Distinct-count estimate in 2**precision one-byte registers; the
+    # standard error is about 1.04 / sqrt(2**precision) (0.8% by default).
+    def __init__(self, precision: int = 14) -> None:
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, hashes: np.ndarray) -> None:
+        if not len(hashes):
+            return
+        hashes = hashes.astype(np.uint64, copy=False)
+        buckets = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        # Rank = position of the first set bit after the bucket bits, read
+        # from the next 32 bits (exact in float64).
+        rest = ((hashes << np.uint64(self.precision)) >> np.uint64(32)).astype(np.float64)
+        ranks = np.full(len(hashes), 33, dtype=np.uint8)
+        nonzero = rest > 0
+        ranks[nonzero] = 32 - np.floor(np.log2(rest[nonzero])).astype(np.uint8)
+        # Flagging each (bucket, rank) pair and taking the highest flagged
+        # rank per bucket is much faster than np.maximum.at on long inputs.
+        seen = np.zeros((len(self.registers), 34), dtype=bool)
+        seen[buckets, ranks] = True
+        np.maximum(self.registers, (seen * np.arange(34, dtype=np.uint8)).max(axis=1), out=self.registers)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    @property
+    def relative_error(self) -> float:
+        # One standard error, as a fraction of the estimate.
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def count(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int32))))
+        zeros = int((self.registers == 0).sum())
+        if estimate <= 2.5 * m and zeros:
+            return m * np.log(m / zeros)
+        return estimate
+
+
+class BloomFilter:
+    # Set membership in a packed bit array with `probes` bit positions per
+    # item: no false negatives, and false positives at about error_rate
+    # once `capacity` items are in.
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        capacity = max(capacity, 1)
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.probes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def _positions(self, hashes: np.ndarray):
+        # Probe i of an item is h1 + i * h2 (Kirsch-Mitzenmacher).
+        hashes = hashes.astype(np.uint64, copy=False)
+        first = hashes >> np.uint64(32)
+        step = (hashes & np.uint64(0xFFFFFFFF)) | np.uint64(1)
+        size = np.uint64(self.size)
+        for probe in range(self.probes):
+            yield (first + np.uint64(probe) * step) % size
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        found = np.ones(len(hashes), dtype=bool)
+        for positions in self._positions(hashes):
+            shifts = (positions & np.uint64(7)).astype(np.uint8)
+            found &= ((self.bits[positions >> np.uint64(3)] >> shifts) & 1).astype(bool)
+        return found
+
+    def add(self, hashes: np.ndarray) -> None:
+        for positions in self._positions(hashes):
+            offsets = positions >> np.uint64(3)
+            shifts = (positions & np.uint64(7)).astype(np.uint8)
+            # Repeated offsets write the same value for a given bit, so
+            # plain fancy-index assignment is safe one bit at a time.
+            for bit in range(8):
+                self.bits[offsets[shifts == bit]] |= np.uint8(1 << bit)
+        self.count += len(hashes)
+
+    def false_positive_rate(self) -> float:
+        return (1 - math.exp(-self.probes * self.count / self.size)) ** self.probes
+
+
+def count_repeats(hashes: np.ndarray, chunk_rows: int = 1_000_000) -> Tuple[float, float]:
+    # Estimated number of items equal to an earlier one (what
+    # duplicated().sum() counts), with a 95% error bound. Repeats within a
+    # chunk are exact; repeats of earlier chunks are found through a Bloom
+    # filter, whose expected false positives are subtracted.
+    bloom = BloomFilter(len(hashes))
+    repeats = variance = 0.0
+    for start in range(0, len(hashes), chunk_rows):
+        chunk = hashes[start:start + chunk_rows]
+        distinct = pd.unique(chunk)
+        found = bloom.contains(distinct)
+        hits = int(found.sum())
+        rate = bloom.false_positive_rate()
+        repeats += len(chunk) - len(distinct) + max(0.0, (hits - rate * len(distinct)) / (1 - rate))
+        variance += len(distinct) * rate / (1 - rate)
+        # Items found are already in the filter (or all their bits are set).
+        bloom.add(distinct[~found])
+    return repeats, 1.96 * math.sqrt(variance)
+
+
+class MinHash:
+    # Bottom-k MinHash: the k smallest distinct hashes of a set. Two sketches
+    # estimate the Jaccard similarity of their sets from the k smallest
+    # hashes of the union.
+    def __init__(self, k: int = 8192) -> None:
+        self.k = k
+        self.values = np.empty(0, dtype=np.uint64)
+
+    def add(self, hashes: np.ndarray) -> None:
+        candidates = np.concatenate([self.values, hashes.astype(np.uint64, copy=False)])
+        if len(candidates) > 2 * self.k:
+            candidates = np.partition(candidates, 2 * self.k)[: 2 * self.k]
+        self.values = np.unique(candidates)[: self.k]
+
+    def jaccard(self, other: "MinHash") -> float:
+        union = np.union1d(self.values, other.values)[: min(self.k, other.k)]
+        if not len(union):
+            return 0.0
+        both = np.isin(union, self.values, assume_unique=True) & np.isin(
+            union, other.values, assume_unique=True
+        )
+        return float(both.sum()) / len(union)
+
+
+@lru_cache(maxsize=8)
+def _sample_positions(rows: int, size: int) -> np.ndarray:
+    # Shared by every column of a dataset, so they are sketched on the same rows.
+    return np.unique(np.random.default_rng(rows).integers(0, rows, size))
+
+
+@dataclass
+class ColumnSketch:
+    rows: int
+    sampled: int
+    nulls: int
+    # Pairs of sampled rows with the same value.
+    pairs: int
+    distinct: HyperLogLog
+    minhash: MinHash
+
+    SAMPLE_ROWS = 100_000
+
+    @classmethod
+    def build(cls, values: pd.Series, sample_rows: int = SAMPLE_ROWS) -> "ColumnSketch":
+        # Sketches a fixed random sample of rows, so building one costs the
+        # same for a 5M-row column as for a 100k-row one. The sample is
+        # seeded by the row count so that datasets of different lengths do
+        # not draw the same positions.
+        rows = len(values)
+        if rows > sample_rows:
+            values = values.iloc[_sample_positions(rows, sample_rows)]
+        present = values.dropna()
+        hashes = hash_values(present)
+        uniques, counts = np.unique(hashes, return_counts=True)
+        distinct = HyperLogLog()
+        distinct.add(uniques)
+        minhash = MinHash()
+        minhash.add(uniques)
+        return cls(
+            rows=rows,
+            sampled=len(values),
+            nulls=len(values) - len(present),
+            pairs=int((counts * (counts - 1) // 2).sum()),
+            distinct=distinct,
+            minhash=minhash,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return self.distinct.registers.nbytes + self.minhash.values.nbytes
+
+    @property
+    def sample_fraction(self) -> float:
+        return self.sampled / self.rows if self.rows else 1.0
+
+    def distinct_count(self) -> float:
+        # Distinct non-null values in the sample, never more than it holds.
+        return min(self.distinct.count(), float(self.sampled - self.nulls))
+
+    def multiplicity(self) -> float:
+        # Average rows per distinct value in the whole column. A sample of
+        # fraction f keeps about f**2 of the column's equal-value row pairs,
+        # which shows repeats that are too sparse to collide in the sample
+        # as distinct values; m rows per value give m - 1 = 2 * pairs / rows.
+        present = self.sampled - self.nulls
+        if not present:
+            return 1.0
+        pairs = self.pairs / self.sample_fraction**2
+        return 1 + 2 * pairs / (present / self.sample_fraction)
+
+    def uniqueness(self) -> float:
+        # Distinct non-null values per row: 1.0 for a clean key column, near
+        # 0 for a low-cardinality one.
+        if not self.sampled:
+            return 0.0
+        return (1 - self.nulls / self.sampled) / self.multiplicity()
+
+    def containment(self, other: "ColumnSketch") -> float:
+        # Estimated share of this column's distinct values that also occur
+        # in `other`. Both sides are row samples, so a shared value only
+        # shows up in other's sample with the chance that one of its rows
+        # was drawn there; the sampled intersection is scaled back by it.
+        mine, theirs = self.distinct_count(), other.distinct_count()
+        if not mine or not theirs:
+            return 0.0
+        similarity = self.minhash.jaccard(other.minhash)
+        shared = similarity * (mine + theirs) / (1 + similarity)
+        seen = 1 - (1 - other.sample_fraction) ** other.multiplicity()
+        return float(min(1.0, shared / (mine * seen)))
+
+
+class ColumnSketchCache(FrameCache):
+    DEFAULT_MAX_BYTES = 64 * 1024**2
+
+    def get(self, df: pd.DataFrame, column: Hashable) -> Optional[ColumnSketch]:
+        return self._lookup(df, column)
+
+    def get_or_build(self, df: pd.DataFrame, column: Hashable) -> ColumnSketch:
+        sketch = self.get(df, column)
+        if sketch is None:
+            sketch = ColumnSketch.build(df[column])
+            self._store(df, column, sketch, sketch.nbytes)
+        return sketch
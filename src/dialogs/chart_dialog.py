@@ -3,7 +3,6 @@ import re
 from datetime import datetime
 
 import matplotlib.pyplot as plt
-import numpy as np
 import pandas as pd
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
@@ -17,6 +16,8 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtWidgets import QLabel as QtLabel
 
+from ..data.durations import parse_durations_to_seconds
+
 
 class chartwindow(QDialog):
     def __init__(self, df, parent=None):
@@ -104,50 +105,6 @@ class chartwindow(QDialog):
             return pd.to_datetime(val, errors='coerce')
         except:
             return pd.NaT
-    def parse_duration_to_seconds(self, value):
-        if pd.isna(value):
-            return np.nan
-        if isinstance(value, (int, float)):
-            return float(value)
-        if isinstance(value, (pd.Timedelta, np.timedelta64)):
-            return pd.to_timedelta(value).total_seconds()
-
-        text = str(value).strip().lower()
-        if not text:
-            return np.nan
-
-        if re.fullmatch(r"\d+:\d+(:\d+)?", text):
-            parts = [int(p) for p in text.split(":")]
-            if len(parts) == 2:
-                minutes, seconds = parts
-                return minutes * 60 + seconds
-            if len(parts) == 3:
-                hours, minutes, seconds = parts
-                return hours * 3600 + minutes * 60 + seconds
-
-        total_seconds = 0.0
-        found = False
-        pattern = re.compile(r"(\d+(?:\.\d+)?)\s*(days?|day|d|hours?|hour|h|minutes?|minute|mins?|min|m|seconds?|second|secs?|sec|s)")
-        for match in pattern.finditer(text):
-            found = True
-            value_num = float(match.group(1))
-            unit = match.group(2)
-            if unit.startswith("d"):
-                total_seconds += value_num * 86400
-            elif unit.startswith("h"):
-                total_seconds += value_num * 3600
-            elif unit.startswith("m") and not unit.startswith("sec"):
-                total_seconds += value_num * 60
-            else:
-                total_seconds += value_num
-        if found:
-            return total_seconds
-
-        try:
-            td = pd.to_timedelta(text, errors="raise")
-            return td.total_seconds()
-        except:
-            return np.nan
     def update_chart_options(self):
         chart_type = self.chart_type_combo.currentText()
 
@@ -249,7 +206,7 @@ class chartwindow(QDialog):
     def create_histogram(self, ax, x_col):
         series = self.df[x_col].dropna()
         if self.get_column_type(x_col) == "duration":
-            values = series.apply(self.parse_duration_to_seconds).dropna()
+            values = parse_durations_to_seconds(series).dropna()
             ax.hist(values, bins=30, edgecolor='black')
             ax.set_xlabel(f"{x_col} (seconds)")
         else:
@@ -261,7 +218,7 @@ class chartwindow(QDialog):
 
     def create_bar_chart(self, ax, x_col, y_col):
         if self.get_column_type(y_col) == "duration":
-            grouped = self.df.groupby(x_col)[y_col].apply(lambda x: self.parse_duration_to_seconds(x).mean())
+            grouped = parse_durations_to_seconds(self.df[y_col]).groupby(self.df[x_col]).mean()
         else:
             grouped = self.df.groupby(x_col)[y_col].mean()
         ax.bar(range(len(grouped)), grouped.values, edgecolor='black')
@@ -282,9 +239,9 @@ class chartwindow(QDialog):
         y_values = self.df[y_col]
 
         if self.get_column_type(x_col) == "duration":
-            x_values = x_values.apply(self.parse_duration_to_seconds)
+            x_values = parse_durations_to_seconds(x_values)
         if self.get_column_type(y_col) == "duration":
-            y_values = y_values.apply(self.parse_duration_to_seconds)
+            y_values = parse_durations_to_seconds(y_values)
 
         mask = x_values.notna() & y_values.notna()
         ax.scatter(x_values[mask], y_values[mask], alpha=0.6, edgecolors='black', linewidth=0.5)
@@ -299,7 +256,7 @@ class chartwindow(QDialog):
         y_series = df_sorted[y_col]
 
         if self.get_column_type(y_col) == "duration":
-            y_series = y_series.apply(self.parse_duration_to_seconds)
+            y_series = parse_durations_to_seconds(y_series)
 
         mask = x_series.notna() & y_series.notna()
         ax.plot(x_series[mask], y_series[mask], marker='o', linestyle='-', linewidth=2, markersize=4)
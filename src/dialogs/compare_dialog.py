@@ -1,6 +1,7 @@
 
 from __future__ import annotations
 
+from PyQt5.QtCore import QThread, QTimer, pyqtSignal
 from PyQt5.QtWidgets import (
     QDialog,
     QFormLayout,
@@ -8,19 +9,70 @@ from PyQt5.QtWidgets import (
     QLabel,
     QComboBox,
     QLineEdit,
+    QProgressBar,
     QPushButton,
     QTextEdit,
     QVBoxLayout,
 )
 
-from ..data.compare_engine import CompareEngine
+from ..data.compare_engine import CompareCancelled, CompareEngine
+
+SECTION_ORDER = ("structure", "rows", "cells", "stats", "summary")
+
+
+class CompareThread(QThread):
+    section = pyqtSignal(str, object)
+    progress = pyqtSignal(int, int)
+    completed = pyqtSignal(object)
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, left, right, key_columns=None, key_hashes=None):
+        super().__init__()
+        self.left = left
+        self.right = right
+        self.key_columns = key_columns
+        self.engine = CompareEngine(key_hashes=key_hashes)
+        self.total_stages = 4 if key_columns else 2
+        self._done = 0
+
+    def run(self):
+        try:
+            report = self.engine.full_compare(
+                self.left,
+                self.right,
+                key_columns=self.key_columns,
+                on_section=self._on_section,
+                is_cancelled=self.isInterruptionRequested,
+            )
+            self.completed.emit(report)
+        except CompareCancelled:
+            self.cancelled.emit()
+        except MemoryError:
+            self.error.emit("Not enough memory to compare these datasets.")
+        except Exception as e:
+            self.error.emit(str(e))
+
+    def _on_section(self, name, result):
+        self._done += 1
+        self.section.emit(name, result)
+        self.progress.emit(self._done, self.total_stages)
 
 
 class CompareDialog(QDialog):
 
-    def __init__(self, datasets: dict, parent=None):
+    # Threads whose dialog moved on (new selection or closed) are kept
+    # referenced here until they wind down, so closing never blocks on a
+    # running comparison.
+    _abandoned_threads = set()
+
+    def __init__(self, datasets: dict, parent=None, key_hashes=None):
         super().__init__(parent)
         self.datasets = datasets
+        self.key_hashes = key_hashes
+        self.compare_thread = None
+        self.key_timer = None
+        self.sections = {}
         self.setWindowTitle("Compare Datasets")
         self.resize(560, 480)
         self._build_ui()
@@ -47,9 +99,16 @@ class CompareDialog(QDialog):
         form.addRow("Right dataset:", self.right_combo)
 
         self.key_edit = QLineEdit()
-        self.key_edit.setPlaceholderText("Optional: column name for row/cell comparison")
-        self.key_edit.textChanged.connect(self._run_compare)
-        form.addRow("Key column:", self.key_edit)
+        self.key_edit.setPlaceholderText(
+            "Optional: key column(s) for row/cell comparison, comma-separated"
+        )
+        # Typing a key restarts the comparison, so wait for a short pause.
+        self.key_timer = QTimer(self)
+        self.key_timer.setSingleShot(True)
+        self.key_timer.setInterval(400)
+        self.key_timer.timeout.connect(self._run_compare)
+        self.key_edit.textChanged.connect(self.key_timer.start)
+        form.addRow("Key column(s):", self.key_edit)
 
         layout.addLayout(form)
 
@@ -59,8 +118,21 @@ class CompareDialog(QDialog):
         layout.addWidget(QLabel("Comparison Report:"))
         layout.addWidget(self.report_text)
 
+        progress_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.hide()
+        progress_layout.addWidget(self.progress_bar)
+        self.status_label = QLabel("")
+        progress_layout.addWidget(self.status_label)
+        layout.addLayout(progress_layout)
+
         btn_layout = QHBoxLayout()
         btn_layout.addStretch()
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self._cancel_compare)
+        btn_layout.addWidget(self.cancel_btn)
         close_btn = QPushButton("Close")
         close_btn.clicked.connect(self.accept)
         btn_layout.addWidget(close_btn)
@@ -69,6 +141,8 @@ class CompareDialog(QDialog):
         self._run_compare()
 
     def _run_compare(self):
+        self._stop_thread()
+        self.sections = {}
         left_name = self.left_combo.currentText()
         right_name = self.right_combo.currentText()
         if left_name == right_name:
@@ -79,13 +153,90 @@ class CompareDialog(QDialog):
 
         df1 = self.datasets[left_name]
         df2 = self.datasets[right_name]
-        key = self.key_edit.text().strip() or None
+        key = [k.strip() for k in self.key_edit.text().split(",") if k.strip()] or None
+
+        self.compare_thread = CompareThread(df1, df2, key, self.key_hashes)
+        self.compare_thread.section.connect(self._on_section)
+        self.compare_thread.progress.connect(self._on_progress)
+        self.compare_thread.completed.connect(self._on_completed)
+        self.compare_thread.error.connect(self._on_error)
+        self.compare_thread.cancelled.connect(self._on_cancelled)
+        self.progress_bar.setRange(0, self.compare_thread.total_stages)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.status_label.setText("Comparing...")
+        self.cancel_btn.setEnabled(True)
+        self.report_text.setPlainText("Comparing...")
+        self.compare_thread.start()
+
+    def _stop_thread(self):
+        thread = self.compare_thread
+        self.compare_thread = None
+        if thread is None:
+            return
+        for signal in (thread.section, thread.progress, thread.completed, thread.error, thread.cancelled):
+            signal.disconnect()
+        if thread.isRunning():
+            thread.requestInterruption()
+            CompareDialog._abandoned_threads.add(thread)
+            thread.finished.connect(lambda: CompareDialog._abandoned_threads.discard(thread))
+
+    def _cancel_compare(self):
+        if self.compare_thread is not None and self.compare_thread.isRunning():
+            self.compare_thread.requestInterruption()
+            self.cancel_btn.setEnabled(False)
+            self.status_label.setText("Cancelling...")
 
-        engine = CompareEngine()
-        report = engine.full_compare(df1, df2, key_columns=key)
+    def done(self, result):
+        self._stop_thread()
+        if self.key_timer is not None:
+            self.key_timer.stop()
+        super().done(result)
 
+    def _on_progress(self, done, total):
+        self.progress_bar.setValue(done)
+
+    def _on_section(self, name, result):
+        if name == "structure":
+            self.sections[name] = self._structure_lines(result)
+        elif name == "rows":
+            self.sections[name] = self._row_lines(result)
+        elif name == "cells":
+            self.sections[name] = self._cell_lines(result)
+        elif name == "stats":
+            self.sections[name] = self._stats_lines(result)
+        self._render()
+
+    def _on_completed(self, report):
+        self.sections["summary"] = [
+            "",
+            "=== Summary (plain English) ===",
+            self.compare_thread.engine.explain_differences_plain_english(report),
+        ]
+        self._finish("")
+        self._render()
+
+    def _on_error(self, message):
+        self._finish(f"Comparison failed: {message}")
+
+    def _on_cancelled(self):
+        self._finish("Comparison cancelled")
+        self._render()
+
+    def _finish(self, status):
+        self.progress_bar.hide()
+        self.cancel_btn.setEnabled(False)
+        self.status_label.setText(status)
+
+    def _render(self):
+        lines = []
+        for name in SECTION_ORDER:
+            lines.extend(self.sections.get(name, []))
+        self.report_text.setPlainText("\n".join(lines))
+
+    @staticmethod
+    def _structure_lines(s):
         lines = []
-        s = report.structure
         lines.append(f"=== Structure ===")
         lines.append(f"Left: {s.rows_left} rows, {s.cols_left} columns")
         lines.append(f"Right: {s.rows_right} rows, {s.cols_right} columns")
@@ -96,23 +247,38 @@ class CompareDialog(QDialog):
         if s.dtype_mismatches:
             for m in s.dtype_mismatches:
                 lines.append(f"Dtype mismatch: {m['column']} ({m['left_dtype']} vs {m['right_dtype']})")
+        return lines
 
-        if report.row_comparison:
-            r = report.row_comparison
-            lines.append("")
-            lines.append("=== Row comparison ===")
-            lines.append(f"Only in left: {r.total_only_left} | Only in right: {r.total_only_right}")
-            lines.append(f"In both: {r.total_in_both} (differing: {r.total_differing})")
+    @staticmethod
+    def _row_lines(r):
+        return [
+            "",
+            "=== Row comparison ===",
+            f"Only in left: {r.total_only_left} | Only in right: {r.total_only_right}",
+            f"In both: {r.total_in_both} (differing: {r.total_differing})",
+        ]
 
-        if report.cell_comparison and report.cell_comparison.total_differences > 0:
-            c = report.cell_comparison
-            lines.append("")
-            lines.append("=== Cell differences ===")
-            lines.append(f"Total: {c.total_differences}")
-            lines.append(f"By column: {c.column_diff_counts}")
+    @staticmethod
+    def _cell_lines(c):
+        if c.total_differences <= 0:
+            return []
+        return [
+            "",
+            "=== Cell differences ===",
+            f"Total: {c.total_differences}",
+            f"By column: {c.column_diff_counts}",
+        ]
 
-        lines.append("")
-        lines.append("=== Summary (plain English) ===")
-        lines.append(engine.explain_differences_plain_english(report))
-
-        self.report_text.setPlainText("\n".join(lines))
+    @staticmethod
+    def _stats_lines(st):
+        null_changes = {c: d["diff"] for c, d in st.null_differences.items() if d["diff"] != 0}
+        if not null_changes and not st.stats_differences:
+            return []
+        lines = ["", "=== Summary statistics ==="]
+        if null_changes:
+            lines.append(f"Null count changes: {null_changes}")
+        for d in st.stats_differences[:20]:
+            lines.append(f"{d['column']} {d['statistic']}: {d['left_value']} -> {d['right_value']}")
+        if len(st.stats_differences) > 20:
+            lines.append(f"... and {len(st.stats_differences) - 20} more")
+        return lines
@@ -2,30 +2,98 @@
 from __future__ import annotations
 
 import pandas as pd
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from PyQt5.QtWidgets import (
     QDialog,
+    QFileDialog,
     QFormLayout,
     QHBoxLayout,
     QLabel,
     QComboBox,
     QLineEdit,
+    QListWidget,
+    QAbstractItemView,
     QMessageBox,
+    QProgressBar,
     QPushButton,
     QVBoxLayout,
 )
 
-from ..data.merge_engine import MergeEngine
+from ..data.merge_engine import MergeCancelled, MergeEngine
+
+
+class MergeThread(QThread):
+    progress = pyqtSignal(str, int, int)
+    completed = pyqtSignal(object)
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(
+        self, engine, left, right, key, how, max_result_bytes=None, strategy="auto", output_path=None
+    ):
+        super().__init__()
+        self.engine = engine
+        self.strategy = strategy
+        self.output_path = output_path
+        self.left = left
+        self.right = right
+        self.key = key
+        self.how = how
+        self.max_result_bytes = max_result_bytes
+
+    def run(self):
+        try:
+            result = self.engine.merge(
+                self.left,
+                self.right,
+                on=self.key,
+                how=self.how,
+                validate=True,
+                max_result_bytes=self.max_result_bytes,
+                progress=self.progress.emit,
+                is_cancelled=self.isInterruptionRequested,
+                strategy=self.strategy,
+                output_path=self.output_path,
+            )
+            if self.isInterruptionRequested():
+                raise MergeCancelled()
+            self.completed.emit(result)
+        except MergeCancelled:
+            self.cancelled.emit()
+        except MemoryError:
+            self.error.emit("Not enough memory to complete this merge.")
+        except Exception as e:
+            self.error.emit(str(e))
 
 
 class MergeDialog(QDialog):
 
-    def __init__(self, datasets: dict, parent=None):
+    # Joins whose estimated result exceeds this ask for confirmation first.
+    MAX_RESULT_BYTES = 2 * 1024**3
+
+    # Threads left running by a closed dialog stay referenced until they exit.
+    _abandoned_threads = set()
+
+    STRATEGIES = [
+        ("Auto", "auto"),
+        ("Hash join", "hash"),
+        ("Sorted merge-join", "sorted"),
+        ("Indexed (cache right key index)", "indexed"),
+        ("Partitioned (out-of-core, writes CSV)", "partitioned"),
+    ]
+
+    def __init__(self, datasets: dict, parent=None, key_indexes=None, sketches=None, key_hashes=None):
         super().__init__(parent)
         self.datasets = datasets
         self.result_df = None
         self.result_name = None
+        # Set instead of result_df when a partitioned join wrote a CSV file.
+        self.result_path = None
+        self.merge_thread = None
+        self.pending_name = None
+        self.engine = MergeEngine(key_indexes=key_indexes, sketches=sketches, key_hashes=key_hashes)
         self.setWindowTitle("Merge Datasets")
-        self.resize(420, 280)
+        self.resize(420, 380)
         self._build_ui()
 
     def _build_ui(self):
@@ -52,35 +120,50 @@ class MergeDialog(QDialog):
         self.mode_combo.currentIndexChanged.connect(self._on_mode_changed)
         form.addRow("Mode:", self.mode_combo)
 
-        self.key_combo = QComboBox()
-        self.key_combo.setEnabled(False)
-        form.addRow("Join key:", self.key_combo)
+        # Selecting several columns joins on the composite key.
+        self.key_list = QListWidget()
+        self.key_list.setSelectionMode(QAbstractItemView.MultiSelection)
+        self.key_list.setMaximumHeight(110)
+        self.key_list.setEnabled(False)
+        form.addRow("Join key(s):", self.key_list)
+
+        self.strategy_combo = QComboBox()
+        self.strategy_combo.addItems([label for label, _ in self.STRATEGIES])
+        self.strategy_combo.setEnabled(False)
+        form.addRow("Join strategy:", self.strategy_combo)
 
         self.name_edit = QLineEdit()
         self.name_edit.setPlaceholderText("Merged_left_right")
         form.addRow("Output name:", self.name_edit)
 
         layout.addLayout(form)
-        self._update_key_combo()
+        self._update_key_list()
+
+        self.left_combo.currentIndexChanged.connect(self._update_key_list)
+        self.right_combo.currentIndexChanged.connect(self._update_key_list)
 
-        self.left_combo.currentIndexChanged.connect(self._update_key_combo)
-        self.right_combo.currentIndexChanged.connect(self._update_key_combo)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.hide()
+        layout.addWidget(self.progress_bar)
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
 
         btn_layout = QHBoxLayout()
         btn_layout.addStretch()
-        ok_btn = QPushButton("Merge")
-        ok_btn.clicked.connect(self._do_merge)
+        self.ok_btn = QPushButton("Merge")
+        self.ok_btn.clicked.connect(self._do_merge)
         cancel_btn = QPushButton("Cancel")
-        cancel_btn.clicked.connect(self.reject)
-        btn_layout.addWidget(ok_btn)
+        cancel_btn.clicked.connect(self._on_cancel_clicked)
+        btn_layout.addWidget(self.ok_btn)
         btn_layout.addWidget(cancel_btn)
         layout.addLayout(btn_layout)
 
     def _on_mode_changed(self):
         is_join = self.mode_combo.currentIndex() > 0
-        self.key_combo.setEnabled(is_join)
+        self.key_list.setEnabled(is_join)
+        self.strategy_combo.setEnabled(is_join)
 
-    def _update_key_combo(self):
+    def _update_key_list(self):
         left_name = self.left_combo.currentText()
         right_name = self.right_combo.currentText()
         if left_name not in self.datasets or right_name not in self.datasets:
@@ -88,16 +171,13 @@ class MergeDialog(QDialog):
         df1 = self.datasets[left_name]
         df2 = self.datasets[right_name]
         common = list(set(df1.columns) & set(df2.columns))
-        self.key_combo.clear()
-        self.key_combo.addItems([""] + sorted(common))
-        # Suggest best key
-        engine = MergeEngine()
-        suggestions = engine.suggest_join_keys(df1, df2, max_candidates=1)
-        if suggestions:
-            best = suggestions[0][0][0]
-            idx = self.key_combo.findText(best)
-            if idx >= 0:
-                self.key_combo.setCurrentIndex(idx)
+        self.key_list.clear()
+        self.key_list.addItems(sorted(common))
+        # Suggest best key, unless no shared column has overlapping values
+        suggestions = self.engine.suggest_join_keys(df1, df2, max_candidates=1)
+        if suggestions and suggestions[0][1] > 0:
+            for item in self.key_list.findItems(suggestions[0][0][0], Qt.MatchExactly):
+                item.setSelected(True)
 
     def _do_merge(self):
         left_name = self.left_combo.currentText()
@@ -115,24 +195,123 @@ class MergeDialog(QDialog):
             return
 
         # Join
-        key = self.key_combo.currentText()
+        key = [item.text() for item in self.key_list.selectedItems()]
         if not key:
-            QMessageBox.warning(self, "Merge", "Select a join key for join mode.")
+            QMessageBox.warning(self, "Merge", "Select one or more join key columns for join mode.")
             return
 
         how_map = ["inner", "left", "right", "outer"]
         how = how_map[mode_idx - 1]
 
-        engine = MergeEngine()
-        result = engine.merge(df1, df2, on=key, how=how, validate=True)
+        self.pending_name = out_name
+        strategy = self.STRATEGIES[self.strategy_combo.currentIndex()][1]
+        output_path = None
+        if strategy == "partitioned":
+            output_path = self._ask_output_path(out_name)
+            if not output_path:
+                return
+        self._start_merge(df1, df2, key, how, self.MAX_RESULT_BYTES, strategy, output_path)
+
+    def _ask_output_path(self, name):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save merged dataset", f"{name}.csv", "CSV Files (*.csv)"
+        )
+        return path
+
+    def _start_merge(self, df1, df2, key, how, max_result_bytes, strategy, output_path=None):
+        self.merge_thread = MergeThread(
+            self.engine, df1, df2, key, how, max_result_bytes, strategy, output_path
+        )
+        self.merge_thread.progress.connect(self._on_merge_progress)
+        self.merge_thread.completed.connect(self._on_merge_completed)
+        self.merge_thread.error.connect(self._on_merge_error)
+        self.merge_thread.cancelled.connect(self._on_merge_cancelled)
+        self._set_running(True)
+        self.status_label.setText("Starting merge...")
+        self.merge_thread.start()
+
+    def _set_running(self, running):
+        self.ok_btn.setEnabled(not running)
+        self.progress_bar.setVisible(running)
+        self.progress_bar.setValue(0)
+        if not running:
+            self.status_label.setText("")
+
+    def _on_merge_progress(self, stage, done, total):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+        self.status_label.setText(f"{stage}...")
+
+    def _on_cancel_clicked(self):
+        if self.merge_thread is not None and self.merge_thread.isRunning():
+            self.merge_thread.requestInterruption()
+            self.status_label.setText("Cancelling (the current step has to finish first)...")
+            return
+        self.reject()
+
+    def _on_merge_cancelled(self):
+        self.merge_thread = None
+        self._set_running(False)
+        self.status_label.setText("Merge cancelled")
+
+    def _on_merge_error(self, message):
+        self.merge_thread = None
+        self._set_running(False)
+        QMessageBox.warning(self, "Merge", message)
+
+    def _on_merge_completed(self, result):
+        thread = self.merge_thread
+        self.merge_thread = None
+        self._set_running(False)
+        summary = result.summary
+
+        if (
+            not result.success
+            and thread.max_result_bytes is not None
+            and summary.estimated_bytes is not None
+            and summary.estimated_bytes > thread.max_result_bytes
+        ):
+            answer = QMessageBox.question(
+                self,
+                "Merge",
+                f"This join is estimated to produce {summary.estimated_rows:,} rows "
+                f"(about {summary.estimated_bytes / 1024**3:.1f} GB), which usually means "
+                "the key has many duplicates on both sides.\n\nMerge anyway, or Save "
+                "to write the result to a CSV file without holding it in memory?",
+                QMessageBox.Yes | QMessageBox.Save | QMessageBox.No,
+                QMessageBox.No,
+            )
+            args = (thread.left, thread.right, thread.key, thread.how, None)
+            if answer == QMessageBox.Yes:
+                self._start_merge(*args, thread.strategy)
+            elif answer == QMessageBox.Save:
+                output_path = self._ask_output_path(self.pending_name)
+                if output_path:
+                    self._start_merge(*args, "partitioned", output_path)
+            return
 
         if not result.success:
             msg = result.error or "Merge failed."
-            if result.summary.validation_warnings:
-                msg += "\n\n" + "\n".join(result.summary.validation_warnings)
+            if summary.validation_warnings:
+                msg += "\n\n" + "\n".join(summary.validation_warnings)
             QMessageBox.warning(self, "Merge", msg)
             return
 
-        self.result_df = result.merged_df
-        self.result_name = out_name
+        if result.output_path is not None:
+            self.result_path = result.output_path
+        else:
+            self.result_df = result.merged_df
+        self.result_name = self.pending_name
         self.accept()
+
+    def done(self, result):
+        thread = self.merge_thread
+        self.merge_thread = None
+        if thread is not None:
+            for signal in (thread.progress, thread.completed, thread.error, thread.cancelled):
+                signal.disconnect()
+        if thread is not None and thread.isRunning():
+            thread.requestInterruption()
+            MergeDialog._abandoned_threads.add(thread)
+            thread.finished.connect(lambda: MergeDialog._abandoned_threads.discard(thread))
+        super().done(result)
@@ -2,11 +2,9 @@
 
 from __future__ import annotations
 
-import re
-
 import numpy as np
 import pandas as pd
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from PyQt5.QtWidgets import (
     QDialog,
     QVBoxLayout,
@@ -19,14 +17,62 @@ from PyQt5.QtWidgets import (
     QFileDialog,
     QMessageBox,
     QApplication,
+    QLabel,
+    QProgressBar,
 )
 
+from ..data.profiler import ProfileCancelled, ProfileEngine
+
+
+class SummaryThread(QThread):
+    section = pyqtSignal(str, object)
+    progress = pyqtSignal(int, int)
+    completed = pyqtSignal(object)
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, df, kinds=None, approximate_rows=None, profiles=None):
+        super().__init__()
+        self.df = df
+        self.engine = ProfileEngine(kinds=kinds, approximate_rows=approximate_rows, profiles=profiles)
+
+    def run(self):
+        try:
+            profile = self.engine.profile(
+                self.df,
+                on_section=self.section.emit,
+                progress=self.progress.emit,
+                is_cancelled=self.isInterruptionRequested,
+            )
+            self.completed.emit(profile)
+        except ProfileCancelled:
+            self.cancelled.emit()
+        except MemoryError:
+            self.error.emit("Not enough memory to summarize this dataset.")
+        except Exception as e:
+            self.error.emit(str(e))
+
 
 class SummaryWindow(QDialog):
-    def __init__(self, df, parent=None):
+
+    # Tabs in display order, keyed by the profile section that fills them.
+    TABS = [
+        ("overview", "📊 Overview"),
+        ("numeric", "🔢 Numeric Data"),
+        ("text", "📝 Text Data"),
+        ("datetime", "📅 Date/Time Data"),
+        ("duration", "⏱️ Duration Data"),
+        ("statistics", "📈 Full Statistics"),
+    ]
+
+    # Threads left running by a closed window stay referenced until they exit.
+    _abandoned_threads = set()
+
+    def __init__(self, df, parent=None, kinds=None, approximate_rows=None, profiles=None):
         super().__init__(parent)
-        self.df = df.copy()
+        self.profile = None
         self.summary_frames = {}
+        self.tab_ranks = []
 
         self.setWindowTitle("Dataset Summary")
         self.resize(900, 620)
@@ -35,46 +81,102 @@ class SummaryWindow(QDialog):
         self.tab_widget = QTabWidget()
         main_layout.addWidget(self.tab_widget)
 
-        self._build_tabs()
+        progress_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setTextVisible(False)
+        progress_layout.addWidget(self.progress_bar)
+        self.status_label = QLabel("Profiling...")
+        progress_layout.addWidget(self.status_label)
+        main_layout.addLayout(progress_layout)
 
         button_bar = QHBoxLayout()
         button_bar.addStretch()
         self.export_button = QPushButton("Export to CSV")
         self.copy_button = QPushButton("Copy to Clipboard")
+        self.cancel_button = QPushButton("Cancel")
         self.close_button = QPushButton("Close")
         button_bar.addWidget(self.export_button)
         button_bar.addWidget(self.copy_button)
+        button_bar.addWidget(self.cancel_button)
         button_bar.addWidget(self.close_button)
         main_layout.addLayout(button_bar)
 
         self.export_button.clicked.connect(self.export_to_csv)
         self.copy_button.clicked.connect(self.copy_to_clipboard)
+        self.cancel_button.clicked.connect(self._cancel_profile)
         self.close_button.clicked.connect(self.accept)
 
-    def _build_tabs(self):
-        overview_df = self._overview_stats()
-        if not overview_df.empty:
-            self._add_table_tab("📊 Overview", overview_df)
-        numeric_df = self._numeric_summary()
-        if numeric_df is not None:
-            self._add_table_tab("🔢 Numeric Data", numeric_df)
-        cat_df = self._categorical_summary()
-        if cat_df is not None:
-            self._add_table_tab("📝 Text Data", cat_df)
-        dt_df = self._datetime_summary()
-        if dt_df is not None:
-            self._add_table_tab("📅 Date/Time Data", dt_df)
-        dur_df = self._duration_summary()
-        if dur_df is not None:
-            self._add_table_tab("⏱️ Duration Data", dur_df)
-        desc = self.df.describe(include='all').transpose()
-        if not desc.empty:
-            self._add_table_tab("📈 Full Statistics", desc)
+        self.summary_thread = SummaryThread(df, kinds, approximate_rows, profiles)
+        self.summary_thread.section.connect(self._on_section)
+        self.summary_thread.progress.connect(self._on_progress)
+        self.summary_thread.completed.connect(self._on_completed)
+        self.summary_thread.error.connect(self._on_error)
+        self.summary_thread.cancelled.connect(self._on_cancelled)
+        self.summary_thread.start()
+
+    def _on_section(self, name, result):
+        if name == "overview":
+            self.profile = result
+            frame = self._overview_stats()
+        elif name == "numeric":
+            frame = self._numeric_summary(result)
+        elif name == "text":
+            frame = self._categorical_summary(result)
+        elif name == "datetime":
+            frame = self._datetime_summary(result)
+        elif name == "duration":
+            frame = self._duration_summary(result)
+        elif name == "statistics":
+            frame = self._full_statistics(result)
+        else:
+            frame = result
+        if frame is not None and not frame.empty:
+            self._add_table_tab(dict(self.TABS)[name], frame, name)
+
+    def _on_progress(self, done, total):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+        self.status_label.setText(f"Profiling... {done} of {total} columns")
+
+    def _on_completed(self, profile):
+        self.profile = profile
+        self._finish("")
         if self.tab_widget.count() == 0:
             fallback = pd.DataFrame({"Message": ["No data to summarize."]})
             self._add_table_tab("Summary", fallback)
-    
+
+    def _on_error(self, message):
+        self._finish(f"Summary failed: {message}")
+
+    def _on_cancelled(self):
+        self._finish("Summary cancelled")
+
+    def _finish(self, status):
+        self.progress_bar.hide()
+        self.cancel_button.setEnabled(False)
+        self.status_label.setText(status)
+
+    def _cancel_profile(self):
+        if self.summary_thread is not None and self.summary_thread.isRunning():
+            self.summary_thread.requestInterruption()
+            self.cancel_button.setEnabled(False)
+            self.status_label.setText("Cancelling (the current column has to finish first)...")
+
+    def done(self, result):
+        thread = self.summary_thread
+        self.summary_thread = None
+        if thread is not None:
+            for signal in (thread.section, thread.progress, thread.completed, thread.error, thread.cancelled):
+                signal.disconnect()
+        if thread is not None and thread.isRunning():
+            thread.requestInterruption()
+            SummaryWindow._abandoned_threads.add(thread)
+            thread.finished.connect(lambda: SummaryWindow._abandoned_threads.discard(thread))
+        super().done(result)
+
     def _overview_stats(self):
+        profile = self.profile
+        cells = profile.rows * len(profile.columns)
         data = {
             "Metric": [
                 "Total Rows",
@@ -85,17 +187,49 @@ class SummaryWindow(QDialog):
                 "Complete Rows"
             ],
             "Value": [
-                str(len(self.df)),
-                str(len(self.df.columns)),
-                f"{self.df.memory_usage(deep=True).sum() / 1024:.2f} KB",
-                f"{(self.df.isna().sum().sum() / (len(self.df) * len(self.df.columns)) * 100):.2f}%",
-                str(self.df.duplicated().sum()),
-                str(len(self.df.dropna()))
+                str(profile.rows),
+                str(len(profile.columns)),
+                self._with_error(f"{profile.memory_bytes / 1024:.2f} KB", profile.errors, "memory_bytes", 1024, " KB"),
+                f"{(profile.missing_cells / cells * 100) if cells else float('nan'):.2f}%",
+                self._with_error(str(profile.duplicate_rows), profile.errors, "duplicate_rows"),
+                str(profile.complete_rows)
             ]
         }
+        if profile.approximate:
+            data["Metric"].append("Statistics")
+            data["Value"].append("Approximate (± are 95% error bounds)")
         return pd.DataFrame(data)
 
-    def _add_table_tab(self, title, df):
+    def _full_statistics(self, profile):
+        stats = profile.describe()
+        if not profile.approximate:
+            return stats
+        for row, col in enumerate(profile.columns):
+            for label in ("unique", *col.errors):
+                if label not in stats.columns:
+                    continue
+                position = stats.columns.get_loc(label)
+                value = stats.iat[row, position]
+                if not pd.isna(value):
+                    key = "distinct" if label == "unique" else label
+                    stats.iat[row, position] = self._with_error(value, col.errors, key)
+        return stats
+
+    def _with_error(self, value, errors, key, scale=1, unit=""):
+        # Appends the 95% error bound of an approximate statistic; quartile
+        # bounds are a fraction of rank rather than of value.
+        if key not in errors or value == "":
+            return value
+        if key.endswith("%"):
+            return f"{value} (±{errors[key] * 100:.2f}% rank)"
+        return f"{value} (±{self._format_number(errors[key] / scale)}{unit})"
+
+    def _add_table_tab(self, title, df, section=None):
+        # Kept for export; the statistics table is indexed by column name.
+        if isinstance(df.index, pd.RangeIndex):
+            self.summary_frames[title] = df
+        else:
+            self.summary_frames[title] = df.rename_axis("Column").reset_index()
         table = QTableWidget()
         table.setSortingEnabled(False)
         table.setUpdatesEnabled(False)
@@ -141,165 +275,80 @@ class SummaryWindow(QDialog):
                 table.setColumnWidth(col, 80)
         table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
         table.setAlternatingRowColors(True)
-        self.tab_widget.addTab(table, title)
-
-    def _numeric_summary(self):
-        numeric_df = self.df.select_dtypes(include=[np.number])
-        if numeric_df.empty:
+        # Sections arrive out of display order; slot each tab into place.
+        order = [name for name, _ in self.TABS]
+        rank = order.index(section) if section in order else len(order)
+        index = sum(1 for added in self.tab_ranks if added < rank)
+        self.tab_ranks.insert(index, rank)
+        self.tab_widget.insertTab(index, table, title)
+
+    def _numeric_summary(self, columns):
+        if not columns:
             return None
 
         rows = []
-        for col in numeric_df.columns:
-            series = numeric_df[col]
-            valid = series.dropna()
+        for col in columns:
+            stats = col.describe
             rows.append({
-                "Column": col,
-                "Count": int(valid.count()),
-                "Mean": self._format_number(valid.mean()),
-                "Median": self._format_number(valid.median()),
-                "Min": self._format_number(valid.min()),
-                "Max": self._format_number(valid.max()),
-                "Std": self._format_number(valid.std()),
-                "Missing": int(series.isna().sum()),
+                "Column": col.name,
+                "Count": col.count,
+                "Mean": self._format_number(stats["mean"]),
+                "Median": self._with_error(self._format_number(stats["50%"]), col.errors, "50%"),
+                "Min": self._format_number(stats["min"]),
+                "Max": self._format_number(stats["max"]),
+                "Std": self._format_number(stats["std"]),
+                "Missing": col.missing,
             })
         return pd.DataFrame(rows)
 
-    def _categorical_summary(self):
-        cat_cols = [
-            col for col in self.df.columns
-            if pd.api.types.is_object_dtype(self.df[col])
-            or pd.api.types.is_categorical_dtype(self.df[col])
-            or pd.api.types.is_string_dtype(self.df[col])
-        ]
-        if not cat_cols:
+    def _categorical_summary(self, columns):
+        if not columns:
             return None
 
         rows = []
-        for col in cat_cols:
-            series = self.df[col]
-            non_null = series.dropna()
-            top_values = ""
-            if not non_null.empty:
-                top_counts = non_null.astype(str).value_counts().head(3)
-                top_values = ", ".join(f"{idx} ({cnt})" for idx, cnt in top_counts.items())
-            avg_len = ""
-            if not non_null.empty:
-                avg_len_val = non_null.astype(str).map(len).mean()
-                avg_len = self._format_number(avg_len_val)
+        for col in columns:
             rows.append({
-                "Column": col,
-                "Unique": int(non_null.nunique()),
-                "Top Values": top_values,
-                "Missing": int(series.isna().sum()),
-                "Avg String Length": avg_len,
+                "Column": col.name,
+                "Unique": self._with_error(col.distinct, col.errors, "distinct"),
+                "Top Values": ", ".join(f"{value} ({count})" for value, count in col.top_values),
+                "Missing": col.missing,
+                "Avg String Length": self._with_error(self._format_number(col.avg_length), col.errors, "avg_length"),
             })
         return pd.DataFrame(rows)
 
-    def _datetime_summary(self):
-        candidate_cols = []
-        for col in self.df.columns:
-            series = self.df[col]
-            if pd.api.types.is_datetime64_any_dtype(series):
-                candidate_cols.append(col)
-            else:
-                coerced = pd.to_datetime(series, errors="coerce", utc=True)
-                if coerced.notna().any():
-                    candidate_cols.append(col)
-        if not candidate_cols:
+    def _datetime_summary(self, columns):
+        if not columns:
             return None
 
         rows = []
-        for col in candidate_cols:
-            series = self.df[col]
-            coerced = pd.to_datetime(series, errors="coerce")
-            valid = coerced.dropna()
-            if valid.empty:
-                continue
-            min_val = valid.min()
-            max_val = valid.max()
-            missing = series.isna().sum() + (coerced.isna() & series.notna()).sum()
+        for col in columns:
+            stats = col.datetime
             rows.append({
-                "Column": col,
-                "Earliest": min_val.isoformat(sep=" "),
-                "Latest": max_val.isoformat(sep=" "),
-                "Range": str(max_val - min_val),
-                "Missing": int(missing),
+                "Column": col.name,
+                "Earliest": stats.earliest.isoformat(sep=" "),
+                "Latest": stats.latest.isoformat(sep=" "),
+                "Range": str(stats.latest - stats.earliest),
+                "Missing": stats.missing,
             })
-
         return pd.DataFrame(rows)
 
-    def _duration_summary(self):
-        duration_cols = []
-        for col in self.df.columns:
-            series = self.df[col]
-            parsed = series.apply(self._parse_duration_seconds)
-            valid_ratio = parsed.notna().sum() / len(series) if len(series) else 0
-            if valid_ratio >= 0.4:
-                duration_cols.append((col, parsed))
-        if not duration_cols:
+    def _duration_summary(self, columns):
+        if not columns:
             return None
 
         rows = []
-        for col, parsed_series in duration_cols:
-            valid = parsed_series.dropna()
-            if valid.empty:
-                continue
+        for col in columns:
+            stats = col.duration
             rows.append({
-                "Column": col,
-                "Count": int(valid.count()),
-                "Min": self._format_timedelta(valid.min()),
-                "Max": self._format_timedelta(valid.max()),
-                "Mean": self._format_timedelta(valid.mean()),
-                "Missing": int(parsed_series.isna().sum()),
+                "Column": col.name,
+                "Count": stats.count,
+                "Min": self._format_timedelta(stats.minimum),
+                "Max": self._format_timedelta(stats.maximum),
+                "Mean": self._format_timedelta(stats.mean),
+                "Missing": stats.missing,
             })
         return pd.DataFrame(rows)
 
-    def _parse_duration_seconds(self, value):
-        if pd.isna(value):
-            return np.nan
-        if isinstance(value, (pd.Timedelta, np.timedelta64)):
-            return pd.to_timedelta(value).total_seconds()
-        if isinstance(value, (int, float)):
-            return float(value)
-
-        text = str(value).strip().lower()
-        if not text:
-            return np.nan
-
-        if re.fullmatch(r"\d+:\d+(:\d+)?", text):
-            parts = [int(p) for p in text.split(":")]
-            if len(parts) == 2:
-                minutes, seconds = parts
-                return minutes * 60 + seconds
-            if len(parts) == 3:
-                hours, minutes, seconds = parts
-                return hours * 3600 + minutes * 60 + seconds
-
-        total_seconds = 0.0
-        found = False
-        pattern = re.compile(r"(\d+(?:\.\d+)?)\s*(days?|day|d|hours?|hour|h|minutes?|minute|mins?|min|m|seconds?|second|secs?|sec|s)")
-        for match in pattern.finditer(text):
-            found = True
-            value_num = float(match.group(1))
-            unit = match.group(2)
-            if unit.startswith("d"):
-                total_seconds += value_num * 86400
-            elif unit.startswith("h"):
-                total_seconds += value_num * 3600
-            elif unit.startswith("m") and not unit.startswith("sec"):
-                total_seconds += value_num * 60
-            else:
-                total_seconds += value_num
-
-        if found:
-            return total_seconds
-
-        try:
-            td = pd.to_timedelta(text, errors="raise")
-            return td.total_seconds()
-        except (ValueError, OverflowError):
-            return np.nan
-
     def _format_number(self, value):
         if value is None or pd.isna(value):
             return ""
@@ -332,7 +381,9 @@ class SummaryWindow(QDialog):
         if not self.summary_frames:
             return pd.DataFrame()
         layers = []
-        for title, frame in self.summary_frames.items():
+        for index in range(self.tab_widget.count()):
+            title = self.tab_widget.tabText(index)
+            frame = self.summary_frames[title]
             tagged = frame.copy()
             tagged.insert(0, "Summary", title)
             layers.append(tagged)
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import multiprocessing
 import os
 import sys
 
@@ -40,5 +41,6 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
 
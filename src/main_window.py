@@ -2,11 +2,9 @@
 from __future__ import annotations
 
 import os
-import re
 
 import numpy as np
 import pandas as pd
-from dateutil.parser import parse
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from PyQt5.QtWidgets import (
     QAction,
@@ -29,6 +27,7 @@ from PyQt5.QtWidgets import (
     QSplitter,
     QStackedWidget,
     QStatusBar,
+    QTableView,
     QTableWidget,
     QTableWidgetItem,
     QWidget,
@@ -36,6 +35,17 @@ from PyQt5.QtWidgets import (
     QHBoxLayout,
 )
 
+from .data.csv_loader import LoadCancelled, read_csv_chunked
+from .data.dates import parse_date, parse_dates
+from .data.dtype_optimizer import DtypeOptimizer
+from .data.durations import parse_duration_to_days, parse_durations_to_days
+from .data.file_cache import CSVCache
+from .data.history import DataHistory
+from .data.key_index import KeyHashCache, KeyIndexCache
+from .data.sketches import ColumnSketchCache
+from .data.numbers import parse_numbers, parse_season_numbers
+from .data.parsed_cache import ParsedColumnCache
+from .data.profiler import ColumnKindCache, ProfileCache, ProfileEngine
 from .dialogs.chart_dialog import chartwindow
 from .dialogs.clean_dialog import cleanwindow
 from .dialogs.compare_dialog import CompareDialog
@@ -44,33 +54,51 @@ from .dialogs.merge_dialog import MergeDialog
 from .dialogs.sort_dialog import sortwindow
 from .dialogs.summary_dialog import SummaryWindow
 from .utils.styles import SIDEBAR_WIDTH, SPACING_LG, SPACING_MD
+from .utils.table_model import DataFrameModel
 
 
 class FileLoaderThread(QThread):
     finished = pyqtSignal(object, str)
     error = pyqtSignal(str)
+    progress = pyqtSignal("qint64", "qint64")
+    stage = pyqtSignal(str)
+    optimized = pyqtSignal(object)
+    cancelled = pyqtSignal()
     
-    def __init__(self, file_path):
+    def __init__(self, file_path, optimize_dtypes=False, cache=None):
         super().__init__()
         self.file_path = file_path
+        self.optimize_dtypes = optimize_dtypes
+        self.cache = cache
+        self.from_cache = False
     
     def run(self):
         try:
-            file_size = os.path.getsize(self.file_path) / (1024 * 1024)
-            if file_size > 100:
-                chunk_list = []
-                chunk_size = 50000
-                for chunk in pd.read_csv(self.file_path, low_memory=False, engine='c', chunksize=chunk_size):
-                    chunk_list.append(chunk)
-                
-                if chunk_list:
-                    df = pd.concat(chunk_list, ignore_index=True)
-                else:
-                    df = pd.DataFrame()
-            else:
-                df = pd.read_csv(self.file_path, low_memory=False, engine='c')
-            
+            variant = "optimized" if self.optimize_dtypes else "raw"
+            if self.cache is not None:
+                self.stage.emit("Checking cache...")
+                df = self.cache.load(self.file_path, variant)
+                if df is not None:
+                    self.from_cache = True
+                    self.finished.emit(df, self.file_path)
+                    return
+            df = read_csv_chunked(
+                self.file_path,
+                progress=self.progress.emit,
+                is_cancelled=self.isInterruptionRequested,
+            )
+            if self.optimize_dtypes and not self.isInterruptionRequested():
+                self.stage.emit("Optimizing column types...")
+                df, report = DtypeOptimizer().optimize(df)
+                self.optimized.emit(report)
+            if self.isInterruptionRequested():
+                raise LoadCancelled(self.file_path)
+            if self.cache is not None and self.cache.should_cache(self.file_path):
+                self.stage.emit("Writing cache...")
+                self.cache.store(self.file_path, df, variant)
             self.finished.emit(df, self.file_path)
+        except LoadCancelled:
+            self.cancelled.emit()
         except MemoryError:
             self.error.emit("File is too large to load into memory. Please use a smaller dataset or filter the data first.")
         except Exception as e:
@@ -88,10 +116,19 @@ class main_menu(QMainWindow):
         self.data_loaded = False
         self.current_file_path = None
         self.loader_thread = None
+        self.loader_total_bytes = 0
+        self.load_optimization_report = None
+        self.file_cache = CSVCache()
+        self.parsed_columns = ParsedColumnCache()
+        self.key_indexes = KeyIndexCache()
+        self.column_sketches = ColumnSketchCache()
+        self.key_hashes = KeyHashCache()
+        self.column_kinds = ColumnKindCache()
+        self.profiles = ProfileCache()
+        # Row count above which profiling switches to approximate statistics.
+        self.approximate_rows = ProfileEngine.APPROXIMATE_MIN_ROWS
         self.progress_dialog = None
         self.profiling_dialog = None
-        self.max_display_rows = 1000
-        self.max_display_cols = None
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
         main_layout = QVBoxLayout(central_widget)
@@ -120,12 +157,6 @@ class main_menu(QMainWindow):
         open_btn.setProperty("primary", True)
         open_btn.clicked.connect(self.open_file)
         toolbar_layout.addWidget(open_btn)
-        self.display_limits_btn = QPushButton("Display Limits")
-        self.display_limits_btn.setProperty("flat", "true")
-        self.display_limits_btn.setToolTip("Set how many rows/columns to show")
-        self.display_limits_btn.clicked.connect(self.open_display_limits_dialog)
-        self.display_limits_btn.setEnabled(False)
-        toolbar_layout.addWidget(self.display_limits_btn)
         toolbar_layout.addStretch()
         main_layout.addWidget(self.toolbar)
         splitter = QSplitter(Qt.Horizontal)
@@ -159,28 +190,31 @@ class main_menu(QMainWindow):
         empty_layout.addWidget(self.empty_title)
         empty_layout.addWidget(self.empty_subtitle)
         self.workspace_stack.addWidget(empty_widget)
-        self.table = QTableWidget()
+        self.table_model = DataFrameModel(parent=self)
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
         self.table.setAlternatingRowColors(True)
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
         self.table.horizontalHeader().setDefaultSectionSize(150)
         self.table.horizontalHeader().setMinimumSectionSize(100)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.table.verticalHeader().setDefaultSectionSize(40)
-        self.table.setRowHeight(0, 40)
+        self.table.horizontalHeader().setResizeContentsPrecision(200)
         self.table.setWordWrap(True)
         self.table.setTextElideMode(Qt.ElideRight)
         self.table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self.show_table_context_menu)
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 gridline-color: #3b3f5c;
                 background-color: #1e2139;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 2px;
                 color: #e4e4e7;
                 font-size: 11pt;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #4f46e5;
                 color: #ffffff;
             }
@@ -219,6 +253,28 @@ class main_menu(QMainWindow):
         self.save_as_action.triggered.connect(self.save_file_as)
         file_menu.addAction(self.save_as_action)
         file_menu.addSeparator()
+        self.optimize_dtypes_action = QAction("Optimize column types on load", self)
+        self.optimize_dtypes_action.setCheckable(True)
+        self.optimize_dtypes_action.setChecked(True)
+        self.optimize_dtypes_action.setToolTip(
+            "Store repeated text as categories, downcast numbers and parse date columns when opening a file"
+        )
+        file_menu.addAction(self.optimize_dtypes_action)
+        self.cache_files_action = QAction("Cache opened files", self)
+        self.cache_files_action.setCheckable(True)
+        self.cache_files_action.setChecked(self.file_cache.available)
+        self.cache_files_action.setEnabled(self.file_cache.available)
+        self.cache_files_action.setToolTip(
+            "Keep a binary copy of large CSV files so unchanged files reopen quickly"
+            if self.file_cache.available
+            else "Install pyarrow to enable the file cache"
+        )
+        file_menu.addAction(self.cache_files_action)
+        clear_cache_action = QAction("Clear file cache", self)
+        clear_cache_action.setEnabled(self.file_cache.available)
+        clear_cache_action.triggered.connect(self.clear_file_cache)
+        file_menu.addAction(clear_cache_action)
+        file_menu.addSeparator()
         exit_action = QAction("Exit", self)
         exit_action.setShortcut("Ctrl+Q")
         exit_action.triggered.connect(self.close)
@@ -234,6 +290,10 @@ class main_menu(QMainWindow):
         self.redo_action.setEnabled(False)
         self.redo_action.triggered.connect(self.redo_filter)
         edit_menu.addAction(self.redo_action)
+        edit_menu.addSeparator()
+        history_budget_action = QAction("Undo memory budget...", self)
+        history_budget_action.triggered.connect(self.open_history_budget_dialog)
+        edit_menu.addAction(history_budget_action)
         view_menu = menu_bar.addMenu("View")
         fullscreen_action = QAction("Full Screen", self)
         fullscreen_action.setShortcut("F11")
@@ -261,6 +321,10 @@ class main_menu(QMainWindow):
         self.charts_action.setEnabled(False)
         self.charts_action.triggered.connect(self.open_chart_window)
         analysis_menu.addAction(self.charts_action)
+        analysis_menu.addSeparator()
+        approximate_rows_action = QAction("Approximate statistics threshold...", self)
+        approximate_rows_action.triggered.connect(self.open_approximate_rows_dialog)
+        analysis_menu.addAction(approximate_rows_action)
         help_menu = menu_bar.addMenu("Help")
         guide_action = QAction("User Guide", self)
         guide_action.setShortcut("F1")
@@ -286,14 +350,7 @@ class main_menu(QMainWindow):
         self.compare_action.setEnabled(True) 
         self.compare_action.triggered.connect(self.compare_datasets)
         dataset_menu.addAction(self.compare_action)
-        dataset_menu.addSeparator()
-        self.display_limits_action = QAction("Display limits...", self)
-        self.display_limits_action.setEnabled(False)
-        self.display_limits_action.setToolTip("Set how many rows/columns to show in the table")
-        self.display_limits_action.triggered.connect(self.open_display_limits_dialog)
-        dataset_menu.addAction(self.display_limits_action)
-        self.redo_stack = []
-        self.undo_stack = []
+        self.history = DataHistory()
 
     def on_dataset_combo_changed(self, name):
         if not name or not self.datasets or name not in self.datasets:
@@ -321,60 +378,78 @@ class main_menu(QMainWindow):
             return
         self.current_dataset_name = name
         self.data = self.datasets[name]
-        self.original_data = self.data.copy()
+        self.history.reset(self.data)
         self.setWindowTitle(f"DataForge — {name}")
         self.show_data(self.data)
 
-    def open_display_limits_dialog(self):
-        if not self.data_loaded:
-            return
-        total_rows, total_cols = len(self.data), len(self.data.columns)
-        current_rows = self.max_display_rows if self.max_display_rows else total_rows
-        current_cols = self.max_display_cols if self.max_display_cols else total_cols
-        rows_str, ok1 = QInputDialog.getText(
-            self, "Display limits",
-            f"Max rows to display (leave empty for all {total_rows:,}):",
-            text=str(current_rows)
+    def open_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open CSV", "", "CSV Files (*.csv);;All Files (*)") 
+        if path:
+            self.load_file(path)
+
+    def load_file(self, path):
+        self.loader_total_bytes = os.path.getsize(path)
+        self.progress_dialog = QProgressDialog("Loading dataset...", "Cancel", 0, 100, self)
+        self.progress_dialog.setWindowTitle("Loading")
+        self.progress_dialog.setWindowModality(Qt.WindowModal)
+        self.progress_dialog.setAutoClose(False)
+        self.progress_dialog.setAutoReset(False)
+        self.progress_dialog.setMinimumDuration(0)
+        self.progress_dialog.canceled.connect(self.cancel_file_load)
+        self.progress_dialog.show()
+        QApplication.processEvents()
+        self.load_optimization_report = None
+        self.loader_thread = FileLoaderThread(
+            path,
+            optimize_dtypes=self.optimize_dtypes_action.isChecked(),
+            cache=self.file_cache if self.cache_files_action.isChecked() else None,
         )
-        if not ok1:
+        self.loader_thread.progress.connect(self.on_file_load_progress)
+        self.loader_thread.stage.connect(self.on_file_load_stage)
+        self.loader_thread.optimized.connect(self.on_file_load_optimized)
+        self.loader_thread.finished.connect(self.on_file_loaded)
+        self.loader_thread.error.connect(self.on_file_load_error)
+        self.loader_thread.cancelled.connect(self.on_file_load_cancelled)
+        self.loader_thread.start()
+
+    def on_file_load_progress(self, bytes_read, rows_read):
+        if not self.progress_dialog:
             return
-        cols_str, ok2 = QInputDialog.getText(
-            self, "Display limits",
-            f"Max columns to display (leave empty for all {total_cols}):",
-            text=str(current_cols) if current_cols else ""
+        if self.loader_total_bytes:
+            self.progress_dialog.setValue(min(99, int(bytes_read * 100 / self.loader_total_bytes)))
+        self.progress_dialog.setLabelText(
+            f"Loading dataset... {rows_read:,} rows "
+            f"({bytes_read / (1024 * 1024):,.1f} of {self.loader_total_bytes / (1024 * 1024):,.1f} MB)"
         )
-        if not ok2:
-            return
-        try:
-            self.max_display_rows = int(rows_str.strip()) if rows_str.strip() else None
-            self.max_display_cols = int(cols_str.strip()) if cols_str.strip() else None
-            if self.max_display_rows is not None and self.max_display_rows < 1:
-                self.max_display_rows = 1
-            if self.max_display_cols is not None and self.max_display_cols < 1:
-                self.max_display_cols = 1
-        except ValueError:
-            QMessageBox.warning(self, "Invalid value", "Please enter positive integers or leave empty for no limit.")
-            return
-        self.show_data(self.data)
 
-    def open_file(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Open CSV", "", "CSV Files (*.csv);;All Files (*)") 
-        if path:
-            self.progress_dialog = QProgressDialog("Loading dataset...", "Cancel", 0, 0, self)
-            self.progress_dialog.setWindowTitle("Loading")
-            self.progress_dialog.setWindowModality(Qt.WindowModal)
-            self.progress_dialog.setCancelButton(None)
-            self.progress_dialog.show()
-            QApplication.processEvents()
-            self.loader_thread = FileLoaderThread(path)
-            self.loader_thread.finished.connect(self.on_file_loaded)
-            self.loader_thread.error.connect(self.on_file_load_error)
-            self.loader_thread.start()
-    
-    def on_file_loaded(self, df, path):
+    def clear_file_cache(self):
+        self.file_cache.clear()
+        self.status_bar.showMessage("File cache cleared")
+
+    def on_file_load_stage(self, text):
+        if self.progress_dialog:
+            self.progress_dialog.setLabelText(text)
+
+    def on_file_load_optimized(self, report):
+        self.load_optimization_report = report
+
+    def cancel_file_load(self):
+        if self.loader_thread and self.loader_thread.isRunning():
+            self.loader_thread.requestInterruption()
+            self.status_bar.showMessage("Cancelling load...")
+
+    def _close_progress_dialog(self):
         if self.progress_dialog:
+            self.progress_dialog.canceled.disconnect(self.cancel_file_load)
             self.progress_dialog.close()
             self.progress_dialog = None
+
+    def on_file_load_cancelled(self):
+        self._close_progress_dialog()
+        self.status_bar.showMessage("Loading cancelled")
+    
+    def on_file_loaded(self, df, path):
+        self._close_progress_dialog()
         
         try:
             dataset_name, ok = QInputDialog.getText(self, "Dataset Name", "Enter a name for this dataset:")
@@ -383,7 +458,7 @@ class main_menu(QMainWindow):
             self.datasets[dataset_name] = df
             self.current_dataset_name = dataset_name
             self.data = df
-            self.original_data = df.copy()
+            self.history.reset(df)
             self.current_file_path = path
             self.setWindowTitle(f"DataForge — {dataset_name}")
             self.workspace_stack.setCurrentWidget(self.table)
@@ -406,24 +481,17 @@ class main_menu(QMainWindow):
             self.dataset_combo.addItems(list(self.datasets.keys()))
             self.dataset_combo.setCurrentText(dataset_name)
             self.dataset_combo.blockSignals(False)
-            self.display_limits_btn.setEnabled(True)
-            self.display_limits_action.setEnabled(True)
-            total_rows = len(df)
-            limit = self.max_display_rows or total_rows
-            if total_rows > limit:
-                QMessageBox.information(self, "Dataset Loaded", 
-                    f"Dataset loaded successfully!\n\n"
-                    f"Total rows: {total_rows:,}\n"
-                    f"Total columns: {len(df.columns)}\n\n"
-                    f"Showing first {min(limit, total_rows):,} rows in the table.\n"
-                    f"Use Dataset → Display limits... to show more rows/columns.")
+            if self.loader_thread is not None and self.loader_thread.from_cache:
+                self.status_bar.showMessage(f"{self.status_bar.currentMessage()} — loaded from cache")
+            elif self.load_optimization_report and self.load_optimization_report.conversions:
+                self.status_bar.showMessage(
+                    f"{self.status_bar.currentMessage()} — {self.load_optimization_report.describe()}"
+                )
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Failed to process loaded file:\n{e}")
     
     def on_file_load_error(self, error_msg):
-        if self.progress_dialog:
-            self.progress_dialog.close()
-            self.progress_dialog = None
+        self._close_progress_dialog()
         QMessageBox.warning(self, "Error", f"Failed to load file:\n{error_msg}")
     def show_dataset_summary(self):
         if not self.data_loaded:
@@ -458,19 +526,27 @@ class main_menu(QMainWindow):
             self.profiling_dialog.finished.connect(lambda: setattr(self, 'profiling_dialog', None))
             self.profiling_dialog.resize(600, 400)
         table = self.profiling_dialog.profiling_table
-        table.setRowCount(len(self.data.columns))
+        # Cached per dataset, so reopening the report on unchanged data is instant.
+        engine = ProfileEngine(approximate_rows=self.approximate_rows, profiles=self.profiles)
+        profile = engine.profile(self.data, detailed=False)
+        table.setUpdatesEnabled(False)
+        table.setRowCount(len(profile.columns))
         table.setColumnCount(4)
         table.setHorizontalHeaderLabels(["Column", "Data Type", "Missing %", "Duplicate %"])
 
-        for i, col in enumerate(self.data.columns):
-            dtype = str(self.data[col].dtype)
-            missing_pct = round(self.data[col].isna().mean() * 100, 2)
-            duplicate_pct = round(self.data[col].duplicated().mean() * 100, 2)
+        for i, col in enumerate(profile.columns):
+            missing_pct = round(col.missing / col.rows * 100, 2) if col.rows else float("nan")
+            duplicate_pct = round(col.duplicate_rate * 100, 2)
+            duplicate_text = f"{duplicate_pct}%"
+            if "distinct" in col.errors and col.rows:
+                # Large datasets count distinct values approximately.
+                duplicate_text += f" (±{col.errors['distinct'] / col.rows * 100:.2f}%)"
 
-            table.setItem(i, 0, QTableWidgetItem(col))
-            table.setItem(i, 1, QTableWidgetItem(dtype))
+            table.setItem(i, 0, QTableWidgetItem(str(col.name)))
+            table.setItem(i, 1, QTableWidgetItem(str(col.dtype)))
             table.setItem(i, 2, QTableWidgetItem(f"{missing_pct}%"))
-            table.setItem(i, 3, QTableWidgetItem(f"{duplicate_pct}%"))
+            table.setItem(i, 3, QTableWidgetItem(duplicate_text))
+        table.setUpdatesEnabled(True)
         main_rect = self.geometry()
         x = main_rect.x() + (main_rect.width() - self.profiling_dialog.width()) // 2
         y = main_rect.y() + (main_rect.height() - self.profiling_dialog.height()) // 2
@@ -485,14 +561,25 @@ class main_menu(QMainWindow):
             QMessageBox.warning(None, "Merge", "Need at least 2 datasets")
             return
 
-        dlg = MergeDialog(self.datasets, self)
-        if dlg.exec_() == QDialog.Accepted and dlg.result_df is not None:
+        dlg = MergeDialog(
+            self.datasets,
+            self,
+            key_indexes=self.key_indexes,
+            sketches=self.column_sketches,
+            key_hashes=self.key_hashes,
+        )
+        accepted = dlg.exec_() == QDialog.Accepted
+        if accepted and dlg.result_path is not None:
+            # A partitioned join wrote its result to disk; open it like any CSV.
+            self.load_file(dlg.result_path)
+            return
+        if accepted and dlg.result_df is not None:
             merged = dlg.result_df
             new_name = dlg.result_name
             self.datasets[new_name] = merged
             self.current_dataset_name = new_name
             self.data = merged
-            self.original_data = merged.copy()
+            self.history.reset(merged)
             self.dataset_combo.blockSignals(True)
             self.dataset_combo.clear()
             self.dataset_combo.addItems(list(self.datasets.keys()))
@@ -508,27 +595,46 @@ class main_menu(QMainWindow):
             QMessageBox.warning(None, "Compare", "Need at least 2 datasets")
             return
 
-        dlg = CompareDialog(self.datasets, self)
+        dlg = CompareDialog(self.datasets, self, key_hashes=self.key_hashes)
         dlg.exec_()
 
     def undo_filter(self):
-        if self.undo_stack:
-            self.redo_stack.append(self.data.copy())
-            self.data = self.undo_stack.pop()
+        if self.history.can_undo:
+            self.data = self.history.undo()
             self.show_data(self.data)
             print("Undo: Reverted to previous state")
         else:
             QMessageBox.information(self, "Undo", "No previous action to undo.")
 
     def redo_filter(self):
-        if self.redo_stack:
-            self.undo_stack.append(self.data.copy())
-            self.data = self.redo_stack.pop()
+        if self.history.can_redo:
+            self.data = self.history.redo()
             self.show_data(self.data)
             print("Redo: Restored last undone action")
         else:
             QMessageBox.information(self, "Redo", "No action to redo.")
 
+    def open_history_budget_dialog(self):
+        current_mb = self.history.memory_budget // (1024 * 1024)
+        budget_mb, ok = QInputDialog.getInt(
+            self, "Undo memory budget",
+            f"Memory reserved for undo history in MB (currently using "
+            f"{self.history.memory_usage / (1024 * 1024):,.1f} MB):",
+            current_mb, 0, 1024 * 1024,
+        )
+        if ok:
+            self.history.set_memory_budget(budget_mb * 1024 * 1024)
+
+    def open_approximate_rows_dialog(self):
+        rows, ok = QInputDialog.getInt(
+            self, "Approximate statistics",
+            "Datasets with more rows than this are profiled with approximate\n"
+            "statistics (shown with ± error bounds):",
+            self.approximate_rows, 0, 2_000_000_000, 1_000_000,
+        )
+        if ok:
+            self.approximate_rows = rows
+
     def save_file(self):
         if not self.data_loaded:
             QMessageBox.warning(self, "No Data", "Load a dataset first!")
@@ -677,63 +783,14 @@ support: gattaouioussama@gmail.com
         msg.setIcon(QMessageBox.Information)
         msg.exec_()
 
-    def show_data(self, df):  
+    def show_data(self, df):
         self.table.setSortingEnabled(False)
-        self.table.setUpdatesEnabled(False)
-        self.table.clearContents()
-        
-        total_rows, total_cols = len(df), len(df.columns)
-        max_rows = self.max_display_rows if self.max_display_rows is not None else total_rows
-        max_cols = self.max_display_cols if self.max_display_cols is not None else total_cols
-        display_rows = min(total_rows, max_rows)
-        display_cols = min(total_cols, max_cols)
-        
-        self.table.setRowCount(display_rows)
-        self.table.setColumnCount(display_cols)
-        if display_cols < total_cols:
-            cols_to_show = df.columns[:display_cols].tolist()
-        else:
-            cols_to_show = df.columns.tolist()
-        for col_idx, col_name in enumerate(cols_to_show):
-            col_name_str = str(col_name)
-            header_item = QTableWidgetItem(col_name_str)
-            if len(col_name_str) > 30:
-                header_item.setToolTip(col_name_str)
-            self.table.setHorizontalHeaderItem(col_idx, header_item)
-        
-        display_df = df[cols_to_show].head(display_rows)
-        data_array = display_df.values
-        
-        for i in range(display_rows):
-            for j in range(display_cols):
-                val = data_array[i, j]
-                if pd.isna(val):
-                    item = QTableWidgetItem("")
-                else:
-                    val_str = str(val)
-                    item = QTableWidgetItem(val_str)
-                    if len(val_str) > 50:
-                        item.setToolTip(val_str)
-                    item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-                self.table.setItem(i, j, item)
-        self.table.resizeColumnsToContents()
-        for col in range(display_cols):
-            current_width = self.table.columnWidth(col)
-            if current_width > 600:
-                self.table.setColumnWidth(col, 600)
-            elif current_width < 120:
-                self.table.setColumnWidth(col, 120)
-        # Set all row heights for consistency
-        for row in range(display_rows):
-            self.table.setRowHeight(row, 40)
-        
-        row_msg = f"{display_rows:,} of {total_rows:,} rows" if total_rows > display_rows else f"{total_rows:,} rows"
-        col_msg = f", {display_cols} of {total_cols} columns" if total_cols > display_cols else f", {total_cols} columns"
-        self.status_bar.showMessage(f"{row_msg}{col_msg}")
-        
-        self.table.setUpdatesEnabled(True)
+        self.table_model.set_dataframe(df)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.auto_resize_columns()
+        self.status_bar.showMessage(f"{len(df):,} rows, {len(df.columns)} columns")
         self.table.setSortingEnabled(True)
-    
+
     def show_table_context_menu(self, position):
         if not self.data_loaded:
             return
@@ -744,25 +801,22 @@ support: gattaouioussama@gmail.com
         menu.addAction(resize_action)
         
         resize_selected_action = QAction("Auto-resize selected column", self)
-        resize_selected_action.triggered.connect(lambda: self.auto_resize_column(self.table.currentColumn()))
+        resize_selected_action.triggered.connect(lambda: self.auto_resize_column(self.table.currentIndex().column()))
         menu.addAction(resize_selected_action)
         
         menu.exec_(self.table.viewport().mapToGlobal(position))
     
     def auto_resize_columns(self):
         self.table.resizeColumnsToContents()
-        for col in range(self.table.columnCount()):
+        for col in range(self.table_model.columnCount()):
             current_width = self.table.columnWidth(col)
             if current_width > 600:
                 self.table.setColumnWidth(col, 600)
             elif current_width < 120:
                 self.table.setColumnWidth(col, 120)
-        # Ensure consistent row heights
-        for row in range(self.table.rowCount()):
-            self.table.setRowHeight(row, 40)
     
     def auto_resize_column(self, col):
-        if col >= 0 and col < self.table.columnCount():
+        if col >= 0 and col < self.table_model.columnCount():
             self.table.resizeColumnToContents(col)
             current_width = self.table.columnWidth(col)
             if current_width > 500:
@@ -770,108 +824,43 @@ support: gattaouioussama@gmail.com
             elif current_width < 100:
                 self.table.setColumnWidth(col, 100)
     
-    def parse_duration_to_days(self, val):
-        if isinstance(val, (int, float)):
-            return float(val)
-        if isinstance(val, str):
-            total_days = 0 
-            val_lower = val.lower().strip()
-            time_match = re.match(r"(\d+):(\d+)(?::(\d+))?", val_lower)
-            if time_match:
-                hours = int(time_match.group(1))
-                minutes = int(time_match.group(2))
-                seconds = int(time_match.group(3)) if time_match.group(3) else 0
-                return hours / 24 + minutes / 1440 + seconds / 86400
-            h = re.search(r"(\d+)\s*hour", val_lower)
-            m_ = re.search(r"(\d+)\s*min", val_lower)
-            s = re.search(r"(\d+)\s*sec", val_lower)
-
-            hours = int(h.group(1)) if h else 0
-            minutes = int(m_.group(1)) if m_ else 0
-            seconds = int(s.group(1)) if s else 0
-
-            if hours or minutes or seconds:
-                return hours / 24 + minutes / 1440 + seconds / 86400
-            y = re.findall(r"(\d+)\s*year", val_lower)
-            mo = re.findall(r"(\d+)\s*month", val_lower)
-            w = re.findall(r"(\d+)\s*week", val_lower)
-            d = re.findall(r"(\d+)\s*day", val_lower)
-            total_days += sum(int(x)*365 for x in y)
-            total_days += sum(int(x)*30 for x in mo)
-            total_days += sum(int(x)*7 for x in w)
-            total_days += sum(int(x) for x in d)
-            if total_days == 0:
-                num_match = re.search(r"\d+", val_lower)
-                if num_match:
-                    total_days = float(num_match.group())
-                else:
-                    return np.nan
-
-            return total_days
-   
-    def parse_season_to_number(self, val):
-        if isinstance(val, str):
-            match = re.search(r'\d+', val)
-            return int(match.group(0)) if match else np.nan
-        elif isinstance(val, (int, float)):
-            return val
-        return np.nan
-    
-    def parse_numeric(self, val):
-        if isinstance(val, (int, float)):
-            return val
-        if isinstance(val, str):
-            val_clean = re.sub(r'[^\d.-]', '', val)
-            try:
-                return float(val_clean)
-            except:
-                return np.nan
-        return np.nan
-
-    def smart_parse_date(self, val):
-        if not isinstance(val, str):
-            return pd.NaT
-        val = val.strip()
-        if not val:
-            return pd.NaT
-        try:
-            parsed = parse(val, dayfirst=True, yearfirst=False)
-            return parsed
-        except Exception as e:
-            print(f"Failed to parse date '{val}': {e}")
-            return pd.NaT
-        
+    def parsed_column(self, column, kind, parser):
+        # Typed views are cached against the state where the column last got
+        # new values, so row-only steps (filter, sort, undo) reuse them and
+        # only a clean on this column forces a re-parse.
+        version, values, positions = self.history.column_lineage(column)
+        parsed = self.parsed_columns.get_or_parse(
+            self.current_dataset_name,
+            column,
+            version,
+            kind,
+            lambda: parser(pd.Series(values, name=column)),
+        )
+        if positions is not None:
+            parsed = parsed.take(positions)
+        return pd.Series(parsed.to_numpy(), index=self.data.index, name=column)
+
     def apply_user_filter(self, column, operator, value, data_type):
-        df = self.data.copy()
+        df = self.data
         col_data = df[column]
-        self.undo_stack.append(self.data.copy())
-        self.redo_stack.clear()      
         if data_type == "Duration":
-            col_parsed = col_data.apply(self.parse_duration_to_days)
+            col_parsed = self.parsed_column(column, "duration", parse_durations_to_days)
         elif data_type == "Duration (Years , days or others)":
-            col_parsed = col_data.apply(self.parse_duration_to_days)
+            col_parsed = self.parsed_column(column, "duration", parse_durations_to_days)
         elif data_type == "Seasons (for series)":
-            col_parsed = col_data.apply(self.parse_season_to_number)
+            col_parsed = self.parsed_column(column, "season", parse_season_numbers)
         elif data_type == "Date":
-            col_parsed = pd.to_datetime(col_data, dayfirst=False, errors='coerce')
-            if col_parsed.isna().any():
-                fallback = col_data[col_parsed.isna()].apply(lambda x: self.smart_parse_date(str(x)))
-                fallback = pd.to_datetime(fallback, errors='coerce')
-                col_parsed.loc[falling := col_parsed.isna()] = fallback
+            col_parsed = self.parsed_column(column, "date", parse_dates)
         elif data_type == "Number":
-            col_parsed = col_data.apply(self.parse_numeric)
+            col_parsed = self.parsed_column(column, "number", parse_numbers)
         else:
             col_parsed = col_data.astype(str)
-        filtered = df
+        keep = pd.Series(True, index=df.index)
         if operator == "between":
             min_val, max_val = value
             if data_type == "Date":
-                min_ts = pd.to_datetime(min_val, dayfirst=False, errors='coerce')
-                max_ts = pd.to_datetime(max_val, dayfirst=False, errors='coerce')
-                if pd.isna(min_ts):
-                    min_ts = self.smart_parse_date(min_val)
-                if pd.isna(max_ts):
-                    max_ts = self.smart_parse_date(max_val)
+                min_ts = parse_date(min_val)
+                max_ts = parse_date(max_val)
                 if pd.isna(min_ts) or pd.isna(max_ts):
                     QMessageBox.warning(self, "Error", "Start and end dates must be valid.")
                     return
@@ -879,7 +868,7 @@ support: gattaouioussama@gmail.com
                 max_ts = pd.to_datetime(max_ts).normalize()
                 col_norm = pd.to_datetime(col_parsed).dt.normalize()
                 mask = (col_norm >= min_ts) & (col_norm <= max_ts)
-                filtered = df[mask.fillna(False)]
+                keep = mask.fillna(False)
             else:
                 try:
                     min_num, max_num = float(min_val), float(max_val)
@@ -887,13 +876,11 @@ support: gattaouioussama@gmail.com
                     QMessageBox.warning(self, "Error", "Min/Max must be numeric.")
                     return
                 mask = (col_parsed >= min_num) & (col_parsed <= max_num)
-                filtered = df[mask.fillna(False)]
+                keep = mask.fillna(False)
 
         elif operator in [">", "<", "≥", "≤", "==", "!="]:
             if data_type == "Date":
-                value_ts = pd.to_datetime(value, dayfirst=False, errors='coerce')
-                if pd.isna(value_ts):
-                    value_ts = self.smart_parse_date(value)
+                value_ts = parse_date(value)
                 if pd.isna(value_ts):
                     QMessageBox.warning(self, "Error", "Please enter a valid date value.")
                     return
@@ -905,11 +892,11 @@ support: gattaouioussama@gmail.com
                 elif operator == "≤": mask = col_norm <= value_norm
                 elif operator == "==": mask = col_norm == value_norm
                 elif operator == "!=": mask = col_norm != value_norm
-                filtered = df[mask.fillna(False)]
+                keep = mask.fillna(False)
 
             elif data_type in ["Duration", "Seasons (for series)", "Number"]:
                 try:
-                    value_num = float(self.parse_duration_to_days(value)) if data_type == "Duration" else float(value)
+                    value_num = parse_duration_to_days(value) if data_type == "Duration" else float(value)
                 except Exception:
                     QMessageBox.warning(self, "Error", "Value must be numeric.")
                     return
@@ -919,7 +906,7 @@ support: gattaouioussama@gmail.com
                 elif operator == "≤": mask = col_parsed <= value_num
                 elif operator == "==": mask = col_parsed == value_num
                 elif operator == "!=": mask = col_parsed != value_num
-                filtered = df[mask.fillna(False)]
+                keep = mask.fillna(False)
 
             else:
                 value_str = value
@@ -929,16 +916,19 @@ support: gattaouioussama@gmail.com
                 elif operator == "≤": mask = col_parsed <= value_str
                 elif operator == "==": mask = col_parsed == value_str
                 elif operator == "!=": mask = col_parsed != value_str
-                filtered = df[mask.fillna(False)]
+                keep = mask.fillna(False)
 
         elif operator == "contains":
-            filtered = df[col_data.astype(str).str.contains(str(value), case=False, na=False)]
+            keep = col_data.astype(str).str.contains(str(value), case=False, na=False)
         elif operator == "not contains":
-            filtered = df[~col_data.astype(str).str.contains(str(value), case=False, na=False)]
+            keep = ~col_data.astype(str).str.contains(str(value), case=False, na=False)
         elif operator == "empty":
-            filtered = df[col_data.isna() | (col_data.astype(str).str.strip() == "")]
+            keep = col_data.isna() | (col_data.astype(str).str.strip() == "")
         else:
-            filtered = df[col_data.astype(str) == str(value)]
+            keep = col_data.astype(str) == str(value)
+        positions = np.flatnonzero(keep.to_numpy(dtype=bool))
+        filtered = df.take(positions)
+        self.history.push_rows(positions, filtered, "filter")
         self.data = filtered
         self.show_data(filtered)
 
@@ -959,39 +949,33 @@ support: gattaouioussama@gmail.com
         filter_window.activateWindow()   
 
     def apply_user_sort(self, column, method):
-        df = self.data.copy()
+        df = self.data
         col_data = df[column]
-        self.undo_stack.append(self.data.copy())
-        self.redo_stack.clear()
-        sorted_data = df
+        col_parsed = None
+        ascending = True
+        na_position = "last"
         if method in ["Ascending", "Descending", "Nulls First", "Nulls Last"]:
-            col_parsed = col_data.apply(self.parse_duration_to_days)
-            if method == "Ascending":
-                sorted_data = df.loc[col_parsed.sort_values(ascending=True).index]
-            elif method == "Descending":
-                sorted_data = df.loc[col_parsed.sort_values(ascending=False).index]
-            elif method == "Nulls First":
-                sorted_data = df.loc[col_parsed.sort_values(ascending=True, na_position="first").index]
-            elif method == "Nulls Last":
-                sorted_data = df.loc[col_parsed.sort_values(ascending=True, na_position="last").index]
+            col_parsed = self.parsed_column(column, "duration", parse_durations_to_days)
+            ascending = method != "Descending"
+            if method == "Nulls First":
+                na_position = "first"
         
         elif method in ["Oldest → Newest", "Newest → Oldest"]:
-            col_parsed = pd.to_datetime(col_data, dayfirst=False, errors='coerce')
-            if col_parsed.isna().any():
-                fallback = col_data[col_parsed.isna()].apply(lambda x: self.smart_parse_date(str(x)))
-                fallback = pd.to_datetime(fallback, errors='coerce')
-                col_parsed.loc[col_parsed.isna()] = fallback           
-            if method == "Oldest → Newest":
-                sorted_data = df.loc[col_parsed.sort_values(ascending=True).index]
-            elif method == "Newest → Oldest":
-                sorted_data = df.loc[col_parsed.sort_values(ascending=False).index]
+            col_parsed = self.parsed_column(column, "date", parse_dates)
+            ascending = method == "Oldest → Newest"
         
         elif method in ["A → Z", "Z → A"]:
             col_parsed = col_data.astype(str)
-            if method == "A → Z":
-                sorted_data = df.loc[col_parsed.sort_values(ascending=True).index]
-            elif method == "Z → A":
-                sorted_data = df.loc[col_parsed.sort_values(ascending=False).index]
+            ascending = method == "A → Z"
+        if col_parsed is None:
+            return
+        positions = (
+            col_parsed.reset_index(drop=True)
+            .sort_values(ascending=ascending, na_position=na_position)
+            .index.to_numpy()
+        )
+        sorted_data = df.take(positions)
+        self.history.push_rows(positions, sorted_data, "sort")
         self.data = sorted_data
         self.show_data(sorted_data)  
 
@@ -1014,10 +998,11 @@ support: gattaouioussama@gmail.com
             QMessageBox.warning(self, "Error", "No data loaded!")
             return
         
-        df = self.data.copy()
+        df = self.data.copy(deep=False)
         col_data = df[column]
-        self.undo_stack.append(self.data.copy())
-        self.redo_stack.clear()
+        if isinstance(col_data.dtype, pd.CategoricalDtype):
+            col_data = col_data.astype(object)
+        positions = None
         
         try:
             if clean_action == "Fill missing values":
@@ -1037,9 +1022,9 @@ support: gattaouioussama@gmail.com
                     return
                 try:
                     replacement = float(value)
-                    col_parsed = col_data.apply(self.parse_numeric)
+                    col_parsed = self.parsed_column(column, "number", parse_numbers)
                     mask = col_parsed < 0
-                    df.loc[mask, column] = replacement
+                    df[column] = col_data.mask(mask, replacement)
                     QMessageBox.information(self, "Success", f"Replaced {mask.sum()} negative values")
                 except Exception as e:
                     QMessageBox.warning(self, "Error", f"Error: {e}")
@@ -1051,10 +1036,11 @@ support: gattaouioussama@gmail.com
                 try:
                     min_val = float(value[0])
                     max_val = float(value[1])
-                    col_parsed = col_data.apply(self.parse_numeric)
+                    col_parsed = self.parsed_column(column, "number", parse_numbers)
                     mask = (col_parsed < min_val) | (col_parsed > max_val)
                     removed = mask.sum()
-                    df = df[~mask]
+                    positions = np.flatnonzero(~mask.to_numpy(dtype=bool))
+                    df = self.data.take(positions)
                     QMessageBox.information(self, "Success", f"Removed {removed} outliers")
                 except Exception as e:
                     QMessageBox.warning(self, "Error", f"Error: {e}")
@@ -1063,7 +1049,7 @@ support: gattaouioussama@gmail.com
                 if value is None or value == "":
                     QMessageBox.warning(self, "Error", "Please provide a unit (e.g., age, $, meters).")
                     return
-                col_parsed = col_data.apply(self.parse_numeric)
+                col_parsed = self.parsed_column(column, "number", parse_numbers)
                 if value == "$":
                     df[column] = col_parsed.apply(lambda x: f"${x:,.2f}" if pd.notna(x) else "")
                 else:
@@ -1074,7 +1060,7 @@ support: gattaouioussama@gmail.com
                 if value is None or value == "":
                     QMessageBox.warning(self, "Error", "Please select a target format.")
                     return
-                col_parsed = col_data.apply(self.parse_duration_to_days)
+                col_parsed = self.parsed_column(column, "duration", parse_durations_to_days)
                 
                 if value == "To days":
                     df[column] = col_parsed 
@@ -1102,11 +1088,7 @@ support: gattaouioussama@gmail.com
                 if value is None or value == "":
                     QMessageBox.warning(self, "Error", "Please select a date format.")
                     return
-                parsed = pd.to_datetime(col_data, dayfirst=False, errors='coerce')
-                mask_na = parsed.isna()
-                if mask_na.any():
-                    fallback = col_data[mask_na].apply(lambda x: self.smart_parse_date(str(x)))
-                    parsed.loc[mask_na] = pd.to_datetime(fallback, errors='coerce')
+                parsed = self.parsed_column(column, "date", parse_dates)
                 if value == "D/M/Y":
                     df[column] = parsed.dt.strftime('%d/%m/%Y')
                 elif value == "M/D/Y":
@@ -1156,6 +1138,10 @@ support: gattaouioussama@gmail.com
                 QMessageBox.warning(self, "Error", f"Unknown clean action: {clean_action}")
                 return
             
+            if positions is not None:
+                self.history.push_rows(positions, df, "clean")
+            else:
+                self.history.push_column(column, df, "clean")
             self.data = df
             self.show_data(df)
             
@@ -1182,8 +1168,25 @@ support: gattaouioussama@gmail.com
         if not self.data_loaded:
             QMessageBox.warning(self, "No Data", "Load a dataset first!")
             return
-        summary_window = SummaryWindow(df=self.data, parent=self)
-        summary_window.exec_()
+        # Profiles in the background and fills in tabs as they are ready, so
+        # the window is shown non-modal right away.
+        self.summary_window = SummaryWindow(
+            df=self.data,
+            parent=self,
+            kinds=self.column_kinds,
+            approximate_rows=self.approximate_rows,
+            profiles=self.profiles,
+        )
+
+        main_rect = self.geometry()
+        x = main_rect.x() + (main_rect.width() - self.summary_window.width()) // 2
+        y = main_rect.y() + (main_rect.height() - self.summary_window.height()) // 2
+        self.summary_window.move(x, y)
+        self.summary_window.setModal(False)
+
+        self.summary_window.show()
+        self.summary_window.raise_()
+        self.summary_window.activateWindow()
 
     def open_chart_window(self):
         if not self.data_loaded:
@@ -190,8 +190,8 @@ def get_app_stylesheet() -> str:
         padding: 6px;
     }
     
-    /* Table Widget - Professional Data Grid */
-    QTableWidget {
+    /* Table View - Professional Data Grid */
+    QTableView {
         background-color: #161827;
         color: #e4e4e7;
         border: 1px solid #3b3f5c;
@@ -202,17 +202,17 @@ def get_app_stylesheet() -> str:
         alternate-background-color: #1a1d2e;
     }
     
-    QTableWidget::item {
+    QTableView::item {
         padding: 8px;
         border: none;
     }
     
-    QTableWidget::item:selected {
+    QTableView::item:selected {
         background-color: #6366f1;
         color: #ffffff;
     }
     
-    QTableWidget::item:alternate {
+    QTableView::item:alternate {
         background-color: #1a1d2e;
     }
     
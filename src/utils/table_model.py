@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from typing import Any, List, Optional
+
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+class DataFrameModel(QAbstractTableModel):
+    """Read-only view over a DataFrame; cells are formatted only when painted."""
+
+    TOOLTIP_MIN_LENGTH = 50
+    HEADER_TOOLTIP_MIN_LENGTH = 30
+
+    def __init__(self, df: Optional[pd.DataFrame] = None, parent=None) -> None:
+        super().__init__(parent)
+        self._df = pd.DataFrame()
+        self._columns: List[Any] = []
+        self._order: Optional[np.ndarray] = None
+        if df is not None:
+            self.set_dataframe(df)
+
+    def set_dataframe(self, df: pd.DataFrame) -> None:
+        self.beginResetModel()
+        self._df = df
+        self._columns = [df.iloc[:, j].array for j in range(df.shape[1])]
+        self._order = None
+        self.endResetModel()
+
+    def dataframe(self) -> pd.DataFrame:
+        return self._df
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._df)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._columns)
+
+    def _value(self, row: int, col: int) -> Any:
+        if self._order is not None:
+            row = int(self._order[row])
+        return self._columns[col][row]
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            value = self._value(index.row(), index.column())
+            return "" if pd.isna(value) else str(value)
+        if role == Qt.ToolTipRole:
+            value = self._value(index.row(), index.column())
+            if pd.isna(value):
+                return None
+            text = str(value)
+            return text if len(text) > self.TOOLTIP_MIN_LENGTH else None
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignLeft | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+        if orientation == Qt.Horizontal:
+            if section >= len(self._columns):
+                return None
+            name = str(self._df.columns[section])
+            if role == Qt.DisplayRole:
+                return name
+            if role == Qt.ToolTipRole and len(name) > self.HEADER_TOOLTIP_MIN_LENGTH:
+                return name
+            return None
+        if role == Qt.DisplayRole:
+            return str(section + 1)
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.AscendingOrder) -> None:
+        if column < 0 or column >= len(self._columns):
+            return
+        self.layoutAboutToBeChanged.emit()
+        series = self._df.iloc[:, column].reset_index(drop=True)
+        try:
+            ordered = series.sort_values(
+                ascending=(order == Qt.AscendingOrder), kind="stable", na_position="last"
+            )
+        except TypeError:
+            ordered = series.astype(str).sort_values(
+                ascending=(order == Qt.AscendingOrder), kind="stable", na_position="last"
+            )
+        self._order = ordered.index.to_numpy()
+        self.layoutChanged.emit()